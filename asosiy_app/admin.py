@@ -8,9 +8,13 @@ Admin panel - Django'ning eng kuchli xususiyatlaridan biri.
 U orqali ma'lumotlar bazasini oson boshqarish mumkin.
 """
 
+from django.conf import settings
 from django.contrib import admin
+from django.db.models import Count
+from django.shortcuts import render
 from django.utils.html import format_html
-from .models import Kategoriya, Mahsulot, Sharh, Profil
+from .models import Kategoriya, Mahsulot, Sharh, Profil, Buyurtma, BuyurtmaQatori
+from . import sekin_sorovlar
 
 # ============================================================================
 # KATEGORIYA ADMIN
@@ -75,12 +79,20 @@ class KategoriyaAdmin(admin.ModelAdmin):
         return "Rasm yo'q"
     rasm_preview.short_description = 'Rasm'
     
+    def get_queryset(self, request):
+        """
+        Mahsulotlar sonini ro'yxat so'rovining o'zida hisoblash
+        (har bir kategoriya uchun alohida COUNT so'rovi yubormaslik)
+        """
+        return super().get_queryset(request).annotate(_mahsulotlar_soni=Count('mahsulotlar'))
+    
     def mahsulotlar_soni(self, obj):
         """
         Kategoriyaga tegishli mahsulotlar sonini ko'rsatish
         """
-        return obj.mahsulotlar_soni()
+        return obj._mahsulotlar_soni
     mahsulotlar_soni.short_description = 'Mahsulotlar'
+    mahsulotlar_soni.admin_order_field = '_mahsulotlar_soni'
 
 
 # ============================================================================
@@ -360,6 +372,78 @@ class ProfilAdmin(admin.ModelAdmin):
     yosh_display.short_description = 'Yosh'
 
 
+# ============================================================================
+# BUYURTMA ADMIN
+# ============================================================================
+
+class BuyurtmaQatoriInline(admin.TabularInline):
+    """
+    Buyurtma qatorlari - faqat ko'rish uchun (narxlar buyurtma paytida yozilgan)
+    """
+    model = BuyurtmaQatori
+    fields = ['mahsulot', 'nomi', 'narx', 'miqdor']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+    
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Buyurtma)
+class BuyurtmaAdmin(admin.ModelAdmin):
+    """
+    Buyurtma modelini admin panelda boshqarish
+    
+    Admin faqat holatni o'zgartiradi - summa va qatorlar savat.buyurtma_yaratish()
+    da yoziladi.
+    """
+    
+    # Ro'yxatda ko'rsatiladigan ustunlar
+    list_display = ['__str__', 'foydalanuvchi', 'holat', 'jami', 'yaratilgan_sana']
+    
+    # Filtr qilish uchun maydonlar
+    list_filter = ['holat', 'yaratilgan_sana']
+    
+    # Qidiruv uchun maydonlar
+    search_fields = ['foydalanuvchi__username']
+    
+    # Ro'yxatda tahrirlash mumkin bo'lgan maydonlar
+    list_editable = ['holat']
+    
+    # Foydalanuvchi nomi ro'yxatda bitta so'rovda
+    list_select_related = ['foydalanuvchi']
+    
+    # O'qish uchun maydonlar
+    readonly_fields = ['foydalanuvchi', 'jami', 'yaratilgan_sana']
+    
+    inlines = [BuyurtmaQatoriInline]
+
+
+# ============================================================================
+# SEKIN SO'ROVLAR SAHIFASI
+# ============================================================================
+
+def sekin_sorovlar_sahifasi(request):
+    """
+    Eng sekin SQL so'rovlar hisoboti (/admin/sekin-sorovlar/)
+
+    config/urls.py da admin.site.admin_view() bilan ulanadi - faqat
+    xodimlar (is_staff) ko'ra oladi.
+    """
+    saralash = request.GET.get('saralash', 'jami_ms')
+    if saralash not in ('jami_ms', 'soni', 'maks_ms', 'ortacha_ms'):
+        saralash = 'jami_ms'
+    context = {
+        **admin.site.each_context(request),
+        'title': "Sekin so'rovlar",
+        'sorovlar': sekin_sorovlar.hisobot(top=50, saralash=saralash),
+        'saralash': saralash,
+        'chegara': getattr(settings, 'SEKIN_SOROV_CHEGARASI_MS', None),
+    }
+    return render(request, 'admin/sekin_sorovlar.html', context)
+
+
 # ============================================================================
 # ADMIN PANEL SOZLAMALARI
 # ============================================================================
@@ -0,0 +1,464 @@
+"""
+API - Katalog uchun faqat o'qiladigan JSON API (/api/v1/)
+
+Mobil ilova HTML sahifalarni emas, shu endpointlarni o'qiydi:
+- /api/v1/mahsulotlar/                   - mahsulotlar ro'yxati
+- /api/v1/mahsulotlar/<slug>/            - bitta mahsulot
+- /api/v1/mahsulotlar/<slug>/sharhlar/   - tasdiqlangan sharhlar
+- /api/v1/mahsulotlar-toplami/?slug=...  - bir nechta mahsulot bitta so'rovda
+- /api/v1/kategoriyalar/                 - faol kategoriyalar
+- /api/taklif/?q=...                     - qidiruv takliflari (taklif.py)
+
+Tezlik uchun:
+- Ma'lumot values() orqali lug'at ko'rinishida olinadi - model
+  obyektlari yaratilmaydi, shablon render qilinmaydi
+- JSON orjson bilan kodlanadi (o'rnatilmagan bo'lsa - standart json)
+- ?fields=id,nomi,narx - faqat kerakli ustunlar (SELECT ham qisqaradi)
+- Ro'yxatlar kursor bilan sahifalanadi (?cursor=...): OFFSET siz, har
+  bir sahifa indeks bo'yicha bir xil tez o'qiladi
+- ETag kesh teglari versiyasidan (teglar.py) olinadi: o'zgarmagan
+  ma'lumot uchun If-None-Match so'roviga bazasiz 304 javobi
+"""
+
+import base64
+import hashlib
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.http import HttpResponse
+from django.views.decorators.http import condition, require_safe
+
+from .kesh import kategoriya_reestri, teglangan_kalit
+from .models import Mahsulot, Sharh
+from .taklif import taklif_indeksi
+from .teglar import teg_versiyasi, teglar_versiyasi
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ixtiyoriy
+    orjson = None
+
+# API nomi -> values() ifodasi (None - modeldagi o'sha nomli maydon)
+MAHSULOT_MAYDONLARI = {
+    'id': None,
+    'nomi': None,
+    'slug': None,
+    'kategoriya_id': None,
+    'kategoriya_nomi': F('kategoriya__nomi'),
+    'qisqacha_tavsif': None,
+    'toliq_tavsif': None,
+    'narx': None,
+    'chegirma_narxi': None,
+    'rasm': None,
+    'miqdor': None,
+    'holat': None,
+    'reyting': None,
+    'yaratilgan_sana': None,
+}
+
+# Ro'yxatda standart holatda qaytariladigan maydonlar (to'liq tavsifsiz)
+MAHSULOT_ROYXAT_MAYDONLARI = (
+    'id', 'nomi', 'slug', 'kategoriya_id', 'narx', 'chegirma_narxi', 'rasm', 'holat', 'reyting',
+)
+
+SHARH_MAYDONLARI = {
+    'id': None,
+    'foydalanuvchi_nomi': F('foydalanuvchi__username'),
+    'baho': None,
+    'matn': None,
+    'yaratilgan_sana': None,
+}
+
+KATEGORIYA_MAYDONLARI = ('id', 'nomi', 'tavsif', 'rasm')
+
+# ID lar BigAutoField - bazaga undan katta son yuborilsa, drayver
+# OverflowError beradi (500 emas, 400 qaytarilishi kerak)
+MAKS_ID = 2 ** 63 - 1
+
+
+class ApiXatosi(Exception):
+    """
+    Noto'g'ri so'rov parametri - 400 javobiga aylantiriladi
+    """
+
+
+# ============================================================================
+# JSON VA YORDAMCHI FUNKSIYALAR
+# ============================================================================
+
+def json_kodlash(malumot):
+    """
+    Python obyektini JSON baytlarga aylantirish (orjson yoki standart json)
+
+    Decimal narxlar satr ko'rinishida (aniqlik yo'qolmasligi uchun),
+    sanalar ISO 8601 da qaytariladi.
+    """
+    if orjson is not None:
+        return orjson.dumps(malumot, default=str, option=orjson.OPT_UTC_Z)
+    return json.dumps(malumot, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def json_javob(malumot, status=200):
+    return HttpResponse(json_kodlash(malumot), status=status, content_type='application/json')
+
+
+def api_view(teglar):
+    """
+    API endpointi dekoratori
+
+    - Faqat GET/HEAD
+    - ETag teglar versiyasidan: If-None-Match mos kelsa, view chaqirilmaydi (304)
+    - ApiXatosi -> 400 JSON javobi
+
+    Args:
+        teglar: Javob bog'liq bo'lgan kesh teglari (masalan: ['mahsulot'])
+    """
+    def dekorator(view):
+        @require_safe
+        @condition(etag_func=_etag(teglar))
+        @wraps(view)
+        def ichki(request, *args, **kwargs):
+            try:
+                return view(request, *args, **kwargs)
+            except ApiXatosi as xato:
+                return json_javob({'xato': str(xato)}, status=400)
+        return ichki
+    return dekorator
+
+
+def _maydonlar(request, mavjud, standart):
+    """
+    ?fields= bo'yicha tanlangan maydonlar
+
+    Args:
+        mavjud: Ruxsat etilgan maydonlar
+        standart: fields berilmaganda qaytariladiganlar
+
+    Returns:
+        list: Maydon nomlari
+    """
+    qiymat = request.GET.get('fields', '').strip()
+    if not qiymat:
+        return list(standart)
+    maydonlar = [nom.strip() for nom in qiymat.split(',') if nom.strip()]
+    notanish = [nom for nom in maydonlar if nom not in mavjud]
+    if notanish:
+        raise ApiXatosi(f"Noma'lum maydonlar: {', '.join(notanish)}. Mavjud: {', '.join(mavjud)}")
+    return maydonlar
+
+
+def _values(queryset, maydonlar, jadval, qoshimcha=()):
+    """
+    Faqat kerakli ustunlar bilan values() (qoshimcha - kursor uchun)
+    """
+    oddiy, ifodalar = [], {}
+    for nom in dict.fromkeys([*maydonlar, *qoshimcha]):
+        if jadval[nom] is None:
+            oddiy.append(nom)
+        else:
+            ifodalar[nom] = jadval[nom]
+    return queryset.values(*oddiy, **ifodalar)
+
+
+def _rasm_url(qatorlar, maydonlar):
+    """
+    Bazadagi rasm yo'lini to'liq URL ga aylantirish
+    """
+    if 'rasm' in maydonlar:
+        for qator in qatorlar:
+            qator['rasm'] = settings.MEDIA_URL + qator['rasm'] if qator['rasm'] else None
+
+
+def _butun_son(qiymat, xato):
+    """
+    Satrni ID sifatida o'qish (MAKS_ID dan oshmasligi kerak)
+
+    Raises:
+        ApiXatosi: Butun son bo'lmasa yoki chegaradan tashqarida bo'lsa
+    """
+    try:
+        son = int(qiymat)
+    except ValueError:
+        raise ApiXatosi(xato)
+    if abs(son) > MAKS_ID:
+        raise ApiXatosi(xato)
+    return son
+
+
+def _narx(qiymat, xato):
+    """
+    Satrni narx sifatida o'qish (float emas - Decimal, aniqlik yo'qolmaydi)
+
+    nan, inf kabi chekli bo'lmagan qiymatlar DecimalField da ValidationError
+    beradi - ular ham 400.
+
+    Raises:
+        ApiXatosi: Chekli son bo'lmasa
+    """
+    try:
+        narx = Decimal(qiymat)
+    except InvalidOperation:
+        raise ApiXatosi(xato)
+    if not narx.is_finite():
+        raise ApiXatosi(xato)
+    return narx
+
+
+def _hajm(request):
+    """
+    Sahifa hajmi (?limit=), API_MAKS_SAHIFA_HAJMI bilan cheklangan
+    """
+    standart = getattr(settings, 'API_SAHIFA_HAJMI', 20)
+    try:
+        hajm = int(request.GET.get('limit', standart))
+    except ValueError:
+        raise ApiXatosi("limit butun son bo'lishi kerak")
+    return max(1, min(hajm, getattr(settings, 'API_MAKS_SAHIFA_HAJMI', 100)))
+
+
+# ============================================================================
+# KURSOR BILAN SAHIFALASH
+# ============================================================================
+
+def _kursor_yasash(qator):
+    malumot = json.dumps([qator['yaratilgan_sana'].isoformat(), qator['id']])
+    return base64.urlsafe_b64encode(malumot.encode()).decode().rstrip('=')
+
+
+def _kursor_ochish(kursor):
+    try:
+        sana, pk = json.loads(base64.urlsafe_b64decode(kursor + '=' * (-len(kursor) % 4)))
+        return datetime.fromisoformat(sana), _butun_son(pk, "Noto'g'ri cursor")
+    except (ValueError, TypeError):
+        raise ApiXatosi("Noto'g'ri cursor")
+
+
+def kursor_sahifasi(request, queryset, maydonlar, jadval):
+    """
+    Yangilari birinchi (yaratilgan_sana, id bo'yicha) kursorli sahifa
+
+    OFFSET o'rniga oxirgi qatordan keyingilar olinadi:
+        WHERE (yaratilgan_sana, id) < (kursor) ORDER BY yaratilgan_sana DESC, id DESC
+
+    Returns:
+        dict: {'natijalar': [...], 'keyingi': URL yoki None}
+    """
+    hajm = _hajm(request)
+    kursor = request.GET.get('cursor')
+    if kursor:
+        sana, pk = _kursor_ochish(kursor)
+        queryset = queryset.filter(Q(yaratilgan_sana__lt=sana) | Q(yaratilgan_sana=sana, id__lt=pk))
+    queryset = queryset.order_by('-yaratilgan_sana', '-id')
+
+    # Bitta ortiqcha qator - keyingi sahifa bor-yo'qligini bilish uchun
+    qatorlar = list(_values(queryset, maydonlar, jadval, qoshimcha=('id', 'yaratilgan_sana'))[:hajm + 1])
+    keyingi = None
+    if len(qatorlar) > hajm:
+        qatorlar = qatorlar[:hajm]
+        parametrlar = request.GET.copy()
+        parametrlar['cursor'] = _kursor_yasash(qatorlar[-1])
+        keyingi = f'{request.path}?{parametrlar.urlencode()}'
+
+    ortiqcha = {'id', 'yaratilgan_sana'} - set(maydonlar)
+    if ortiqcha:
+        for qator in qatorlar:
+            for nom in ortiqcha:
+                del qator[nom]
+    return {'natijalar': qatorlar, 'keyingi': keyingi}
+
+
+# ============================================================================
+# MAHSULOT KARTOCHKALARI (TO'PLAM UCHUN KESH)
+# ============================================================================
+
+def _karta_kaliti(mahsulot_id):
+    # Mahsulot o'zgarsa 'mahsulot:<id>' tegi bekor qilinadi - kalit eskiradi
+    return teglangan_kalit(f'api:mahsulot_karta:{mahsulot_id}', [f'mahsulot:{mahsulot_id}'])
+
+
+def _slug_kaliti(slug):
+    # slug -> id ko'rsatkichi; slug o'zgargan bo'lsa karta bilan solishtirib aniqlanadi
+    return f'api:mahsulot_slug:{slug}'
+
+
+def mahsulot_kartalari(qiymatlar, maydon='slug'):
+    """
+    Mahsulot kartochkalari (MAHSULOT_ROYXAT_MAYDONLARI) - avval keshdan,
+    qolganlari bitta slug__in (yoki id__in) so'rovi bilan
+
+    Har bir karta alohida, o'z mahsuloti tegi bilan keshlanadi: bitta
+    mahsulot o'zgarsa, faqat uning kartasi qayta o'qiladi.
+
+    Args:
+        qiymatlar: Sluglar yoki id lar
+        maydon: 'slug' yoki 'id'
+
+    Returns:
+        dict: qiymat -> karta (topilmagan mahsulotlar lug'atda bo'lmaydi)
+    """
+    kartalar = {}
+    if maydon == 'slug':
+        kalitlar = {_slug_kaliti(slug): slug for slug in qiymatlar}
+        idlar = {kalitlar[kalit]: mahsulot_id for kalit, mahsulot_id in cache.get_many(kalitlar).items()}
+    else:
+        idlar = {mahsulot_id: mahsulot_id for mahsulot_id in qiymatlar}
+
+    kalitlar = {_karta_kaliti(mahsulot_id): mahsulot_id for mahsulot_id in idlar.values()}
+    keshdagi = {kalitlar[kalit]: karta for kalit, karta in cache.get_many(kalitlar).items()}
+    for qiymat, mahsulot_id in idlar.items():
+        karta = keshdagi.get(mahsulot_id)
+        if karta is not None and karta[maydon] == qiymat:
+            kartalar[qiymat] = karta
+
+    qolganlar = [qiymat for qiymat in qiymatlar if qiymat not in kartalar]
+    if not qolganlar:
+        return kartalar
+
+    # So'rov va keshga yozish orasida mahsulot o'zgarsa, eski karta yangi
+    # versiya ostida saqlanib qolmasligi uchun - o'zgargan bo'lsa yozilmaydi
+    versiya = teg_versiyasi('mahsulot')
+    queryset = Mahsulot.objects.filter(**{f'{maydon}__in': qolganlar}).order_by()
+    yangilar = {}
+    for karta in _values(queryset, MAHSULOT_ROYXAT_MAYDONLARI, MAHSULOT_MAYDONLARI):
+        kartalar[karta[maydon]] = karta
+        yangilar[_karta_kaliti(karta['id'])] = karta
+        yangilar[_slug_kaliti(karta['slug'])] = karta['id']
+    if yangilar and teg_versiyasi('mahsulot') == versiya:
+        cache.set_many(yangilar, getattr(settings, 'API_KARTA_KESH_MUDDATI', 60 * 60))
+    return kartalar
+
+
+# ============================================================================
+# ETAG
+# ============================================================================
+
+def _etag(teglar):
+    """
+    condition() uchun ETag funksiyasi: teglar versiyasi + to'liq yo'l
+
+    Versiya fayldan o'qiladi (teglar.py) - 304 javobi bazaga murojaatsiz.
+    """
+    def etag(request, *args, **kwargs):
+        manba = f'{teglar_versiyasi(teglar)}:{request.get_full_path()}'
+        return hashlib.md5(manba.encode()).hexdigest()
+    return etag
+
+
+# ============================================================================
+# ENDPOINTLAR
+# ============================================================================
+
+@api_view(['mahsulot', 'kategoriya'])
+def mahsulotlar(request):
+    """
+    Mavjud mahsulotlar ro'yxati
+
+    Parametrlar: fields, cursor, limit, kategoriya, min_narx, max_narx
+    """
+    maydonlar = _maydonlar(request, MAHSULOT_MAYDONLARI, MAHSULOT_ROYXAT_MAYDONLARI)
+    queryset = Mahsulot.objects.filter(holat='mavjud')
+    xato = "kategoriya, min_narx va max_narx son bo'lishi kerak"
+    if request.GET.get('kategoriya'):
+        queryset = queryset.filter(kategoriya_id=_butun_son(request.GET['kategoriya'], xato))
+    if request.GET.get('min_narx'):
+        queryset = queryset.filter(narx__gte=_narx(request.GET['min_narx'], xato))
+    if request.GET.get('max_narx'):
+        queryset = queryset.filter(narx__lte=_narx(request.GET['max_narx'], xato))
+
+    sahifa = kursor_sahifasi(request, queryset, maydonlar, MAHSULOT_MAYDONLARI)
+    _rasm_url(sahifa['natijalar'], maydonlar)
+    return json_javob(sahifa)
+
+
+@api_view(['mahsulot'])
+def mahsulotlar_toplami(request):
+    """
+    Bir nechta mahsulot bitta so'rovda (savat, sevimlilar, yaqinda ko'rilganlar)
+
+    Parametrlar: slug=a,b,c yoki id=1,2,3 (API_TOPLAM_MAKS_HAJMI tagacha), fields
+
+    Natijalar so'ralgan tartibda; bazada yo'q qiymatlar 'topilmadi' ro'yxatida.
+    """
+    maydonlar = _maydonlar(request, MAHSULOT_ROYXAT_MAYDONLARI, MAHSULOT_ROYXAT_MAYDONLARI)
+    if ('slug' in request.GET) == ('id' in request.GET):
+        raise ApiXatosi("slug yoki id parametrlaridan bittasi berilishi kerak")
+    maydon = 'slug' if 'slug' in request.GET else 'id'
+    qiymatlar = [qiymat.strip() for qiymat in request.GET[maydon].split(',') if qiymat.strip()]
+    if maydon == 'id':
+        qiymatlar = [_butun_son(qiymat, "id butun son bo'lishi kerak") for qiymat in qiymatlar]
+    qiymatlar = list(dict.fromkeys(qiymatlar))   # Takrorlar olib tashlanadi, tartib saqlanadi
+    maks = getattr(settings, 'API_TOPLAM_MAKS_HAJMI', 50)
+    if not 0 < len(qiymatlar) <= maks:
+        raise ApiXatosi(f"1 dan {maks} tagacha {maydon} berilishi kerak")
+
+    kartalar = mahsulot_kartalari(qiymatlar, maydon)
+    natijalar = [{nom: kartalar[qiymat][nom] for nom in maydonlar} for qiymat in qiymatlar if qiymat in kartalar]
+    _rasm_url(natijalar, maydonlar)
+    return json_javob({
+        'natijalar': natijalar,
+        'topilmadi': [qiymat for qiymat in qiymatlar if qiymat not in kartalar],
+    })
+
+
+@api_view(['mahsulot', 'kategoriya'])
+def mahsulot(request, slug):
+    """
+    Bitta mahsulot (standart holatda barcha maydonlar)
+    """
+    maydonlar = _maydonlar(request, MAHSULOT_MAYDONLARI, MAHSULOT_MAYDONLARI)
+    qator = _values(Mahsulot.objects.filter(slug=slug), maydonlar, MAHSULOT_MAYDONLARI).first()
+    if qator is None:
+        return json_javob({'xato': 'Mahsulot topilmadi'}, status=404)
+    _rasm_url([qator], maydonlar)
+    return json_javob(qator)
+
+
+@api_view(['sharh'])
+def sharhlar(request, slug):
+    """
+    Mahsulotning tasdiqlangan sharhlari (yangilari birinchi)
+
+    Parametrlar: fields, cursor, limit
+    """
+    maydonlar = _maydonlar(request, SHARH_MAYDONLARI, SHARH_MAYDONLARI)
+    mahsulot_id = Mahsulot.objects.filter(slug=slug).values_list('id', flat=True).first()
+    if mahsulot_id is None:
+        return json_javob({'xato': 'Mahsulot topilmadi'}, status=404)
+    queryset = Sharh.objects.tasdiqlangan().filter(mahsulot_id=mahsulot_id)
+    return json_javob(kursor_sahifasi(request, queryset, maydonlar, SHARH_MAYDONLARI))
+
+
+@api_view(['kategoriya'])
+def kategoriyalar(request):
+    """
+    Faol kategoriyalar - xotiradagi reestrdan (bazaga murojaatsiz)
+    """
+    maydonlar = _maydonlar(request, KATEGORIYA_MAYDONLARI, KATEGORIYA_MAYDONLARI)
+    qatorlar = []
+    for kategoriya in kategoriya_reestri.royxat():
+        qator = {nom: getattr(kategoriya, nom) for nom in maydonlar}
+        if 'rasm' in qator:
+            qator['rasm'] = kategoriya.rasm.name
+        qatorlar.append(qator)
+    _rasm_url(qatorlar, maydonlar)
+    return json_javob({'natijalar': qatorlar})
+
+
+@api_view(['mahsulot', 'kategoriya'])
+def taklif(request):
+    """
+    Qidiruv maydoni uchun takliflar - xotiradagi indeksdan (bazaga murojaatsiz)
+
+    Parametrlar: q, limit (standart 10, eng ko'pi 20)
+    """
+    try:
+        soni = max(1, min(int(request.GET.get('limit', 10)), 20))
+    except ValueError:
+        raise ApiXatosi("limit butun son bo'lishi kerak")
+    return json_javob({'natijalar': taklif_indeksi.qidirish(request.GET.get('q', '')[:100], soni)})
@@ -33,4 +33,14 @@ class AsosiyAppConfig(AppConfig):
         # Signallarni import qilish - bu signallarni faollashtiradi
         import asosiy_app.signals
         
+        # Sekin so'rovlar jurnali - har bir yangi DB ulanishiga execute_wrapper
+        from django.db.backends.signals import connection_created
+        from .sekin_sorovlar import yozuvchini_ornatish
+        connection_created.connect(yozuvchini_ornatish, dispatch_uid='sekin_sorovlar')
+        
+        # So'rov fazalari vaqti (Server-Timing) - SQL, shablon va kesh o'lchagichlari
+        from . import vaqtlar
+        connection_created.connect(vaqtlar.db_orovchini_ornatish, dispatch_uid='sorov_vaqtlari')
+        vaqtlar.ornatish()
+        
         print("✓ Asosiy ilova signallari yuklandi")
@@ -0,0 +1,223 @@
+"""
+Asinxron views - ASGI serveri uchun katalog sahifalari
+
+Eng ko'p o'qiladigan sahifalarning (bosh sahifa, mahsulotlar ro'yxati,
+mahsulot, kategoriya, qidiruv) async versiyalari. settings.ASINXRON_VIEWLAR
+yoqilganda (config/asgi.py standart holatda yoqadi) urls.py shularni ulaydi:
+ma'lumotlar bazasi yoki keshni kutayotgan so'rov event loop ni band
+qilmaydi va bitta jarayon ko'p ochiq ulanishlarni ushlab turadi.
+
+Qoidalar:
+- ORM faqat async metodlar orqali (aget, acount, async for, asave)
+- Shablon render qilinishidan OLDIN barcha ma'lumot yuklanadi: request.user,
+  kategoriyalar reestri, sahifa obyektlari. Shablon ichidagi dangasa
+  so'rov event loop da SynchronousOnlyOperation xatosini beradi
+- Bir-biriga bog'liq bo'lmagan so'rovlar asyncio.gather bilan birga
+  boshlanadi (masalan, bosh sahifaning uchta bloki)
+- Shablon va context sync views bilan bir xil - HTML farq qilmaydi
+
+Eslatma: Django async ORM so'rovlarni hozircha so'rovning yagona
+(thread_sensitive) oqimida bajaradi - bitta sahifa ichidagi gather DB
+so'rovlarini navbat bilan yuboradi. Asosiy yutuq - ko'p so'rovlar bir
+vaqtda kutganda (qarang: python manage.py asgi_benchmark).
+"""
+
+import asyncio
+
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import F
+from django.http import Http404
+from django.shortcuts import render
+
+from .forms import QidiruvForm, SharhForm
+from .kesh import abosh_sahifa_bloklari, kategoriya_reestri, korish_hisoblanadimi
+from .metrikalar import olchash
+from .models import Mahsulot
+from .routers import yopishtirmasdan
+from .views import MahsulotlarListView, qidiruv_natijalari
+
+# ============================================================================
+# YORDAMCHI FUNKSIYALAR
+# ============================================================================
+
+async def _foydalanuvchini_yuklash(request):
+    """
+    request.user ni oldindan yuklash
+
+    AuthenticationMiddleware uni dangasa obyekt qilib qo'yadi - shablon
+    ({% if user.is_authenticated %}) uni event loop ichida o'qisa, sessiya
+    va User so'rovlari sync bajarilardi.
+    """
+    request.user = await request.auser()
+
+
+async def _tayyorlash(request):
+    """
+    Har bir sahifa uchun: foydalanuvchi va kategoriyalar reestri (bir vaqtda)
+    """
+    await asyncio.gather(_foydalanuvchini_yuklash(request), kategoriya_reestri.ayangilash())
+
+
+async def _sahifa(queryset, hajm, raqam, qatiy=False):
+    """
+    Paginator sahifasi - soni va obyektlari oldindan yuklangan
+
+    Args:
+        queryset: Sahifalanadigan QuerySet
+        hajm: Bitta sahifadagi obyektlar soni
+        raqam: ?page= qiymati
+        qatiy: True - noto'g'ri raqamga Http404 (ListView kabi),
+            False - eng yaqin sahifa (Paginator.get_page kabi)
+
+    Returns:
+        Page: object_list - tayyor ro'yxat
+    """
+    paginator = Paginator(queryset, hajm)
+    # count - cached_property: acount() natijasi yozib qo'yiladi,
+    # Paginator uni qayta so'ramaydi
+    paginator.count = await queryset.acount()
+    if qatiy:
+        try:
+            sahifa = paginator.page(paginator.num_pages if raqam == 'last' else int(raqam or 1))
+        except (ValueError, InvalidPage):
+            raise Http404("Sahifa topilmadi")
+    else:
+        sahifa = paginator.get_page(raqam)
+    sahifa.object_list = [obj async for obj in sahifa.object_list]
+    return sahifa
+
+
+async def _royxat(queryset):
+    return [obj async for obj in queryset]
+
+
+# ============================================================================
+# ASOSIY SAHIFA
+# ============================================================================
+
+async def bosh_sahifa(request):
+    """
+    Asosiy sahifa (views.bosh_sahifa ning async versiyasi)
+
+    Uchta blok keshdan bir vaqtda o'qiladi (qarang: kesh.abosh_sahifa_bloklari).
+    """
+    _, context = await asyncio.gather(_tayyorlash(request), abosh_sahifa_bloklari())
+    return render(request, 'asosiy_app/bosh_sahifa.html', context)
+
+
+# ============================================================================
+# MAHSULOTLAR RO'YXATI
+# ============================================================================
+
+async def mahsulotlar(request):
+    """
+    Mahsulotlar ro'yxati (views.MahsulotlarListView ning async versiyasi)
+
+    Filtrlar MahsulotlarListView.get_queryset() dan olinadi, context ham
+    ListView nikidek (page_obj, is_paginated va h.k.).
+    """
+    view = MahsulotlarListView()
+    view.setup(request)
+    _, page_obj = await asyncio.gather(
+        _tayyorlash(request),
+        _sahifa(view.get_queryset(), view.paginate_by, request.GET.get('page'), qatiy=True),
+    )
+    context = {
+        'view': view,
+        'paginator': page_obj.paginator,
+        'page_obj': page_obj,
+        'is_paginated': page_obj.has_other_pages(),
+        'object_list': page_obj.object_list,
+        'mahsulotlar': page_obj.object_list,
+        'kategoriyalar': kategoriya_reestri.royxat(),
+        'qidiruv_form': QidiruvForm(request.GET),
+    }
+    return render(request, view.template_name, context)
+
+
+# ============================================================================
+# MAHSULOT BATAFSIL
+# ============================================================================
+
+async def _korishni_hisoblash(request, mahsulot):
+    """
+    Ko'rilganlar sonini oshirish (hisoblagich - so'rov replikadan o'qishda davom etadi)
+
+    F() bilan bitta UPDATE: bir vaqtdagi so'rovlar bir-birining hisobini yo'qotmaydi.
+    """
+    if not korish_hisoblanadimi(request):
+        return
+    mahsulot.korilganlar_soni += 1
+    with yopishtirmasdan(), olchash('korish_yozish_seconds'):
+        await Mahsulot.objects.filter(pk=mahsulot.pk).aupdate(korilganlar_soni=F('korilganlar_soni') + 1)
+
+
+async def mahsulot_batafsil(request, slug):
+    """
+    Mahsulot sahifasi (views.MahsulotDetailView ning async versiyasi)
+
+    Mahsulot topilgach, foydalanuvchi, ko'rilganlar sonini saqlash va
+    sharhlar ro'yxati bir vaqtda boshlanadi.
+    """
+    try:
+        mahsulot = await Mahsulot.objects.aget(slug=slug)
+    except Mahsulot.DoesNotExist:
+        raise Http404("Mahsulot topilmadi")
+
+    _, _, sharhlar = await asyncio.gather(
+        _tayyorlash(request),
+        _korishni_hisoblash(request, mahsulot),
+        _royxat(
+            mahsulot.sharhlar.tasdiqlangan().select_related('foydalanuvchi').order_by('-yaratilgan_sana')
+        ),
+    )
+    context = {
+        'object': mahsulot,
+        'mahsulot': mahsulot,
+        'sharhlar': sharhlar,
+        'sharh_form': SharhForm(),
+    }
+    return render(request, 'asosiy_app/mahsulot_batafsil.html', context)
+
+
+# ============================================================================
+# KATEGORIYA BO'YICHA MAHSULOTLAR
+# ============================================================================
+
+async def kategoriya_mahsulotlar(request, kategoriya_id):
+    """
+    Kategoriya mahsulotlari (views.kategoriya_mahsulotlar ning async versiyasi)
+    """
+    await _tayyorlash(request)
+    kategoriya = kategoriya_reestri.olish(kategoriya_id)
+    if kategoriya is None:
+        raise Http404("Kategoriya topilmadi")
+
+    page_obj = await _sahifa(
+        Mahsulot.objects.filter(kategoriya=kategoriya, holat='mavjud'), 12, request.GET.get('page'),
+    )
+    context = {
+        'kategoriya': kategoriya,
+        'mahsulotlar': page_obj,
+    }
+    return render(request, 'asosiy_app/kategoriya_mahsulotlar.html', context)
+
+
+# ============================================================================
+# QIDIRUV
+# ============================================================================
+
+async def qidiruv(request):
+    """
+    Mahsulotlarni qidirish (views.qidiruv ning async versiyasi)
+    """
+    # Forma kategoriyani reestrdan tekshiradi - avval reestr yangilanadi
+    await _tayyorlash(request)
+    form = QidiruvForm(request.GET)
+    page_obj = await _sahifa(qidiruv_natijalari(form), 12, request.GET.get('page'))
+    context = {
+        'form': form,
+        'mahsulotlar': page_obj,
+        'natijalar_soni': page_obj.paginator.count,
+    }
+    return render(request, 'asosiy_app/qidiruv.html', context)
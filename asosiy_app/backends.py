@@ -0,0 +1,115 @@
+"""
+Backends - Autentifikatsiya backendi
+
+Har bir so'rovda Django sessiyadagi foydalanuvchi ID si bo'yicha User ni
+yuklaydi (AuthenticationMiddleware -> backend.get_user). Standart
+ModelBackend faqat User ni oladi, profil esa birinchi murojaatda alohida
+so'rov bilan yuklanadi. Bu backend:
+- User ni profili bilan bitta so'rovda oladi (select_related)
+- Natijani keshda saqlaydi: keyingi so'rovlarda bazaga murojaat yo'q
+- User yoki Profil o'zgarsa, 'foydalanuvchi:<id>' tegi bekor qilinadi
+  (signals.py) va kesh barcha workerlarda eskiradi
+
+Profil foydalanuvchi yaratilganda emas, birinchi kerak bo'lganda
+yaratiladi (profil_olish).
+
+AUTHENTICATION_BACKENDS da undan keyin standart ModelBackend ham turadi -
+u bilan yaratilgan eski sessiyalar bekor bo'lmasligi uchun.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.db import IntegrityError, transaction
+
+from .kesh import teglangan_kalit
+from .models import Profil
+
+UserModel = get_user_model()
+
+
+def foydalanuvchi_kaliti(user_id):
+    """
+    Foydalanuvchi (profili bilan) kesh kaliti - 'foydalanuvchi:<id>' tegiga bog'liq
+    """
+    return teglangan_kalit(f'foydalanuvchi:{user_id}', [f'foydalanuvchi:{user_id}'])
+
+
+class ProfilBilanBackend(ModelBackend):
+    """
+    ModelBackend + profilni birga yuklash va keshlash
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        """
+        ModelBackend.authenticate - login va parol noto'g'ri bo'lsa, keyingi
+        backendlarga o'tilmaydi (PermissionDenied)
+
+        Aks holda ro'yxatdagi ModelBackend parolni ikkinchi marta hashlaydi.
+        """
+        user = super().authenticate(request, username=username, password=password, **kwargs)
+        if user is None and password is not None and (username or kwargs.get(UserModel.USERNAME_FIELD)):
+            raise PermissionDenied
+        return user
+
+    def get_user(self, user_id):
+        """
+        Sessiyadagi ID bo'yicha foydalanuvchi (keshdan yoki bitta so'rov bilan)
+
+        Django keyin parol xeshidan olingan sessiya belgisini tekshiradi -
+        parol o'zgarsa User saqlanadi, kesh eskiradi va eski sessiyalar
+        bekor bo'ladi.
+        """
+        kalit = foydalanuvchi_kaliti(user_id)
+        user = cache.get(kalit)
+        if user is None:
+            try:
+                user = UserModel._default_manager.select_related('profil').get(pk=user_id)
+            except UserModel.DoesNotExist:
+                return None
+            cache.set(kalit, user, getattr(settings, 'FOYDALANUVCHI_KESH_MUDDATI', 60 * 15))
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        """
+        get_user() ning async versiyasi (request.auser() - ASGI dagi async views)
+        """
+        kalit = foydalanuvchi_kaliti(user_id)
+        user = await cache.aget(kalit)
+        if user is None:
+            try:
+                user = await UserModel._default_manager.select_related('profil').aget(pk=user_id)
+            except UserModel.DoesNotExist:
+                return None
+            await cache.aset(kalit, user, getattr(settings, 'FOYDALANUVCHI_KESH_MUDDATI', 60 * 15))
+        return user if self.user_can_authenticate(user) else None
+
+
+def profil_olish(user):
+    """
+    Foydalanuvchi profili - yo'q bo'lsa, shu yerda yaratiladi
+
+    get_user() profilni select_related bilan yuklaydi, shuning uchun
+    profil mavjud bo'lsa, qo'shimcha so'rov bo'lmaydi.
+
+    Args:
+        user: User obyekti
+
+    Returns:
+        Profil
+    """
+    try:
+        return user.profil
+    except Profil.DoesNotExist:
+        pass
+    # select_related profil yo'qligini allaqachon ko'rsatdi - SELECT siz yaratish.
+    # Parallel so'rov ulgurib yaratgan bo'lsa, o'shani olamiz.
+    try:
+        with transaction.atomic():
+            profil = Profil.objects.create(foydalanuvchi=user)
+    except IntegrityError:
+        profil = Profil.objects.get(foydalanuvchi=user)
+    user.profil = profil
+    return profil
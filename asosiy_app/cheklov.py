@@ -0,0 +1,148 @@
+"""
+Cheklov - so'rovlar tezligini cheklash (qat'iy vaqt oynasi hisoblagichi)
+
+Har bir kalit (IP manzil, IP + foydalanuvchi nomi) uchun `davr` sekundlik
+oynada ko'pi bilan `sigim` ta urinishga ruxsat. Oyna tugaganda hisob
+noldan boshlanadi; chegara oshsa, urinish rad etiladi va oyna oxirigacha
+qolgan vaqt qaytariladi. Ikki oyna chegarasida qisqa vaqtda 2 * sigim
+urinish o'tishi mumkin - himoya maqsadi uchun yetarli.
+
+Hisob keshda atomar amallar bilan yuritiladi (cache.add + cache.incr;
+Redis da - INCR): bir vaqtdagi urinishlar bir-birining hisobini yo'qotmaydi.
+Cheklov barcha workerlar uchun bitta bo'lishi uchun CACHES umumiy (Redis,
+Memcached) bo'lishi shart - LocMemCache da har bir worker o'z hisobini
+yuritadi va haqiqiy chegara workerlar soniga ko'payadi.
+
+Kirish sahifasida (views.kirish) parolni tekshirishdan OLDIN ishlatiladi -
+parol hashlash eng qimmat amal, hujum paytida workerlar CPU si band
+bo'lib qolmasligi kerak:
+- IP hisobi - har bir urinish sanaladi
+- IP + foydalanuvchi nomi hisobi - oldindan faqat tekshiriladi, faqat
+  muvaffaqiyatsiz urinish sanaladi (kirish_xatosi). Kalitda IP borligi
+  uchun boshqa IP lardan urinib, egasini bloklab bo'lmaydi
+
+Ilova proksi (nginx) orqasida bo'lsa, REMOTE_ADDR - proksi manzili va
+barcha mijozlar bitta hisobga tushadi. Bunda ISHONCHLI_PROKSI_SARLAVHASI
+sozlanadi (masalan, 'HTTP_X_REAL_IP') - mijoz IP si shu sarlavhadan olinadi.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class UrinishlarOynasi:
+    """
+    Bitta cheklov turi (masalan, IP bo'yicha)
+
+    Args:
+        nom: Kesh kalitidagi nom
+        sigim: Bitta oynada ruxsat etilgan urinishlar
+        davr: Oyna uzunligi (sekund)
+    """
+
+    def __init__(self, nom, sigim, davr):
+        self.nom = nom
+        self.sigim = sigim
+        self.davr = davr
+
+    def _oyna(self, kalit):
+        """
+        Joriy oyna kesh kaliti va oyna oxirigacha qolgan vaqt (sekund)
+        """
+        hozir = time.time()
+        oyna = int(hozir // self.davr)
+        kesh_kaliti = f'cheklov:{self.nom}:{hashlib.md5(str(kalit).encode()).hexdigest()}:{oyna}'
+        return kesh_kaliti, (oyna + 1) * self.davr - hozir
+
+    def olish(self, kalit):
+        """
+        Urinishni sanash
+
+        Returns:
+            float: 0 - ruxsat, aks holda keyingi urinishgacha kutish (sekund)
+        """
+        kesh_kaliti, qolgan = self._oyna(kalit)
+        # Oyna tugagach kalit keshdan o'chadi (+1 - soat farqlari uchun zaxira)
+        cache.add(kesh_kaliti, 0, self.davr + 1)
+        try:
+            soni = cache.incr(kesh_kaliti)
+        except ValueError:
+            # add va incr orasida kalit o'chib ketgan (muddati tugagan)
+            cache.add(kesh_kaliti, 1, self.davr + 1)
+            soni = 1
+        return 0.0 if soni <= self.sigim else qolgan
+
+    def tekshirish(self, kalit):
+        """
+        Sanamasdan tekshirish
+
+        Returns:
+            float: 0 - chegara oshmagan, aks holda kutish (sekund)
+        """
+        kesh_kaliti, qolgan = self._oyna(kalit)
+        return 0.0 if cache.get(kesh_kaliti, 0) < self.sigim else qolgan
+
+
+def mijoz_ip(request):
+    """
+    Mijoz IP manzili
+
+    settings.ISHONCHLI_PROKSI_SARLAVHASI berilsa (masalan, 'HTTP_X_REAL_IP'
+    yoki 'HTTP_X_FORWARDED_FOR') - shu sarlavhadagi oxirgi manzil, ya'ni
+    ishonchli proksi qo'shgani. Sarlavhani faqat proksi mijoz yuborganini
+    almashtirsa (yoki oxiriga qo'shsa) yoqing - aks holda mijoz o'z IP sini
+    o'zi tanlaydi.
+    """
+    sarlavha = getattr(settings, 'ISHONCHLI_PROKSI_SARLAVHASI', '')
+    if sarlavha:
+        manzil = request.META.get(sarlavha, '').split(',')[-1].strip()
+        if manzil:
+            return manzil
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _foydalanuvchi_kaliti(request, username):
+    username = (username or '').strip().lower()
+    return f'{mijoz_ip(request)}:{username}' if username else ''
+
+
+def kirish_cheklovi(request, username):
+    """
+    Kirish urinishiga ruxsat bormi (settings.KIRISH_CHEKLOVI)
+
+    Avval IP bo'yicha urinish sanaladi, keyin IP + foydalanuvchi nomi hisobi
+    faqat tekshiriladi (kirish_xatosi() da sanaladi). IP cheklovi ishlasa,
+    foydalanuvchi nomi hisobiga qaralmaydi.
+
+    Returns:
+        float: 0 - ruxsat, aks holda kutish (sekund)
+    """
+    sozlamalar = getattr(settings, 'KIRISH_CHEKLOVI', None)
+    if not sozlamalar:
+        return 0.0
+
+    ip = mijoz_ip(request)
+    if 'ip' in sozlamalar and ip:
+        kutish = UrinishlarOynasi('kirish:ip', **sozlamalar['ip']).olish(ip)
+        if kutish:
+            return kutish
+
+    kalit = _foydalanuvchi_kaliti(request, username)
+    if 'foydalanuvchi' in sozlamalar and kalit:
+        return UrinishlarOynasi('kirish:foydalanuvchi', **sozlamalar['foydalanuvchi']).tekshirish(kalit)
+    return 0.0
+
+
+def kirish_xatosi(request, username):
+    """
+    Muvaffaqiyatsiz kirish - IP + foydalanuvchi nomi hisobiga qo'shish
+
+    Muvaffaqiyatli kirishlar bu hisobga kirmaydi.
+    """
+    sozlamalar = getattr(settings, 'KIRISH_CHEKLOVI', None)
+    kalit = _foydalanuvchi_kaliti(request, username)
+    if sozlamalar and 'foydalanuvchi' in sozlamalar and kalit:
+        UrinishlarOynasi('kirish:foydalanuvchi', **sozlamalar['foydalanuvchi']).olish(kalit)
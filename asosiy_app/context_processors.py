@@ -0,0 +1,38 @@
+"""
+Context processors - Barcha shablonlar uchun umumiy o'zgaruvchilar
+
+Bu faylda har bir shablonga avtomatik qo'shiladigan o'zgaruvchilar aniqlanadi.
+Ular settings.py dagi TEMPLATES -> OPTIONS -> context_processors ro'yxatiga
+qo'shilgandan keyin ishlaydi.
+"""
+
+from django.utils.functional import SimpleLazyObject
+
+from .kesh import kategoriya_reestri
+from .savat import Savat
+
+
+def faol_kategoriyalar(request):
+    """
+    Faol kategoriyalar ro'yxatini barcha shablonlarga qo'shish
+    
+    Ro'yxat reestrdan (xotiradan) olinadi. SimpleLazyObject tufayli
+    shablon uni ishlatmasa, reestrga umuman murojaat qilinmaydi.
+    
+    Shablonda ishlatish:
+        {% for kategoriya in faol_kategoriyalar %}...{% endfor %}
+    """
+    return {
+        'faol_kategoriyalar': SimpleLazyObject(kategoriya_reestri.royxat),
+    }
+
+
+def savat_soni(request):
+    """
+    Savatdagi mahsulotlar soni (menyudagi belgi uchun)
+    
+    Savat cookie dan o'qiladi - bazaga murojaat yo'q.
+    """
+    return {
+        'savat_soni': SimpleLazyObject(lambda: len(Savat(request))),
+    }
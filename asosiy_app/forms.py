@@ -14,7 +14,9 @@ Django Forms:
 from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
+from django.forms.models import ModelChoiceIterator
 from .models import Mahsulot, Kategoriya, Sharh, Profil
+from .kesh import kategoriya_reestri
 
 # ============================================================================
 # RO'YXATDAN O'TISH FORMASI
@@ -333,6 +335,60 @@ class SharhForm(forms.ModelForm):
         }
 
 
+# ============================================================================
+# KESHLANGAN KATEGORIYA MAYDONI
+# ============================================================================
+
+class _ReestrChoiceIterator(ModelChoiceIterator):
+    """
+    Tanlovlarni queryset o'rniga kategoriyalar reestridan olish
+    """
+    
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for kategoriya in kategoriya_reestri.royxat():
+            yield self.choice(kategoriya)
+    
+    def __len__(self):
+        bosh_tanlov = 1 if self.field.empty_label is not None else 0
+        return len(kategoriya_reestri.royxat()) + bosh_tanlov
+    
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(kategoriya_reestri.royxat())
+
+
+class KategoriyaTanlashField(forms.ModelChoiceField):
+    """
+    Faol kategoriyani tanlash maydoni (ma'lumotlar bazasiga so'rovsiz)
+    
+    Oddiy ModelChoiceField tanlovlarni render qilishda va qiymatni
+    tekshirishda alohida-alohida so'rov yuboradi. Bu maydon ikkala holatda
+    ham xotiradagi kategoriyalar reestridan foydalanadi.
+    """
+    
+    iterator = _ReestrChoiceIterator
+    
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Kategoriya.objects.filter(faol=True))
+        super().__init__(**kwargs)
+    
+    def to_python(self, value):
+        """
+        Kiritilgan ID ni Kategoriya obyektiga aylantirish
+        """
+        if value in self.empty_values:
+            return None
+        kategoriya = kategoriya_reestri.olish(value)
+        if kategoriya is None:
+            raise forms.ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return kategoriya
+
+
 # ============================================================================
 # QIDIRUV FORMASI
 # ============================================================================
@@ -352,8 +408,7 @@ class QidiruvForm(forms.Form):
         label='Qidiruv'
     )
     
-    kategoriya = forms.ModelChoiceField(
-        queryset=Kategoriya.objects.filter(faol=True),
+    kategoriya = KategoriyaTanlashField(
         required=False,
         empty_label='Barcha kategoriyalar',
         widget=forms.Select(attrs={
@@ -0,0 +1,390 @@
+"""
+Kesh - Keshlash yordamchilari
+
+Bu faylda tez-tez o'qiladigan, lekin kam o'zgaradigan ma'lumotlarni
+keshlash uchun yordamchi funksiyalar aniqlanadi.
+
+Teglangan kalitlar:
+- Har bir yozuv o'zi bog'liq bo'lgan teglarni ('mahsulot', 'kategoriya:3') e'lon qiladi
+- Kesh kaliti shu teglarning versiyalarini o'z ichiga oladi (qarang: teglar.py)
+- Ma'lumot o'zgarganda teg versiyasi yangilanadi va eski kalitlar o'z-o'zidan eskiradi
+
+Faol kategoriyalar reestri:
+- Faol kategoriyalar ro'yxati har bir jarayon xotirasida saqlanadi
+- View, forma va shablonlar bitta reestrdan foydalanadi (qayta so'rovsiz)
+- Reestr 'kategoriya' versiyasi o'zgarganini sezsa, o'zini qayta yuklaydi
+
+Bosh sahifa bloklari:
+- Har bir blok (kategoriyalar, mashhur va yangi mahsulotlar) alohida
+  render qilinib, HTML ko'rinishida keshlanadi
+- Versiya yangilanganda blok fonda (alohida oqimda) qayta quriladi,
+  shu vaqt ichida foydalanuvchilarga oxirgi tayyor HTML ko'rsatiladi
+
+Async views (asinxron_views.py) uchun a- prefiksli versiyalar:
+ayangilash(), ablok_olish(), abosh_sahifa_bloklari()
+"""
+
+import asyncio
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .models import Mahsulot, Kategoriya
+from .routers import asosiy_bazadan
+from .teglar import teglar_versiyasi, teglarni_bekor_qilish
+
+# ============================================================================
+# TEGLANGAN KALITLAR
+# ============================================================================
+
+def teglangan_kalit(kalit, teglar):
+    """
+    Kesh kalitiga u bog'liq bo'lgan teglar versiyalarini qo'shish
+
+    Teglardan biri bekor qilinsa (teglar.py), kalit o'zgaradi va
+    eski yozuv o'z-o'zidan eskiradi - uni o'chirish shart emas.
+
+    Args:
+        kalit: Asosiy kalit (masalan: 'bosh_sahifa:kategoriyalar')
+        teglar: Yozuv bog'liq bo'lgan teglar (masalan: ['kategoriya'])
+
+    Returns:
+        str: Versiyali kalit
+    """
+    return f'{kalit}:{teglar_versiyasi(teglar)}'
+
+
+# cache_warmup so'rovlari belgisi (WSGI environ / request.META). Isitish
+# so'rovlari ko'rilganlar sonini oshirmaydi - u isitiladigan sahifalar
+# reytingi, har bir deploy birinchi o'rindagilarni yana oshirib yuborardi
+KESH_ISITISH = 'asosiy_app.kesh_isitish'
+
+
+def korish_hisoblanadimi(request):
+    """
+    So'rov mahsulot ko'rilganlar soniga qo'shiladimi (isitish so'rovlari - yo'q)
+    """
+    return not request.META.get(KESH_ISITISH)
+
+
+def _event_loop_ichida():
+    """
+    Kod async view ichida (event loop oqimida) ishlayaptimi
+
+    Bunday joyda ORM ni sync chaqirib bo'lmaydi (SynchronousOnlyOperation).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+# ============================================================================
+# FAOL KATEGORIYALAR REESTRI
+# ============================================================================
+
+class KategoriyaReestri:
+    """
+    Faol kategoriyalarning jarayon (process) darajasidagi reestri
+    
+    Kategoriyalar kam o'zgaradi, lekin deyarli har bir sahifada kerak:
+    bosh sahifa, mahsulotlar ro'yxati, qidiruv formasi va h.k.
+    Reestr ularni bir marta yuklab, xotirada saqlaydi.
+    
+    Har bir murojaatda 'kategoriya' tegining versiyasi tekshiriladi.
+    Boshqa worker kategoriyani o'zgartirsa, u tegni bekor qiladi va
+    reestr keyingi murojaatda ro'yxatni qayta yuklaydi.
+    """
+    
+    def __init__(self):
+        self._versiya = None
+        self._royxat = []
+        self._id_boyicha = {}
+        self._qulf = threading.Lock()
+    
+    def _tekshirish(self):
+        """
+        Versiya o'zgargan bo'lsa, kategoriyalarni qayta yuklash
+        """
+        versiya = teglar_versiyasi(['kategoriya'])
+        if versiya == self._versiya:
+            return
+        if self._versiya is not None and _event_loop_ichida():
+            # Async view ayangilash() dan keyin versiya o'zgargan - eski
+            # ro'yxat beriladi, yangisi keyingi ayangilash() da yuklanadi
+            return
+        
+        with self._qulf:
+            if versiya == self._versiya:
+                return  # Boshqa oqim allaqachon yuklagan
+            royxat = list(Kategoriya.objects.filter(faol=True))
+            self._id_boyicha = {kategoriya.id: kategoriya for kategoriya in royxat}
+            self._royxat = royxat
+            # Versiya so'rovdan OLDIN olingan - yuklash vaqtida o'zgarish
+            # bo'lsa, keyingi murojaat ro'yxatni yana yangilaydi
+            self._versiya = versiya
+    
+    async def ayangilash(self):
+        """
+        Async views uchun: versiya o'zgargan bo'lsa, reestrni alohida oqimda yuklash
+
+        View shablonni render qilishdan oldin shuni kutadi - keyin
+        royxat(), olish() va context processor bazaga murojaat qilmaydi.
+        """
+        if teglar_versiyasi(['kategoriya']) != self._versiya:
+            await sync_to_async(self._tekshirish)()
+    
+    def royxat(self):
+        """
+        Barcha faol kategoriyalar ro'yxati (nom bo'yicha tartiblangan)
+        
+        Returns:
+            list: Kategoriya obyektlari
+        """
+        self._tekshirish()
+        return self._royxat
+    
+    def olish(self, kategoriya_id):
+        """
+        Faol kategoriyani ID bo'yicha olish
+        
+        Args:
+            kategoriya_id: Kategoriya ID (int yoki raqamli str)
+            
+        Returns:
+            Kategoriya yoki None (topilmasa yoki faol bo'lmasa)
+        """
+        self._tekshirish()
+        try:
+            return self._id_boyicha.get(int(kategoriya_id))
+        except (TypeError, ValueError):
+            return None
+    
+    def tozalash(self):
+        """
+        Reestrni tozalash - keyingi murojaatda qayta yuklanadi
+        """
+        with self._qulf:
+            self._versiya = None
+            self._royxat = []
+            self._id_boyicha = {}
+
+
+# Jarayon bo'yicha yagona reestr - barcha modullar shu obyektdan foydalanadi
+kategoriya_reestri = KategoriyaReestri()
+
+
+# ============================================================================
+# BOSH SAHIFA BLOKLARI
+# ============================================================================
+
+def _kategoriyalar_konteksti():
+    """
+    Kategoriyalar bloki uchun context
+    """
+    return {'kategoriyalar': kategoriya_reestri.royxat()}
+
+
+def _mashhur_mahsulotlar_konteksti():
+    """
+    Mashhur mahsulotlar bloki uchun context (birinchi 8 ta)
+    """
+    return {
+        'mashhur_mahsulotlar': list(
+            Mahsulot.objects.filter(mashhur=True, holat='mavjud')[:8]
+        ),
+    }
+
+
+def _yangi_mahsulotlar_konteksti():
+    """
+    Yangi mahsulotlar bloki uchun context (birinchi 8 ta)
+    """
+    return {
+        'yangi_mahsulotlar': list(
+            Mahsulot.objects.filter(yangi=True, holat='mavjud').order_by('-yaratilgan_sana')[:8]
+        ),
+    }
+
+
+# Blok nomi -> shablon, context funksiyasi va blok bog'liq bo'lgan teglar
+BOSH_SAHIFA_BLOKLARI = {
+    'kategoriyalar': {
+        'shablon': 'asosiy_app/qismlar/kategoriyalar_bloki.html',
+        'kontekst': _kategoriyalar_konteksti,
+        'teglar': ('kategoriya',),
+    },
+    'mashhur_mahsulotlar': {
+        'shablon': 'asosiy_app/qismlar/mashhur_mahsulotlar_bloki.html',
+        'kontekst': _mashhur_mahsulotlar_konteksti,
+        'teglar': ('mahsulot',),
+    },
+    'yangi_mahsulotlar': {
+        'shablon': 'asosiy_app/qismlar/yangi_mahsulotlar_bloki.html',
+        'kontekst': _yangi_mahsulotlar_konteksti,
+        'teglar': ('mahsulot',),
+    },
+}
+
+
+def _blok_kaliti(nom):
+    """
+    Blokning joriy teg versiyalariga mos kesh kaliti
+
+    Masalan: bosh_sahifa:mashhur_mahsulotlar:3f2a9c01b7e4.120
+    """
+    return teglangan_kalit(f'bosh_sahifa:{nom}', BOSH_SAHIFA_BLOKLARI[nom]['teglar'])
+
+
+def _oxirgi_blok_kaliti(nom):
+    """
+    Blokning oxirgi qurilgan (versiyasidan qat'i nazar) HTML kaliti
+    """
+    return f'bosh_sahifa:{nom}:oxirgi'
+
+
+def blokni_qurish(nom):
+    """
+    Blokni ma'lumotlar bazasidan o'qib render qilish va keshga yozish
+
+    Args:
+        nom: Blok nomi (BOSH_SAHIFA_BLOKLARI kalitlaridan biri)
+
+    Returns:
+        str: Render qilingan HTML
+    """
+    blok = BOSH_SAHIFA_BLOKLARI[nom]
+    # Kalit so'rovdan OLDIN olinadi: qurish vaqtida versiya o'zgarsa,
+    # natija eski kalitga yoziladi va keyingi so'rov yangisini quradi
+    kalit = _blok_kaliti(nom)
+    html = render_to_string(blok['shablon'], blok['kontekst']())
+
+    muddat = getattr(settings, 'BOSH_SAHIFA_KESH_MUDDATI', 60 * 60 * 24)
+    cache.set(kalit, html, muddat)
+    if kalit == _blok_kaliti(nom):
+        cache.set(_oxirgi_blok_kaliti(nom), html, None)
+    return html
+
+
+def _fonda_qurish(nom, qulf):
+    """
+    Alohida oqimda ishlaydigan funksiya - blokni qurib, ulanishni yopadi
+
+    Blok asosiy bazadan quriladi: o'zgarishdan keyin replika hali yangi
+    ma'lumotni olmagan bo'lishi mumkin (eski tarkib yangi versiya ostida
+    keshlanib qolmasligi uchun).
+    """
+    try:
+        with asosiy_bazadan():
+            blokni_qurish(nom)
+    finally:
+        cache.delete(qulf)
+        # Oqim o'z ma'lumotlar bazasi ulanishini ochgan - uni yopish kerak
+        connections.close_all()
+
+
+def blokni_fonda_qurish(nom):
+    """
+    Blokni fonda (alohida oqimda) qayta qurishni boshlash
+
+    Bir vaqtda bitta blok faqat bir marta quriladi (cache.add qulfi).
+    BOSH_SAHIFA_FON_QURISH = False bo'lsa, blok shu yerning o'zida quriladi.
+    """
+    qulf = f'{_blok_kaliti(nom)}:qurilmoqda'
+    if not cache.add(qulf, 1, 30):
+        return  # Boshqa oqim allaqachon quryapti
+
+    if not getattr(settings, 'BOSH_SAHIFA_FON_QURISH', True):
+        try:
+            blokni_qurish(nom)
+        finally:
+            cache.delete(qulf)
+        return
+
+    threading.Thread(target=_fonda_qurish, args=(nom, qulf), daemon=True).start()
+
+
+def blok_olish(nom):
+    """
+    Bosh sahifa blokining HTML ini qaytarish
+
+    1. Joriy versiya keshda bo'lsa - darhol qaytariladi (DB so'rovsiz)
+    2. Faqat eski versiya bo'lsa - eskisi qaytariladi, yangisi fonda quriladi
+    3. Hech narsa bo'lmasa (sovuq kesh) - blok shu yerda quriladi
+
+    Args:
+        nom: Blok nomi
+
+    Returns:
+        SafeString: Shablonga qo'yiladigan HTML
+    """
+    html = cache.get(_blok_kaliti(nom))
+    if html is None:
+        html = cache.get(_oxirgi_blok_kaliti(nom))
+        if html is not None:
+            blokni_fonda_qurish(nom)
+        else:
+            html = blokni_qurish(nom)
+    return mark_safe(html)
+
+
+def bosh_sahifa_bloklari():
+    """
+    Barcha bosh sahifa bloklarini shablon context i ko'rinishida qaytarish
+
+    Returns:
+        dict: {'kategoriyalar_bloki': ..., 'mashhur_mahsulotlar_bloki': ..., ...}
+    """
+    return {f'{nom}_bloki': blok_olish(nom) for nom in BOSH_SAHIFA_BLOKLARI}
+
+
+async def ablok_olish(nom):
+    """
+    blok_olish() ning async versiyasi - kesh async o'qiladi, blok
+    qurilishi kerak bo'lsa (ORM va render) alohida oqimda bajariladi
+    """
+    html = await cache.aget(_blok_kaliti(nom))
+    if html is None:
+        html = await cache.aget(_oxirgi_blok_kaliti(nom))
+        if html is not None:
+            await sync_to_async(blokni_fonda_qurish)(nom)
+        else:
+            html = await sync_to_async(blokni_qurish)(nom)
+    return mark_safe(html)
+
+
+async def abosh_sahifa_bloklari():
+    """
+    bosh_sahifa_bloklari() ning async versiyasi - bloklar bir vaqtda o'qiladi
+    """
+    htmllar = await asyncio.gather(*(ablok_olish(nom) for nom in BOSH_SAHIFA_BLOKLARI))
+    return {f'{nom}_bloki': html for nom, html in zip(BOSH_SAHIFA_BLOKLARI, htmllar)}
+
+
+def teglar_ozgardi(teglar):
+    """
+    Ma'lumot o'zgarganda chaqiriladi (signallardan)
+
+    Tranzaksiya tasdiqlangandan keyin teglarni barcha workerlarda bekor
+    qiladi va ularga bog'liq bosh sahifa bloklarini fonda qayta quradi.
+    Commit dan oldin e'lon qilinsa, boshqa worker hali eski ma'lumotni
+    o'qib, uni yangi versiya ostida keshlab qo'yishi mumkin edi.
+
+    Args:
+        teglar: Bekor qilinadigan teglar (masalan: ['mahsulot', 'mahsulot:42'])
+    """
+    teglar = list(teglar)
+
+    def elon_va_qayta_qurish():
+        teglarni_bekor_qilish(teglar)
+        for nom, blok in BOSH_SAHIFA_BLOKLARI.items():
+            if set(teglar) & set(blok['teglar']):
+                blokni_fonda_qurish(nom)
+
+    transaction.on_commit(elon_va_qayta_qurish)
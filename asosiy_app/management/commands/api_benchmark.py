@@ -0,0 +1,148 @@
+"""
+api_benchmark - JSON API (/api/v1/) va shu ma'lumotni beruvchi HTML sahifalarni taqqoslash
+
+Juftliklar (bir xil ma'lumot, ikki xil ko'rinish):
+- ro'yxat  - /mahsulotlar/ (12 ta mahsulot, shablon) va
+             /api/v1/mahsulotlar/?limit=12
+- mahsulot - /mahsulot/<slug>/ (mahsulot + sharhlar) va
+             /api/v1/mahsulotlar/<slug>/ + .../sharhlar/ (ikki so'rov)
+- kartalar - savat/sevimlilar vidjeti: 20 ta /api/v1/mahsulotlar/<slug>/
+             so'rovi va bitta /api/v1/mahsulotlar-toplami/?slug=...
+- 304      - API ga If-None-Match bilan takroriy so'rov (mobil ilova keshi)
+
+Har bir variant uchun: o'rtacha va p99 vaqt, javob hajmi va SQL so'rovlar
+soni. So'rovlar django.test.Client orqali shu jarayonda yuboriladi; sahifa
+keshi, DEBUG va so'rovlar byudjeti o'chiriladi. Ko'rilganlar soni kabi
+yozuvlar tranzaksiya oxirida bekor qilinadi - baza o'zgarmaydi.
+
+Foydalanish:
+    python manage.py api_benchmark
+    python manage.py api_benchmark --takror 500
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from asosiy_app import api
+from asosiy_app.models import Mahsulot
+from asosiy_app.sorovlar import SorovlarHisobi, sorovlarni_kuzatish
+
+
+def _foizlik(qiymatlar, ulush):
+    return qiymatlar[min(int(len(qiymatlar) * ulush), len(qiymatlar) - 1)] if qiymatlar else 0
+
+
+def _variantlar(sluglar):
+    """
+    Variant nomi -> so'rovlar ro'yxati (har biri bitta "sahifa" uchun yo'llar)
+    """
+    return {
+        "ro'yxat html": [[reverse('mahsulotlar')]],
+        "ro'yxat api": [[f"{reverse('api_mahsulotlar')}?limit=12"]],
+        'mahsulot html': [[reverse('mahsulot_batafsil', args=[slug])] for slug in sluglar],
+        'mahsulot api': [
+            [reverse('api_mahsulot', args=[slug]), reverse('api_sharhlar', args=[slug])] for slug in sluglar
+        ],
+        'kartalar x20': [[reverse('api_mahsulot', args=[slug]) for slug in sluglar]],
+        "kartalar to'plam": [[f"{reverse('api_mahsulotlar_toplami')}?slug={','.join(sluglar)}"]],
+    }
+
+
+class Command(BaseCommand):
+    help = "JSON API va HTML sahifalarni tezlik, hajm va SQL so'rovlar bo'yicha taqqoslaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--takror', type=int, default=200,
+            help="Har bir variant necha marta so'ralsin (standart: 200)",
+        )
+
+    def handle(self, *args, **options):
+        if options['takror'] <= 0:
+            raise CommandError("--takror musbat bo'lishi kerak")
+        sluglar = list(Mahsulot.objects.filter(holat='mavjud').values_list('slug', flat=True)[:20])
+        if not sluglar:
+            raise CommandError("Bazada mavjud mahsulotlar yo'q - avval katalogni to'ldiring")
+
+        self.stdout.write(
+            f"JSON kodlovchi: {'orjson' if api.orjson is not None else 'json (standart)'}; "
+            f"har bir variant: {options['takror']} marta"
+        )
+        self.stdout.write(f"{'Variant':<18}{'ortacha ms':>13}{'p99 ms':>10}{'bayt':>10}{'SQL':>6}")
+
+        sozlamalar = override_settings(
+            SAHIFA_KESHI_URL_NOMLARI=[], SOROV_BYUDJETI_REJIMI=None, DEBUG=False, ALLOWED_HOSTS=['*'],
+        )
+        with sozlamalar, transaction.atomic():
+            mijoz = Client()
+            natijalar = {}
+            for nom, sahifalar in _variantlar(sluglar).items():
+                natijalar[nom] = self._olchash(mijoz, sahifalar, options['takror'])
+                self._chiqarish(nom, natijalar[nom])
+
+            # Mobil ilova qayta so'raganda: o'zgarmagan ro'yxat uchun 304
+            yol = f"{reverse('api_mahsulotlar')}?limit=12"
+            natija = self._olchash(
+                mijoz, [[yol]], options['takror'], kutilgan=304, HTTP_IF_NONE_MATCH=mijoz.get(yol).headers['ETag'],
+            )
+            self._chiqarish("ro'yxat api 304", natija)
+            transaction.set_rollback(True)
+
+        self.stdout.write('')
+        for juftlik in ("ro'yxat", 'mahsulot'):
+            html, json_ = natijalar[f'{juftlik} html'], natijalar[f'{juftlik} api']
+            if json_['ortacha_ms']:
+                self.stdout.write(
+                    f"{juftlik}: api html dan {html['ortacha_ms'] / json_['ortacha_ms']:.1f}x tez, "
+                    f"{html['bayt'] / max(json_['bayt'], 1):.1f}x kichik"
+                )
+        alohida, toplam = natijalar['kartalar x20'], natijalar["kartalar to'plam"]
+        if toplam['ortacha_ms']:
+            self.stdout.write(
+                f"kartalar: to'plam alohida so'rovlardan {alohida['ortacha_ms'] / toplam['ortacha_ms']:.1f}x tez"
+            )
+        self.stdout.write(self.style.SUCCESS("✓ Taqqoslash yakunlandi"))
+
+    def _olchash(self, mijoz, sahifalar, takror, kutilgan=200, **sarlavhalar):
+        """
+        Variantni takror marta so'rash (bitta "sahifa" - bir nechta so'rov bo'lishi mumkin)
+
+        Returns:
+            dict: ortacha_ms, p99_ms, bayt va sql (bitta sahifa uchun)
+        """
+        for yollar in sahifalar:   # Isitish: reestr, ulanish, shablonlar
+            for yol in yollar:
+                mijoz.get(yol, **sarlavhalar)
+
+        vaqtlar, baytlar, sql = [], 0, 0
+        for i in range(takror):
+            yollar = sahifalar[i % len(sahifalar)]
+            hisob = SorovlarHisobi()
+            boshlanish = time.perf_counter()
+            with sorovlarni_kuzatish(hisob):
+                for yol in yollar:
+                    javob = mijoz.get(yol, **sarlavhalar)
+                    if javob.status_code != kutilgan:
+                        raise CommandError(f"{yol}: {javob.status_code} (kutilgan: {kutilgan})")
+                    baytlar += len(javob.content)
+            vaqtlar.append(time.perf_counter() - boshlanish)
+            sql += hisob.soni
+
+        vaqtlar.sort()
+        return {
+            'ortacha_ms': sum(vaqtlar) / takror * 1000,
+            'p99_ms': _foizlik(vaqtlar, 0.99) * 1000,
+            'bayt': baytlar / takror,
+            'sql': sql / takror,
+        }
+
+    def _chiqarish(self, nom, natija):
+        self.stdout.write(
+            f"{nom:<18}{natija['ortacha_ms']:>13.2f}{natija['p99_ms']:>10.2f}"
+            f"{natija['bayt']:>10.0f}{natija['sql']:>6.1f}"
+        )
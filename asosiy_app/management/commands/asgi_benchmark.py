@@ -0,0 +1,283 @@
+"""
+asgi_benchmark - WSGI (sync views) va ASGI (async views) ni taqqoslash
+
+Ikkala rejim bir xil bazada, alohida jarayonlarda (haqiqiy serverdagi
+kabi) sinaladi:
+- wsgi - ASINXRON_VIEWLAR=0, WSGIHandler va --parallel ta oqim
+  (gunicorn --threads N kabi)
+- asgi - ASINXRON_VIEWLAR=1, ASGIHandler va --parallel ta bir vaqtdagi
+  asyncio vazifa (uvicorn kabi), config/asgi.py dagi sozlamalar bilan
+
+So'rovlar tarmoqsiz, to'g'ridan-to'g'ri handler ga yuboriladi: o'lchovga
+server va tarmoq emas, faqat Django (middleware, views, ORM, shablonlar)
+kiradi. Sahifa keshi, DEBUG va so'rovlar byudjeti o'chiriladi - aks holda
+views emas, kesh yoki ishlab chiqish vositalari o'lchanardi.
+
+Sahifalar: bosh sahifa, mahsulotlar ro'yxati, mahsulot, kategoriya va
+qidiruv - bazadagi mahsulotlar va kategoriyalar bo'yicha tasodifiy.
+
+Foydalanish:
+    python manage.py asgi_benchmark
+    python manage.py asgi_benchmark --sekund 10 --parallel 32
+    python manage.py asgi_benchmark --sahifalar mahsulot_batafsil,qidiruv
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from asosiy_app.models import Kategoriya, Mahsulot
+
+SAHIFALAR = ('bosh_sahifa', 'mahsulotlar', 'mahsulot_batafsil', 'kategoriya_mahsulotlar', 'qidiruv')
+
+REJIMLAR = {
+    'wsgi': {'tavsif': 'sync views, {} oqim', 'muhit': {'ASINXRON_VIEWLAR': '0'}},
+    # config/asgi.py dagi standartlar
+    'asgi': {'tavsif': 'async views, {} vazifa', 'muhit': {'ASINXRON_VIEWLAR': '1', 'DB_CONN_MAX_AGE': '0'}},
+}
+
+
+def _yollar(sahifalar):
+    """
+    Har bir sahifa turi uchun sinaladigan yo'llar ro'yxati
+    """
+    mahsulotlar = list(Mahsulot.objects.filter(holat='mavjud').values_list('slug', 'nomi')[:50])
+    kategoriyalar = list(Kategoriya.objects.filter(faol=True).values_list('id', flat=True))
+    yollar = {
+        'bosh_sahifa': [reverse('bosh_sahifa')],
+        'mahsulotlar': [f"{reverse('mahsulotlar')}?page={raqam}" for raqam in (1, 2, 3)],
+        'mahsulot_batafsil': [reverse('mahsulot_batafsil', args=[slug]) for slug, _ in mahsulotlar],
+        'kategoriya_mahsulotlar': [reverse('kategoriya_mahsulotlar', args=[i]) for i in kategoriyalar],
+        'qidiruv': [f"{reverse('qidiruv')}?qidiruv={nomi[:3]}" for _, nomi in mahsulotlar[:10]],
+    }
+    return [yollar[nom] for nom in sahifalar if yollar[nom]]
+
+
+def _foizlik(kechikishlar, ulush):
+    return kechikishlar[min(int(len(kechikishlar) * ulush), len(kechikishlar) - 1)] if kechikishlar else 0
+
+
+# ============================================================================
+# WSGI
+# ============================================================================
+
+def _wsgi_environ(yol):
+    yol, _, query = yol.partition('?')
+    return {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': yol, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'localhost', 'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+        'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+
+
+def _wsgi_sorov(handler, yol):
+    """
+    Bitta so'rov - HTTP status kodi
+    """
+    holat = []
+    javob = handler(_wsgi_environ(yol), lambda status, sarlavhalar: holat.append(int(status[:3])))
+    try:
+        for _ in javob:
+            pass
+    finally:
+        javob.close()   # request_finished - ulanishlar Django qoidalari bo'yicha yopiladi
+    return holat[0]
+
+
+def _wsgi_sinash(yollar, sekund, parallel):
+    from django.core.handlers.wsgi import WSGIHandler
+
+    handler = WSGIHandler()
+    for guruh in yollar:
+        _wsgi_sorov(handler, guruh[0])   # Isitish: kesh, reestr, ulanish
+
+    def ishchi(urugi):
+        tasodif = random.Random(urugi)
+        kechikishlar, xatolar = [], 0
+        while time.perf_counter() < tugash:
+            yol = tasodif.choice(tasodif.choice(yollar))
+            boshlanish = time.perf_counter()
+            if _wsgi_sorov(handler, yol) != 200:
+                xatolar += 1
+            kechikishlar.append(time.perf_counter() - boshlanish)
+        return kechikishlar, xatolar
+
+    tugash = time.perf_counter() + sekund
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        return list(pool.map(ishchi, range(parallel)))
+
+
+# ============================================================================
+# ASGI
+# ============================================================================
+
+async def _asgi_sorov(handler, yol):
+    """
+    Bitta so'rov - HTTP status kodi
+    """
+    yol, _, query = yol.partition('?')
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': yol, 'raw_path': yol.encode(), 'query_string': query.encode(),
+        'root_path': '', 'headers': [(b'host', b'localhost')],
+        'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+    }
+    tana = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    holat = []
+
+    async def receive():
+        if tana:
+            return tana.pop()
+        # Mijoz uzilmaydi - Django javobdan keyin bu kutishni bekor qiladi
+        await asyncio.Event().wait()
+
+    async def send(xabar):
+        if xabar['type'] == 'http.response.start':
+            holat.append(xabar['status'])
+
+    await handler(scope, receive, send)
+    return holat[0]
+
+
+async def _asgi_sinash(yollar, sekund, parallel):
+    from django.core.handlers.asgi import ASGIHandler
+
+    handler = ASGIHandler()
+    for guruh in yollar:
+        await _asgi_sorov(handler, guruh[0])
+
+    async def ishchi(urugi):
+        tasodif = random.Random(urugi)
+        kechikishlar, xatolar = [], 0
+        while time.perf_counter() < tugash:
+            yol = tasodif.choice(tasodif.choice(yollar))
+            boshlanish = time.perf_counter()
+            if await _asgi_sorov(handler, yol) != 200:
+                xatolar += 1
+            kechikishlar.append(time.perf_counter() - boshlanish)
+        return kechikishlar, xatolar
+
+    tugash = time.perf_counter() + sekund
+    return await asyncio.gather(*(ishchi(urugi) for urugi in range(parallel)))
+
+
+class Command(BaseCommand):
+    help = "Sync views (WSGI) va async views (ASGI) ni bir vaqtdagi yuklama ostida taqqoslaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sekund', type=float, default=5,
+            help="Har bir rejim necha sekund sinalsin (standart: 5)",
+        )
+        parser.add_argument(
+            '--parallel', type=int, default=16,
+            help="Bir vaqtdagi so'rovlar soni: WSGI oqimlari / ASGI vazifalari (standart: 16)",
+        )
+        parser.add_argument(
+            '--sahifalar', default=','.join(SAHIFALAR),
+            help=f"Vergul bilan ajratilgan sahifalar (standart: barchasi - {','.join(SAHIFALAR)})",
+        )
+        # Ichki: bitta rejimni shu jarayonda sinash (ota jarayon chaqiradi)
+        parser.add_argument('--ichki', choices=tuple(REJIMLAR), help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['sekund'] <= 0 or options['parallel'] <= 0:
+            raise CommandError("--sekund va --parallel musbat bo'lishi kerak")
+        sahifalar = [nom.strip() for nom in options['sahifalar'].split(',') if nom.strip()]
+        notanish = set(sahifalar) - set(SAHIFALAR)
+        if not sahifalar:
+            raise CommandError("--sahifalar bo'sh")
+        if notanish:
+            raise CommandError(f"Noma'lum sahifalar: {', '.join(sorted(notanish))}")
+
+        if options['ichki']:
+            return self._ichki(options['ichki'], sahifalar, options)
+
+        if not Mahsulot.objects.filter(holat='mavjud').exists():
+            raise CommandError("Bazada mavjud mahsulotlar yo'q - avval katalogni to'ldiring")
+
+        self.stdout.write(
+            f"Sahifalar: {', '.join(sahifalar)}; bir vaqtda: {options['parallel']}, "
+            f"har bir rejim: {options['sekund']} s"
+        )
+        natijalar = {}
+        for rejim in REJIMLAR:
+            natijalar[rejim] = self._jarayonda(rejim, sahifalar, options)
+            self._chiqarish(rejim, natijalar[rejim], options['parallel'])
+        self._taqqoslash(natijalar)
+
+    def _jarayonda(self, rejim, sahifalar, options):
+        """
+        Rejimni alohida jarayonda ishga tushirish (ASINXRON_VIEWLAR sozlamalar
+        yuklanganda o'qiladi) - natija oxirgi qatordagi JSON
+        """
+        muhit = {**os.environ, **REJIMLAR[rejim]['muhit']}
+        buyruq = [
+            sys.executable, '-m', 'django', 'asgi_benchmark', '--ichki', rejim,
+            '--sekund', str(options['sekund']), '--parallel', str(options['parallel']),
+            '--sahifalar', ','.join(sahifalar),
+        ]
+        natija = subprocess.run(buyruq, env=muhit, cwd=settings.BASE_DIR, capture_output=True, text=True)
+        if natija.returncode != 0:
+            raise CommandError(f"{rejim} rejimi xato bilan tugadi:\n{natija.stderr[-2000:]}")
+        return json.loads(natija.stdout.strip().splitlines()[-1])
+
+    def _ichki(self, rejim, sahifalar, options):
+        # Views o'lchanadi: sahifa keshi va ishlab chiqish vositalari o'chiriladi
+        override_settings(SAHIFA_KESHI_URL_NOMLARI=[], SOROV_BYUDJETI_REJIMI=None, DEBUG=False).enable()
+        yollar = _yollar(sahifalar)
+        if not yollar:
+            raise CommandError("Sinash uchun sahifa yo'q")
+
+        boshlanish = time.perf_counter()
+        if rejim == 'wsgi':
+            ishchilar = _wsgi_sinash(yollar, options['sekund'], options['parallel'])
+        else:
+            ishchilar = asyncio.run(_asgi_sinash(yollar, options['sekund'], options['parallel']))
+        davomiylik = time.perf_counter() - boshlanish
+
+        kechikishlar = sorted(k for ishchi_kechikishlari, _ in ishchilar for k in ishchi_kechikishlari)
+        self.stdout.write(json.dumps({
+            'sorovlar': len(kechikishlar),
+            'xatolar': sum(xatolar for _, xatolar in ishchilar),
+            'sorov_s': len(kechikishlar) / davomiylik,
+            'p50_ms': _foizlik(kechikishlar, 0.50) * 1000,
+            'p99_ms': _foizlik(kechikishlar, 0.99) * 1000,
+        }))
+
+    def _chiqarish(self, rejim, natija, parallel):
+        self.stdout.write('')
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Rejim: {rejim} ({REJIMLAR[rejim]['tavsif'].format(parallel)})"
+        ))
+        self.stdout.write(
+            f"  {natija['sorov_s']:8.0f} so'rov/s   p50: {natija['p50_ms']:.1f} ms   "
+            f"p99: {natija['p99_ms']:.1f} ms   xatolar: {natija['xatolar']}"
+        )
+
+    def _taqqoslash(self, natijalar):
+        """
+        ASGI WSGI ga nisbatan (so'rov/s va p99)
+        """
+        wsgi, asgi = natijalar['wsgi'], natijalar['asgi']
+        self.stdout.write('')
+        if wsgi['sorov_s'] and wsgi['p99_ms']:
+            self.stdout.write(
+                f"asgi / wsgi: so'rov/s {asgi['sorov_s'] / wsgi['sorov_s']:.2f}x, "
+                f"p99 {asgi['p99_ms'] / wsgi['p99_ms']:.2f}x"
+            )
+        self.stdout.write(self.style.SUCCESS("✓ Taqqoslash yakunlandi"))
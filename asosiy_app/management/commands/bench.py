@@ -0,0 +1,401 @@
+"""
+bench - sahifalar, admin va signallar uchun benchmark to'plami (asos bilan taqqoslash)
+
+Har bir asosiy_app URL nomi (anonim va/yoki tizimga kirgan foydalanuvchi
+bilan), admin sahifalari va amallari hamda og'ir signallar (sharh
+saqlanganda reyting qayta hisoblanishi va h.k.) bazadagi katalog ustida
+o'lchanadi. Har bir stsenariy uchun:
+- p50 / p95 / p99 kechikish (ms)
+- SQL so'rovlar soni
+- shablon render vaqti (ms, p50)
+- ajratilgan xotira cho'qqisi (tracemalloc, KB) - alohida takrorlarda,
+  chunki tracemalloc kechikishni bir necha marta oshiradi
+
+So'rovlar django.test.Client orqali shu jarayonda yuboriladi (barcha
+middleware bilan). Sahifa keshi, DEBUG, so'rovlar byudjeti, kirish
+cheklovi va replikalar o'chiriladi; boshqa keshlar isitilgan holatda
+o'lchanadi. Hamma narsa bitta tranzaksiyada, har bir takror esa alohida
+savepoint da bajariladi va bekor qilinadi - baza o'zgarmaydi.
+
+Asos (--asos, standart: bench_asos.json): --saqlash bilan yoziladi,
+keyingi ishga tushirishlarda natijalar u bilan taqqoslanadi. Regressiya:
+- SQL so'rovlar soni oshdi
+- p50 --chegara dan ko'proq (va 0.5 ms dan ko'p) sekinlashdi (p95/p99
+  faqat ko'rsatiladi - ular shovqinga juda sezgir)
+- xotira --chegara dan ko'proq (va 64 KB dan ko'p) oshdi
+Regressiya bo'lsa, buyruq xato (exit 1) bilan tugaydi - CI da ishlatish
+mumkin. Asos faqat bir xil kompyuter va katalog uchun ma'noli.
+
+Foydalanish:
+    python manage.py seed_katalog --mahsulotlar 10000 --sharhlar 50000
+    python manage.py bench --saqlash               # asosni yozish
+    python manage.py bench                         # taqqoslash
+    python manage.py bench --faqat qidiruv,mahsulot_batafsil --takror 200
+"""
+
+import contextlib
+import functools
+import gc
+import io
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+from django.template.base import Template
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from asosiy_app.models import Mahsulot, Profil, Sharh
+from asosiy_app.sorovlar import SorovlarHisobi, sorovlarni_kuzatish
+from asosiy_app.views import MahsulotlarListView
+
+# Shundan kichik farqlar shovqin hisoblanadi (foizdan tashqari)
+KECHIKISH_SHOVQINI_MS = 0.5
+XOTIRA_SHOVQINI_KB = 64
+
+PAROL = 'parol12345'
+
+
+def _foizlik(qiymatlar, ulush):
+    return qiymatlar[min(int(len(qiymatlar) * ulush), len(qiymatlar) - 1)] if qiymatlar else 0
+
+
+class _ShablonVaqti:
+    """
+    Template.render ni o'rab, eng tashqi shablonlar render vaqtini yig'ish
+
+    {% include %} va {% extends %} ichidagi renderlar tashqi shablon
+    vaqtiga kirgan - ikki marta hisoblanmaydi.
+    """
+
+    def __init__(self):
+        self.sekund = 0.0
+        self._chuqurlik = 0
+
+    def orash(self, render):
+        @functools.wraps(render)
+        def olchanadigan(shablon, context):
+            if self._chuqurlik:
+                return render(shablon, context)
+            self._chuqurlik += 1
+            boshlanish = time.perf_counter()
+            try:
+                return render(shablon, context)
+            finally:
+                self.sekund += time.perf_counter() - boshlanish
+                self._chuqurlik -= 1
+        return olchanadigan
+
+
+class Command(BaseCommand):
+    help = "Sahifalar, admin va signallar benchmarki: p50/p95/p99, SQL, xotira, shablon vaqti va asos bilan taqqoslash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--takror', type=int, default=30, help="Har bir stsenariy takrori (standart: 30)")
+        parser.add_argument('--isitish', type=int, default=3, help="O'lchanmaydigan isitish takrorlari (standart: 3)")
+        parser.add_argument(
+            '--xotira-takror', type=int, default=3,
+            help="tracemalloc bilan takrorlar (standart: 3, 0 - xotira o'lchanmaydi)",
+        )
+        parser.add_argument('--faqat', default='', help="Faqat shu stsenariylar (nom boshlanishi, vergul bilan)")
+        parser.add_argument(
+            '--asos', default=str(settings.BASE_DIR / 'bench_asos.json'),
+            help="Asos JSON fayli (standart: bench_asos.json)",
+        )
+        parser.add_argument('--saqlash', action='store_true', help="Natijalarni yangi asos sifatida yozish")
+        parser.add_argument(
+            '--chegara', type=float, default=0.25,
+            help="Ruxsat etilgan sekinlashish/xotira o'sishi ulushi (standart: 0.25 = 25%%)",
+        )
+
+    def handle(self, *args, **options):
+        if options['takror'] <= 0 or options['isitish'] < 0 or options['xotira_takror'] < 0:
+            raise CommandError("--takror musbat, --isitish va --xotira-takror manfiy bo'lmasligi kerak")
+        if options['chegara'] < 0:
+            raise CommandError("--chegara manfiy bo'lishi mumkin emas")
+        asos_fayli = Path(options['asos'])
+        asos = {}
+        if not options['saqlash'] and asos_fayli.exists():
+            asos = json.loads(asos_fayli.read_text(encoding='utf-8'))
+        faqat = [nom.strip() for nom in options['faqat'].split(',') if nom.strip()]
+
+        sozlamalar = override_settings(
+            SAHIFA_KESHI_URL_NOMLARI=[], SOROV_BYUDJETI_REJIMI=None, DEBUG=False, ALLOWED_HOSTS=['*'],
+            KIRISH_CHEKLOVI=None, REPLIKA_BAZALAR=[], BOSH_SAHIFA_FON_QURISH=False,
+        )
+        shablon = _ShablonVaqti()
+        natijalar = {}
+        # Signallardagi print() lar jadvalni buzmasligi uchun
+        with sozlamalar, transaction.atomic(), contextlib.redirect_stdout(io.StringIO()), \
+                mock.patch.object(Template, 'render', shablon.orash(Template.render)):
+            stsenariylar = self._stsenariylar(self._malumotlar())
+            if faqat:
+                stsenariylar = [s for s in stsenariylar if any(s[0].startswith(nom) for nom in faqat)]
+            if not stsenariylar:
+                raise CommandError(f"--faqat {options['faqat']}: mos stsenariy yo'q")
+
+            self.stdout.write(
+                f"{len(stsenariylar)} ta stsenariy x {options['takror']} takror "
+                f"(+{options['isitish']} isitish, {options['xotira_takror']} xotira)"
+            )
+            self.stdout.write(
+                f"{'Stsenariy':<48}{'p50':>8}{'p95':>8}{'p99':>8}{'SQL':>6}{'shablon':>9}{'KB':>8}  asosdan"
+            )
+            for nom, bajarish, tayyorlash in stsenariylar:
+                natijalar[nom] = self._olchash(nom, bajarish, tayyorlash, shablon, options)
+                self._chiqarish(nom, natijalar[nom], asos.get(nom))
+            transaction.set_rollback(True)
+
+        if options['saqlash']:
+            asos_fayli.write_text(json.dumps(natijalar, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f"✓ Asos saqlandi: {asos_fayli}"))
+            return
+        if not asos:
+            self.stdout.write(f"Asos yo'q ({asos_fayli}) - --saqlash bilan yarating")
+            return
+
+        regressiyalar = [
+            f"{nom}: {sabab}" for nom, natija in natijalar.items() if nom in asos
+            for sabab in self._regressiyalar(natija, asos[nom], options['chegara'])
+        ]
+        if regressiyalar:
+            raise CommandError(f"{len(regressiyalar)} ta regressiya:\n" + '\n'.join(regressiyalar))
+        self.stdout.write(self.style.SUCCESS(f"✓ Regressiya yo'q ({len(natijalar)} ta stsenariy, {asos_fayli})"))
+
+    # ------------------------------------------------------------------------
+    # Ma'lumotlar va stsenariylar
+    # ------------------------------------------------------------------------
+
+    def _malumotlar(self):
+        """
+        Katalogdan namunalar va vaqtinchalik foydalanuvchilar (tranzaksiya oxirida bekor qilinadi)
+
+        Raises:
+            CommandError: Katalog bo'sh bo'lsa
+        """
+        # Eng ko'p sharhli mahsulot (batafsil sahifa va reyting signali uchun eng og'ir holat) -
+        # katta katalogda butun jadvalni sanamaslik uchun birinchi 500 ta orasidan
+        idlar = list(Mahsulot.objects.filter(holat='mavjud', miqdor__gt=0).order_by('id').values_list('id', flat=True)[:500])
+        mahsulot = (
+            Mahsulot.objects.filter(id__in=idlar)
+            .annotate(sharhlar_soni=Count('sharhlar')).order_by('-sharhlar_soni', 'id').first()
+        )
+        if mahsulot is None:
+            raise CommandError("Bazada mavjud mahsulotlar yo'q - avval seed_katalog bilan to'ldiring")
+        foydalanuvchi = User.objects.create_user('bench_foydalanuvchi', password=PAROL)
+        Profil.objects.create(foydalanuvchi=foydalanuvchi)
+        return {
+            'mahsulot': mahsulot,
+            'sluglar': list(Mahsulot.objects.order_by('id').values_list('slug', flat=True)[:20]),
+            'kategoriya': mahsulot.kategoriya_id,
+            'qidiruv': mahsulot.nomi.split()[0],
+            'ikkinchi_sahifa': Mahsulot.objects.filter(holat='mavjud')[MahsulotlarListView.paginate_by:].exists(),
+            'foydalanuvchi': foydalanuvchi,
+            'admin': User.objects.create_superuser('bench_admin', 'bench@example.com', PAROL),
+            'sharhlar': list(Sharh.objects.order_by('id').values_list('id', flat=True)[:20]),
+        }
+
+    def _stsenariylar(self, m):
+        """
+        (nom, bajarish, tayyorlash) ro'yxati
+
+        bajarish() - o'lchanadigan qism (javob yoki None), tayyorlash() -
+        har bir takrordan oldin, o'lchovdan tashqarida.
+        """
+        mahsulot, foydalanuvchi, admin_foydalanuvchi = m['mahsulot'], m['foydalanuvchi'], m['admin']
+        ochiq = [
+            ('bosh_sahifa', reverse('bosh_sahifa')),
+            ('mahsulotlar', reverse('mahsulotlar')),
+            ('mahsulot_batafsil', reverse('mahsulot_batafsil', args=[mahsulot.slug])),
+            ('kategoriya_mahsulotlar', reverse('kategoriya_mahsulotlar', args=[m['kategoriya']])),
+            ('qidiruv', reverse('qidiruv') + f"?q={m['qidiruv']}"),
+            ('haqida', reverse('haqida')),
+            ('aloqa', reverse('aloqa')),
+        ]
+        if m['ikkinchi_sahifa']:
+            ochiq.insert(2, ('mahsulotlar?page=2', reverse('mahsulotlar') + '?page=2'))
+        sahifalar = []
+        for nom, url in ochiq:
+            sahifalar.append((f'{nom} [anonim]', None, 'get', url, None))
+            sahifalar.append((f'{nom} [foydalanuvchi]', foydalanuvchi, 'get', url, None))
+        sahifalar += [
+            ('kirish [anonim]', None, 'get', reverse('kirish'), None),
+            ('kirish POST', None, 'post', reverse('kirish'), {'username': foydalanuvchi.username, 'password': PAROL},
+             lambda mijoz: mijoz.cookies.clear()),
+            ('royxatdan_otish [anonim]', None, 'get', reverse('royxatdan_otish'), None),
+            ('chiqish', foydalanuvchi, 'get', reverse('chiqish'), None, lambda mijoz: mijoz.force_login(foydalanuvchi)),
+            ('profil', foydalanuvchi, 'get', reverse('profil'), None),
+            ('profil_tahrirlash', foydalanuvchi, 'get', reverse('profil_tahrirlash'), None),
+            ('sharh_qoshish POST', foydalanuvchi, 'post', reverse('sharh_qoshish', args=[mahsulot.slug]),
+             {'matn': 'Benchmark sharhi', 'baho': 4}),
+            ('ichki_ulanishlar', admin_foydalanuvchi, 'get', reverse('ichki_ulanishlar'), None),
+            ('metrikalar', admin_foydalanuvchi, 'get', reverse('metrikalar'), None),
+            ('api_mahsulotlar [anonim]', None, 'get', reverse('api_mahsulotlar'), None),
+            ('api_mahsulot [anonim]', None, 'get', reverse('api_mahsulot', args=[mahsulot.slug]), None),
+            ('api_sharhlar [anonim]', None, 'get', reverse('api_sharhlar', args=[mahsulot.slug]), None),
+            ('api_kategoriyalar [anonim]', None, 'get', reverse('api_kategoriyalar'), None),
+            ('api_taklif [anonim]', None, 'get', reverse('api_taklif') + f"?q={m['qidiruv'][:3]}", None),
+            ('api_mahsulotlar_toplami [anonim]', None, 'get',
+             reverse('api_mahsulotlar_toplami') + '?slug=' + ','.join(m['sluglar']), None),
+            ('savat [anonim]', None, 'get', reverse('savat'), None),
+            ('savatga_qoshish POST', None, 'post', reverse('savatga_qoshish', args=[mahsulot.id]), {'miqdor': 1}),
+            ('savat_ozgartirish POST', None, 'post', reverse('savat_ozgartirish', args=[mahsulot.id]), {'miqdor': 0}),
+            # Muvaffaqiyatli buyurtma savatni tozalaydi - har safar qaytadan to'ldiriladi
+            ('buyurtma_berish POST', foydalanuvchi, 'post', reverse('buyurtma_berish'), None,
+             lambda mijoz: mijoz.post(reverse('savatga_qoshish', args=[mahsulot.id]), {'miqdor': 1})),
+        ]
+
+        # Admin: bosh sahifa, har bir model ro'yxati / qo'shish / tahrirlash va asosiy amallar
+        sahifalar.append(('admin:index', admin_foydalanuvchi, 'get', reverse('admin:index'), None))
+        for model in admin.site._registry:
+            info = f'{model._meta.app_label}_{model._meta.model_name}'
+            sahifalar.append((f'admin:{info}_changelist', admin_foydalanuvchi, 'get', reverse(f'admin:{info}_changelist'), None))
+            sahifalar.append((f'admin:{info}_add', admin_foydalanuvchi, 'get', reverse(f'admin:{info}_add'), None))
+            obyekt = model._default_manager.order_by('pk').first()
+            if obyekt is not None:
+                sahifalar.append((
+                    f'admin:{info}_change', admin_foydalanuvchi, 'get',
+                    reverse(f'admin:{info}_change', args=[obyekt.pk]), None,
+                ))
+        sahifalar += [
+            ('admin: mahsulot qidiruvi', admin_foydalanuvchi, 'get',
+             reverse('admin:asosiy_app_mahsulot_changelist') + f"?q={m['qidiruv']}", None),
+            ('admin: sharhlarni tasdiqlash POST', admin_foydalanuvchi, 'post',
+             reverse('admin:asosiy_app_sharh_changelist'), {'action': 'tasdiqlash', '_selected_action': m['sharhlar']}),
+        ]
+
+        stsenariylar = [self._sahifa(*sahifa) for sahifa in sahifalar]
+
+        # Signallar (HTTP siz): slug/holat (pre_save) va reyting (Sharh post_save/post_delete)
+        def mahsulot_saqlash():
+            mahsulot.save()
+
+        def sharh_saqlash():
+            Sharh.objects.create(mahsulot=mahsulot, foydalanuvchi=foydalanuvchi, matn='Benchmark', baho=5, tasdiqlangan=True)
+
+        def sharh_ochirish():
+            Sharh.objects.filter(mahsulot=mahsulot).order_by('id').first().delete()
+
+        stsenariylar += [
+            ('signal: mahsulot saqlash', mahsulot_saqlash, None),
+            ('signal: sharh saqlash (reyting)', sharh_saqlash, None),
+        ]
+        if mahsulot.sharhlar_soni:
+            stsenariylar.append(("signal: sharh o'chirish (reyting)", sharh_ochirish, None))
+        return stsenariylar
+
+    def _sahifa(self, nom, foydalanuvchi, method, url, data, tayyorlash=None):
+        """
+        HTTP stsenariysi: o'z Client i (cookie lar boshqa stsenariyga o'tmaydi)
+
+        tayyorlash(mijoz) - so'rov holatni o'zgartirsa (chiqish, buyurtma),
+        har bir takrordan oldin uni tiklaydi.
+        """
+        mijoz = Client()
+        if foydalanuvchi is not None:
+            mijoz.force_login(foydalanuvchi)
+
+        def bajarish():
+            return getattr(mijoz, method)(url, data or {})
+
+        return nom, bajarish, (lambda: tayyorlash(mijoz)) if tayyorlash else None
+
+    # ------------------------------------------------------------------------
+    # O'lchash
+    # ------------------------------------------------------------------------
+
+    def _bir_marta(self, nom, bajarish, tayyorlash):
+        """
+        Bitta takror alohida savepoint da (oxirida bekor qilinadi)
+
+        Returns:
+            tuple: (sekund, sql soni) - tayyorlash o'lchovga kirmaydi
+        """
+        with transaction.atomic():
+            if tayyorlash is not None:
+                tayyorlash()
+            hisob = SorovlarHisobi()
+            with sorovlarni_kuzatish(hisob):
+                boshlanish = time.perf_counter()
+                javob = bajarish()
+                sekund = time.perf_counter() - boshlanish
+            transaction.set_rollback(True)
+        if javob is not None and javob.status_code >= 400:
+            raise CommandError(f"{nom}: HTTP {javob.status_code}")
+        return sekund, hisob.soni
+
+    def _olchash(self, nom, bajarish, tayyorlash, shablon, options):
+        """
+        Returns:
+            dict: p50_ms, p95_ms, p99_ms, sorovlar, shablon_ms, xotira_kb
+        """
+        gc.collect()   # Oldingi stsenariy chiqindisi bu stsenariy vaqtiga tushmasligi uchun
+        for _ in range(options['isitish']):
+            self._bir_marta(nom, bajarish, tayyorlash)
+
+        vaqtlar, sorovlar, shablon_vaqtlari = [], [], []
+        for _ in range(options['takror']):
+            shablon.sekund = 0.0
+            sekund, soni = self._bir_marta(nom, bajarish, tayyorlash)
+            vaqtlar.append(sekund)
+            sorovlar.append(soni)
+            shablon_vaqtlari.append(shablon.sekund)
+
+        xotira = []
+        if options['xotira_takror']:
+            tracemalloc.start()
+            try:
+                for _ in range(options['xotira_takror']):
+                    tracemalloc.reset_peak()
+                    boshida = tracemalloc.get_traced_memory()[0]
+                    self._bir_marta(nom, bajarish, tayyorlash)
+                    xotira.append(tracemalloc.get_traced_memory()[1] - boshida)
+            finally:
+                tracemalloc.stop()
+
+        vaqtlar.sort()
+        return {
+            'p50_ms': round(_foizlik(vaqtlar, 0.5) * 1000, 3),
+            'p95_ms': round(_foizlik(vaqtlar, 0.95) * 1000, 3),
+            'p99_ms': round(_foizlik(vaqtlar, 0.99) * 1000, 3),
+            # Odatda har safar bir xil (isitishdan keyin keshlar to'lgan)
+            'sorovlar': _foizlik(sorted(sorovlar), 0.5),
+            'shablon_ms': round(_foizlik(sorted(shablon_vaqtlari), 0.5) * 1000, 3),
+            'xotira_kb': round(_foizlik(sorted(xotira), 0.5) / 1024, 1),
+        }
+
+    # ------------------------------------------------------------------------
+    # Hisobot va taqqoslash
+    # ------------------------------------------------------------------------
+
+    def _regressiyalar(self, natija, asos, chegara):
+        sabablar = []
+        if natija['sorovlar'] > asos['sorovlar']:
+            sabablar.append(f"SQL so'rovlar {asos['sorovlar']} -> {natija['sorovlar']}")
+        if (natija['p50_ms'] > asos['p50_ms'] * (1 + chegara)
+                and natija['p50_ms'] - asos['p50_ms'] > KECHIKISH_SHOVQINI_MS):
+            sabablar.append(f"p50 {asos['p50_ms']:.2f} ms -> {natija['p50_ms']:.2f} ms")
+        if (natija['xotira_kb'] > asos['xotira_kb'] * (1 + chegara)
+                and natija['xotira_kb'] - asos['xotira_kb'] > XOTIRA_SHOVQINI_KB):
+            sabablar.append(f"xotira {asos['xotira_kb']:.0f} KB -> {natija['xotira_kb']:.0f} KB")
+        return sabablar
+
+    def _chiqarish(self, nom, natija, asos):
+        farq = ''
+        if asos is not None and asos['p50_ms']:
+            farq = f"{(natija['p50_ms'] / asos['p50_ms'] - 1) * 100:+.0f}%"
+            if natija['sorovlar'] != asos['sorovlar']:
+                farq += f" SQL {natija['sorovlar'] - asos['sorovlar']:+d}"
+        self.stdout.write(
+            f"{nom[:47]:<48}{natija['p50_ms']:>8.2f}{natija['p95_ms']:>8.2f}{natija['p99_ms']:>8.2f}"
+            f"{natija['sorovlar']:>6}{natija['shablon_ms']:>9.2f}{natija['xotira_kb']:>8.0f}  {farq}"
+        )
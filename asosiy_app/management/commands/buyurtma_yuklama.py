@@ -0,0 +1,173 @@
+"""
+buyurtma_yuklama - bir vaqtdagi N ta buyurtma (savat.buyurtma_yaratish) yuklama testi
+
+Alohida kategoriyada --mahsulotlar ta "issiq" mahsulot yaratiladi (hamma
+xaridor shularni talashadi), so'ng --xaridorlar ta buyurtma --parallel ta
+oqimda beriladi. Har bir savatda 1-3 ta mahsulot, har biridan 1-2 dona.
+Shu vaqtda alohida oqim mahsulotlar narxini --tahrirlar marta o'zgartiradi
+- optimistik qulflash (Mahsulot.versiya) tufayli qayta urinishlar bo'ladi.
+
+Oxirida tekshiriladi: har bir mahsulot uchun boshlang'ich miqdor =
+qolgan miqdor + buyurtmalardagi miqdor (ortiqcha sotuv yoki yo'qolgan
+yozuv yo'q). Tekshiruv o'tmasa, buyruq xato bilan tugaydi.
+
+Yaratilgan mahsulotlar va buyurtmalar oxirida o'chiriladi (--saqlash
+bilan qoldiriladi). SQLite da yozishlar navbat bilan bajariladi -
+haqiqiy parallellik uchun PostgreSQL da ishga tushiring.
+
+Foydalanish:
+    python manage.py buyurtma_yuklama
+    python manage.py buyurtma_yuklama --xaridorlar 2000 --parallel 64 --mahsulotlar 3
+"""
+
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Sum
+
+from asosiy_app.models import Buyurtma, BuyurtmaQatori, Kategoriya, Mahsulot, MiqdorYetarliEmas, VersiyaEskirgan
+from asosiy_app.savat import buyurtma_yaratish
+
+
+def _foizlik(qiymatlar, ulush):
+    return qiymatlar[min(int(len(qiymatlar) * ulush), len(qiymatlar) - 1)] if qiymatlar else 0
+
+
+class Command(BaseCommand):
+    help = "Bir vaqtdagi buyurtmalar yuklama testi: tezlik, kechikish va ombor to'g'riligi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--xaridorlar', type=int, default=500, help="Buyurtmalar soni (standart: 500)")
+        parser.add_argument('--parallel', type=int, default=32, help="Bir vaqtdagi oqimlar (standart: 32)")
+        parser.add_argument('--mahsulotlar', type=int, default=5, help="Issiq mahsulotlar soni (standart: 5)")
+        parser.add_argument(
+            '--miqdor', type=int, default=None,
+            help="Har bir mahsulot miqdori (standart: taxminan buyurtmalarning 80%% i yetadigan)",
+        )
+        parser.add_argument('--tahrirlar', type=int, default=20, help="Test davomida narx tahrirlari (standart: 20)")
+        parser.add_argument('--urug', type=int, default=42, help="Tasodifiy savatlar urug'i")
+        parser.add_argument('--saqlash', action='store_true', help="Yaratilgan ma'lumotlarni o'chirmaslik")
+
+    def handle(self, *args, **options):
+        if min(options['xaridorlar'], options['parallel'], options['mahsulotlar']) <= 0:
+            raise CommandError("--xaridorlar, --parallel va --mahsulotlar musbat bo'lishi kerak")
+        tasodif = random.Random(options['urug'])
+        # O'rtacha savat: 2 ta mahsulot x 1.5 dona = 3 dona
+        miqdor = options['miqdor'] or max(options['xaridorlar'] * 3 * 8 // 10 // options['mahsulotlar'], 1)
+
+        kategoriya = Kategoriya.objects.create(nomi=f'Yuklama testi {uuid.uuid4().hex[:8]}')
+        idlar = [
+            Mahsulot.objects.create(
+                nomi=f'{kategoriya.nomi} - {raqam}', kategoriya=kategoriya, qisqacha_tavsif='',
+                toliq_tavsif='', narx=1000, miqdor=miqdor,
+            ).id
+            for raqam in range(options['mahsulotlar'])
+        ]
+        savatlar = [
+            {mahsulot_id: tasodif.randint(1, 2)
+             for mahsulot_id in tasodif.sample(idlar, min(tasodif.randint(1, 3), len(idlar)))}
+            for _ in range(options['xaridorlar'])
+        ]
+
+        self.stdout.write(
+            f"{options['xaridorlar']} ta buyurtma, {options['parallel']} oqim, "
+            f"{len(idlar)} ta mahsulot x {miqdor} dona, {options['tahrirlar']} ta narx tahriri"
+        )
+        try:
+            natijalar, sekund = self._yuklama(savatlar, idlar, options)
+            self._hisobot(natijalar, sekund)
+            self._tekshirish(idlar, miqdor, natijalar)
+        finally:
+            if not options['saqlash']:
+                Buyurtma.objects.filter(qatorlar__mahsulot_id__in=idlar).delete()
+                kategoriya.delete()
+
+    def _yuklama(self, savatlar, idlar, options):
+        """
+        Savatlarni --parallel ta oqimda buyurtma qilish
+
+        Har bir oqim o'z ulanishini oxirigacha ishlatadi (xaridor uchun
+        yangi ulanish ochilmaydi) - o'lchovga faqat buyurtma kiradi.
+
+        Returns:
+            tuple: ([(natija, urinishlar, sekund, buyurtma_id), ...], umumiy sekund)
+        """
+        tugadi = threading.Event()
+
+        def oqim(qism):
+            natijalar = []
+            try:
+                for talablar in qism:
+                    boshlanish = time.perf_counter()
+                    try:
+                        buyurtma = buyurtma_yaratish(None, talablar)
+                        natija = ('ok', buyurtma.urinishlar, buyurtma.pk)
+                    except MiqdorYetarliEmas:
+                        natija = ('yetmadi', 1, None)
+                    except VersiyaEskirgan:
+                        natija = ('versiya', None, None)
+                    natijalar.append((natija[0], natija[1], time.perf_counter() - boshlanish, natija[2]))
+            finally:
+                connections.close_all()
+            return natijalar
+
+        def tahrirlovchi():
+            tasodif = random.Random(options['urug'])
+            try:
+                for raqam in range(options['tahrirlar']):
+                    if tugadi.is_set():
+                        break
+                    mahsulot = Mahsulot.objects.get(id=tasodif.choice(idlar))
+                    mahsulot.narx = 1000 + raqam + 1
+                    mahsulot.save(update_fields=['narx'])
+                    time.sleep(0.005)
+            finally:
+                connections.close_all()
+
+        qismlar = [savatlar[raqam::options['parallel']] for raqam in range(options['parallel'])]
+        with ThreadPoolExecutor(max_workers=options['parallel'] + 1) as hovuz:
+            boshlanish = time.perf_counter()
+            tahrir = hovuz.submit(tahrirlovchi)
+            natijalar = [natija for qism in hovuz.map(oqim, qismlar) for natija in qism]
+            sekund = time.perf_counter() - boshlanish
+            tugadi.set()
+            tahrir.result()
+        return natijalar, sekund
+
+    def _hisobot(self, natijalar, sekund):
+        vaqtlar = sorted(vaqt for _, _, vaqt, _ in natijalar)
+        soni = {nom: sum(natija == nom for natija, *_ in natijalar) for nom in ('ok', 'yetmadi', 'versiya')}
+        qayta = sum(urinishlar - 1 for natija, urinishlar, *_ in natijalar if natija == 'ok')
+
+        self.stdout.write(f"{'buyurtma/s':<24}{len(natijalar) / sekund:>10.1f}")
+        for nom, ulush in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+            self.stdout.write(f"{nom + ' ms':<24}{_foizlik(vaqtlar, ulush) * 1000:>10.2f}")
+        self.stdout.write(f"{'qabul qilindi':<24}{soni['ok']:>10}")
+        self.stdout.write(f"{'omborda yetmadi':<24}{soni['yetmadi']:>10}")
+        self.stdout.write(f"{'qayta urinishlar':<24}{qayta:>10}")
+        self.stdout.write(f"{'urinishlar tugadi':<24}{soni['versiya']:>10}")
+
+    def _tekshirish(self, idlar, miqdor, natijalar):
+        """
+        Ombor to'g'riligi: boshlang'ich miqdor = qolgan + sotilgan
+        """
+        buyurtma_idlari = [buyurtma_id for natija, _, _, buyurtma_id in natijalar if natija == 'ok']
+        sotilgan = dict(
+            BuyurtmaQatori.objects.filter(mahsulot_id__in=idlar).values_list('mahsulot_id')
+            .annotate(jami=Sum('miqdor')).order_by()
+        )
+        qolgan = dict(Mahsulot.objects.filter(id__in=idlar).values_list('id', 'miqdor'))
+        xatolar = [
+            f"mahsulot {mahsulot_id}: {qolgan[mahsulot_id]} qoldi + {sotilgan.get(mahsulot_id, 0)} sotildi != {miqdor}"
+            for mahsulot_id in idlar if qolgan[mahsulot_id] + sotilgan.get(mahsulot_id, 0) != miqdor
+        ]
+        if Buyurtma.objects.filter(id__in=buyurtma_idlari).count() != len(buyurtma_idlari):
+            xatolar.append("qabul qilingan buyurtmalarning bir qismi bazada yo'q")
+        if xatolar:
+            raise CommandError("Ombor mos kelmadi:\n" + '\n'.join(xatolar))
+        self.stdout.write(self.style.SUCCESS("✓ Ortiqcha sotuv yo'q, ombor va buyurtmalar mos"))
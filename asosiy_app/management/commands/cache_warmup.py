@@ -0,0 +1,245 @@
+"""
+cache_warmup - Keshni oldindan isitish buyrug'i
+
+Deploy dan keyin barcha keshlar bo'sh bo'ladi va birinchi daqiqalarda
+sahifalar sekin ochiladi. Bu buyruq eng ko'p so'raladigan URL larni
+WSGI ilovasi orqali (server ishga tushirmasdan, shu jarayonning o'zida)
+chaqirib, barcha kesh qatlamlarini to'ldiradi:
+- anonimlar uchun sahifa keshi (SahifaKeshiMiddleware)
+- bosh sahifa bloklari (kesh.py)
+- kategoriyalar reestri (shu jarayon uchun)
+
+Foydalanish:
+    python manage.py cache_warmup
+    python manage.py cache_warmup --soni 100 --parallel 8
+    python manage.py cache_warmup --log /var/log/nginx/access.log
+
+Isitish so'rovlari KESH_ISITISH belgisi bilan yuboriladi - mahsulotlarning
+ko'rilganlar soni (URL lar shu bo'yicha tanlanadi) oshmaydi.
+
+Eslatma: LocMemCache (standart) har bir jarayonning o'z keshi. Gunicorn
+workerlarini isitish uchun umumiy kesh (Redis) ishlating.
+"""
+
+import io
+import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db.models import Sum
+from django.urls import reverse
+
+from asosiy_app.kesh import KESH_ISITISH
+from asosiy_app.models import Kategoriya, Mahsulot
+
+# Access log qatoridan GET so'rov yo'lini ajratib olish
+# (nginx/apache "combined" va gunicorn formatlari uchun)
+LOG_REGEX = re.compile(r'"(?:GET|HEAD) (\S+) HTTP/[\d.]+"')
+
+
+class Command(BaseCommand):
+    help = "Eng ko'p so'raladigan URL larni chaqirib, keshlarni oldindan to'ldiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--soni', type=int, default=50,
+            help="Nechta URL isitilsin (standart: 50)",
+        )
+        parser.add_argument(
+            '--log', dest='log_fayli',
+            help="Access log fayli - URL lar shu fayldagi so'rovlar soni bo'yicha tanlanadi. "
+                 "Berilmasa, mahsulotlarning ko'rilganlar soni bo'yicha tanlanadi",
+        )
+        parser.add_argument(
+            '--parallel', type=int, default=4,
+            help="Bir vaqtda nechta so'rov yuborilsin (standart: 4)",
+        )
+        parser.add_argument(
+            '--host', default=None,
+            help="So'rovlardagi Host sarlavhasi (standart: ALLOWED_HOSTS dan)",
+        )
+
+    def handle(self, *args, **options):
+        soni = options['soni']
+        if soni < 1 or options['parallel'] < 1:
+            raise CommandError("--soni va --parallel musbat bo'lishi kerak")
+
+        if options['log_fayli']:
+            urllar, qamrov = self._logdan(options['log_fayli'], soni)
+            manba = f"access log ({options['log_fayli']})"
+        else:
+            urllar, qamrov = self._reytingdan(soni)
+            manba = "ko'rilganlar soni reytingi"
+
+        if not urllar:
+            self.stdout.write(self.style.WARNING("Isitiladigan URL topilmadi"))
+            return
+
+        self.stdout.write(f"{len(urllar)} ta URL isitilmoqda ({manba}, parallel: {options['parallel']})...")
+
+        self.ilova = get_wsgi_application()
+        self.host = options['host'] or self._standart_host()
+
+        boshlanish = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['parallel']) as pool:
+            natijalar = list(pool.map(self._sorov, urllar))
+        vaqt = time.perf_counter() - boshlanish
+
+        self._hisobot(natijalar, vaqt, qamrov)
+
+    # ------------------------------------------------------------------------
+    # URL larni tanlash
+    # ------------------------------------------------------------------------
+
+    def _logdan(self, log_fayli, soni):
+        """
+        Access log dan eng ko'p so'ralgan N ta GET yo'lni olish
+
+        Returns:
+            tuple: (URL lar ro'yxati, ular log dagi so'rovlarning qancha qismini qamraydi)
+        """
+        sanoq = Counter()
+        try:
+            with open(log_fayli, encoding='utf-8', errors='replace') as fayl:
+                for qator in fayl:
+                    moslik = LOG_REGEX.search(qator)
+                    if moslik:
+                        yol = moslik.group(1)
+                        # Statik va media fayllar keshga aloqador emas
+                        if yol.startswith((settings.STATIC_URL, settings.MEDIA_URL)):
+                            continue
+                        sanoq[yol] += 1
+        except OSError as xato:
+            raise CommandError(f"Log faylini o'qib bo'lmadi: {xato}")
+
+        jami = sum(sanoq.values())
+        eng_kop = sanoq.most_common(soni)
+        qamrov = sum(son for _, son in eng_kop) / jami if jami else 0
+        return [yol for yol, _ in eng_kop], qamrov
+
+    def _reytingdan(self, soni):
+        """
+        Asosiy sahifalar + eng ko'p ko'rilgan kategoriya va mahsulotlar
+
+        Returns:
+            tuple: (URL lar ro'yxati, tanlangan mahsulotlar barcha ko'rishlarning
+                    qancha qismini tashkil qiladi)
+        """
+        urllar = [reverse('bosh_sahifa'), reverse('mahsulotlar'), reverse('haqida')]
+
+        # Kategoriyalar - mahsulotlarining jami ko'rilganlar soni bo'yicha
+        kategoriyalar = (
+            Kategoriya.objects.filter(faol=True)
+            .annotate(korishlar=Sum('mahsulotlar__korilganlar_soni'))
+            .order_by('-korishlar')
+            .values_list('id', flat=True)[:max(soni // 5, 1)]
+        )
+        urllar += [reverse('kategoriya_mahsulotlar', args=[kategoriya_id]) for kategoriya_id in kategoriyalar]
+
+        # Qolgan o'rinlar - eng ko'p ko'rilgan mahsulotlar
+        qolgan = max(soni - len(urllar), 0)
+        mahsulotlar = list(
+            Mahsulot.objects.filter(holat='mavjud')
+            .order_by('-korilganlar_soni')
+            .values_list('slug', 'korilganlar_soni')[:qolgan]
+        )
+        urllar += [reverse('mahsulot_batafsil', args=[slug]) for slug, _ in mahsulotlar]
+
+        jami = Mahsulot.objects.aggregate(jami=Sum('korilganlar_soni'))['jami'] or 0
+        qamrov = sum(son for _, son in mahsulotlar) / jami if jami else 0
+        return urllar[:soni], qamrov
+
+    def _standart_host(self):
+        """
+        ALLOWED_HOSTS dagi birinchi aniq host (yoki localhost)
+        """
+        for host in settings.ALLOWED_HOSTS:
+            if host and '*' not in host:
+                return host.lstrip('.')
+        return 'localhost'
+
+    # ------------------------------------------------------------------------
+    # So'rov yuborish
+    # ------------------------------------------------------------------------
+
+    def _sorov(self, url):
+        """
+        Bitta URL ni WSGI ilovasi orqali chaqirish (anonim, cookie siz)
+
+        Returns:
+            tuple: (url, status kodi, sahifa keshi holati, vaqt sekundlarda)
+        """
+        qismlar = urlsplit(url)
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': qismlar.path or '/',
+            'QUERY_STRING': qismlar.query,
+            'SERVER_NAME': self.host,
+            'SERVER_PORT': '80',
+            'HTTP_HOST': self.host,
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': io.StringIO(),
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+            KESH_ISITISH: True,
+        }
+        javob = {}
+
+        def start_response(status, headers, exc_info=None):
+            javob['status'] = int(status.split()[0])
+            javob['headers'] = dict(headers)
+
+        boshlanish = time.perf_counter()
+        try:
+            tana = self.ilova(environ, start_response)
+            try:
+                for _ in tana:
+                    pass
+            finally:
+                # close() request_finished signalini yuboradi (DB ulanishi yopiladi)
+                if hasattr(tana, 'close'):
+                    tana.close()
+        except Exception as xato:
+            return url, None, repr(xato), time.perf_counter() - boshlanish
+
+        kesh_holati = javob.get('headers', {}).get('X-Sahifa-Keshi', '-')
+        return url, javob.get('status'), kesh_holati, time.perf_counter() - boshlanish
+
+    # ------------------------------------------------------------------------
+    # Hisobot
+    # ------------------------------------------------------------------------
+
+    def _hisobot(self, natijalar, vaqt, qamrov):
+        """
+        Natijalarni chiqarish: har bir URL, jami vaqt va qamrov
+        """
+        muvaffaqiyatli = 0
+        for url, status, kesh_holati, sorov_vaqti in natijalar:
+            if status == 200:
+                muvaffaqiyatli += 1
+                belgi = self.style.SUCCESS('✓')
+            else:
+                belgi = self.style.ERROR('✗')
+            self.stdout.write(f"  {belgi} {status or 'XATO'} {sorov_vaqti * 1000:7.1f} ms  kesh: {kesh_holati:<5} {url}")
+
+        # MISS - render qilinib keshga yozilgan, HIT - allaqachon keshda (BYPASS - yozilmagan)
+        keshlangan = sum(1 for natija in natijalar if natija[2] in ('MISS', 'HIT'))
+        self.stdout.write('')
+        self.stdout.write(f"Jami vaqt:        {vaqt:.2f} s")
+        self.stdout.write(f"Muvaffaqiyatli:   {muvaffaqiyatli}/{len(natijalar)}")
+        self.stdout.write(f"Sahifa keshida:   {keshlangan}/{len(natijalar)}")
+        self.stdout.write(f"Trafik qamrovi:   {qamrov * 100:.1f}%")
+
+        if muvaffaqiyatli == len(natijalar):
+            self.stdout.write(self.style.SUCCESS("✓ Kesh isitildi"))
+        else:
+            self.stdout.write(self.style.WARNING(f"⚠ {len(natijalar) - muvaffaqiyatli} ta URL xato bilan yakunlandi"))
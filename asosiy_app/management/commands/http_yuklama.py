@@ -0,0 +1,652 @@
+"""
+http_yuklama - haqiqiy server (WSGI/ASGI) ustida tarmoq orqali yuklama testi
+
+In-process benchmarklar (bench, asgi_benchmark) worker lar to'lib
+qolishini, ulanishlar hovuzi tugashini yoki SQLite qulflarini
+ko'rsatmaydi. Bu buyruq:
+1. config.wsgi (gunicorn) yoki config.asgi (uvicorn) ni --ishchilar ta
+   jarayon bilan alohida jarayonda ishga tushiradi (yoki --url dagi
+   tayyor serverga ulanadi)
+2. asyncio HTTP/1.1 mijozi bilan (keep-alive, cookie, CSRF) aralash
+   trafik yuboradi: bosh sahifa, ro'yxat va kategoriya sahifalari,
+   qidiruv, mahsulot sahifalari, sharh POST va kirish (--aralashma)
+3. Yuklamani bosqichma-bosqich oshiradi:
+   --parallel 1,2,4,...  yopiq sikl: N ta virtual foydalanuvchi, har biri
+                         javobni kutib keyingi so'rovni yuboradi
+   --rps 50,100,200      ochiq sikl: so'rovlar jadval bo'yicha yuboriladi,
+                         kechikish rejalashtirilgan vaqtdan o'lchanadi
+                         (server sekinlashsa, navbat ham kechikishga kiradi)
+4. Har bir bosqich uchun so'rov/s, p50/p95/p99 va xatolar; tizza nuqtasi
+   (yuklama oshsa ham o'tkazuvchanlik deyarli o'smaydigan yoki xatolar
+   boshlanadigan joy), shu bosqichning kechikish gistogrammasi va
+   sahifalar bo'yicha jadval
+
+Kirgan foydalanuvchilar (--kirganlar ulushi) seed_katalog yaratgan
+xaridor0, xaridor1, ... hisoblari; qolganlari anonim va faqat GET
+so'rovlar yuboradi. Yuklama bazaga yozadi (sharhlar, sessiyalar) -
+alohida bazada ishga tushiring. Server DEBUG=0 va KIRISH_CHEKLOVI=0
+bilan ishga tushiriladi: bitta IP dan minglab kirish cheklovga tushmaydi.
+
+gunicorn / uvicorn ixtiyoriy (requirements.txt); --server runserver -
+Django ning o'z serveri (bitta jarayon, har bir so'rov alohida oqimda).
+
+Foydalanish:
+    export DATABASE_URL=sqlite:////tmp/katalog.sqlite3 SQLITE_TEZKOR_PROFIL=1
+    python manage.py http_yuklama --server wsgi --ishchilar 4 --parallel 1,2,4,8,16,32,64
+    python manage.py http_yuklama --server asgi --ishchilar 2 --rps 50,100,200,400 --sekund 10
+    python manage.py http_yuklama --url http://127.0.0.1:8000 --parallel 8,16,32 --json natija.json
+"""
+
+import asyncio
+import bisect
+import importlib.util
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+from django.urls import reverse
+
+from asosiy_app.management.commands.seed_katalog import PAROL
+from asosiy_app.models import Kategoriya, Mahsulot
+from asosiy_app.views import MahsulotlarListView
+
+# Standart trafik aralashmasi (nisbiy og'irliklar)
+ARALASHMA = {
+    'bosh_sahifa': 10,
+    'royxat': 20,       # /mahsulotlar/?page=N va /kategoriya/<id>/
+    'qidiruv': 15,
+    'mahsulot': 45,
+    'sharh': 5,         # POST, faqat kirgan foydalanuvchilar
+    'kirish': 5,        # POST, faqat kirgan foydalanuvchilar (sessiyasiz qayta kirish)
+}
+FAQAT_KIRGANLAR = ('sharh', 'kirish')
+
+# Keyingi bosqich o'tkazuvchanlikni shundan kam oshirsa - tizzadan o'tildi
+TIZZA_OSISH = 0.10
+# Yoki xatolar ulushi shundan oshsa
+TIZZA_XATO = 0.01
+
+# Gistogramma chegaralari (ms)
+GISTOGRAMMA = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+def _foizlik(qiymatlar, ulush):
+    return qiymatlar[min(int(len(qiymatlar) * ulush), len(qiymatlar) - 1)] if qiymatlar else 0
+
+
+def _sonlar(matn, nom):
+    """
+    "1,2,4" -> [1, 2, 4] (musbat sonlar)
+    """
+    try:
+        sonlar = [float(qism) for qism in matn.split(',') if qism.strip()]
+    except ValueError:
+        raise CommandError(f"{nom}: vergul bilan ajratilgan sonlar kerak")
+    if not sonlar or min(sonlar) <= 0:
+        raise CommandError(f"{nom}: musbat sonlar kerak")
+    return sonlar
+
+
+def _aralashma(matn):
+    """
+    "mahsulot=60,sharh=0" - standart aralashmadagi og'irliklarni almashtirish
+    """
+    aralashma = dict(ARALASHMA)
+    for qism in filter(None, (qism.strip() for qism in matn.split(','))):
+        nom, _, ogirlik = qism.partition('=')
+        if nom not in ARALASHMA:
+            raise CommandError(f"--aralashma: noma'lum sahifa {nom!r} ({', '.join(ARALASHMA)})")
+        try:
+            aralashma[nom] = float(ogirlik)
+        except ValueError:
+            raise CommandError(f"--aralashma: {qism!r} - nom=og'irlik ko'rinishida bo'lishi kerak")
+    if sum(aralashma.values()) <= 0:
+        raise CommandError("--aralashma: og'irliklar yig'indisi musbat bo'lishi kerak")
+    return aralashma
+
+
+# ============================================================================
+# HTTP MIJOZ (asyncio, HTTP/1.1 keep-alive)
+# ============================================================================
+
+class _Foydalanuvchi:
+    """
+    Virtual foydalanuvchi: bitta keep-alive ulanish va o'z cookie lari
+
+    Server ulanishni yopsa (Connection: close yoki xato), keyingi so'rovda
+    qayta ulanadi.
+    """
+
+    def __init__(self, host, port, timeout, login=None):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.login = login
+        self.cookies = {}
+        self._oqish = self._yozish = None
+
+    async def yopish(self):
+        if self._yozish is not None:
+            self._yozish.close()
+            try:
+                await self._yozish.wait_closed()
+            except OSError:
+                pass
+        self._oqish = self._yozish = None
+
+    async def sorov(self, method, yol, forma=None):
+        """
+        Returns:
+            int: HTTP status (ulanish xatosi yoki timeout bo'lsa - 0)
+        """
+        try:
+            return await asyncio.wait_for(self._sorov(method, yol, forma), self.timeout)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+            await self.yopish()
+            return 0
+
+    async def _sorov(self, method, yol, forma):
+        qayta_ishlatildi = self._yozish is not None
+        if not qayta_ishlatildi:
+            self._oqish, self._yozish = await asyncio.open_connection(self.host, self.port)
+        try:
+            holat_qatori = await self._yuborish(method, yol, forma)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            if not qayta_ishlatildi:
+                raise
+            # Server bo'sh turgan keep-alive ulanishni yopgan (gunicorn - 2 s,
+            # uvicorn - 5 s) - brauzer kabi yangi ulanish bilan bir marta qaytarish
+            await self.yopish()
+            self._oqish, self._yozish = await asyncio.open_connection(self.host, self.port)
+            holat_qatori = await self._yuborish(method, yol, forma)
+        return await self._javob(holat_qatori)
+
+    async def _yuborish(self, method, yol, forma):
+        """
+        So'rovni yozish va holat qatorini o'qish
+
+        Raises:
+            ConnectionError: Ulanish javobdan oldin yopilgan bo'lsa
+        """
+        tana = urlencode(forma).encode() if forma is not None else b''
+        sarlavhalar = [f'{method} {yol} HTTP/1.1', f'Host: {self.host}:{self.port}', 'User-Agent: http_yuklama']
+        if self.cookies:
+            sarlavhalar.append('Cookie: ' + '; '.join(f'{nom}={qiymat}' for nom, qiymat in self.cookies.items()))
+        if method == 'POST':
+            sarlavhalar += [
+                'Content-Type: application/x-www-form-urlencoded',
+                f'Content-Length: {len(tana)}',
+                f"X-CSRFToken: {self.cookies.get(settings.CSRF_COOKIE_NAME, '')}",
+            ]
+        self._yozish.write(('\r\n'.join(sarlavhalar) + '\r\n\r\n').encode('latin-1') + tana)
+        await self._yozish.drain()
+        holat_qatori = await self._oqish.readline()
+        if not holat_qatori:
+            raise ConnectionResetError("server ulanishni yopdi")
+        return holat_qatori
+
+    async def _javob(self, holat_qatori):
+        holat = int(holat_qatori.split()[1])
+        uzunlik, bolaklab, yopish = None, False, False
+        while True:
+            qator = (await self._oqish.readline()).decode('latin-1').strip()
+            if not qator:
+                break
+            nom, _, qiymat = qator.partition(':')
+            nom, qiymat = nom.strip().lower(), qiymat.strip()
+            if nom == 'content-length':
+                uzunlik = int(qiymat)
+            elif nom == 'transfer-encoding' and 'chunked' in qiymat.lower():
+                bolaklab = True
+            elif nom == 'connection' and qiymat.lower() == 'close':
+                yopish = True
+            elif nom == 'set-cookie':
+                self._cookie(qiymat)
+
+        if bolaklab:
+            while True:
+                hajm = int((await self._oqish.readline()).split(b';')[0], 16)
+                await self._oqish.readexactly(hajm + 2)
+                if hajm == 0:
+                    break
+        elif uzunlik is not None:
+            await self._oqish.readexactly(uzunlik)
+        else:
+            await self._oqish.read()
+            yopish = True
+        if yopish:
+            await self.yopish()
+        return holat
+
+    def _cookie(self, sarlavha):
+        juftlik, *atributlar = sarlavha.split(';')
+        nom, _, qiymat = juftlik.strip().partition('=')
+        ochirildi = qiymat in ('', '""') or any(
+            atribut.strip().lower() == 'max-age=0' for atribut in atributlar
+        )
+        if ochirildi:
+            self.cookies.pop(nom, None)
+        else:
+            self.cookies[nom] = qiymat
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+def _bosh_port():
+    with socket.socket() as soket:
+        soket.bind(('127.0.0.1', 0))
+        return soket.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = "Haqiqiy server (gunicorn/uvicorn/runserver) ustida aralash trafik bilan yuklama testi va tizza nuqtasi"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--server', choices=('wsgi', 'asgi', 'runserver'), default='wsgi',
+            help="wsgi - gunicorn config.wsgi, asgi - uvicorn config.asgi, runserver - Django serveri (standart: wsgi)",
+        )
+        parser.add_argument('--url', help="Tayyor server manzili (server ishga tushirilmaydi)")
+        parser.add_argument('--ishchilar', type=int, default=2, help="Server jarayonlari (standart: 2)")
+        parser.add_argument('--oqimlar', type=int, default=4, help="WSGI: har bir jarayondagi oqimlar (standart: 4)")
+        parser.add_argument(
+            '--parallel', default='1,2,4,8,16,32',
+            help="Yopiq sikl bosqichlari: bir vaqtdagi foydalanuvchilar (standart: 1,2,4,8,16,32)",
+        )
+        parser.add_argument('--rps', help="Ochiq sikl bosqichlari: so'rov/s (masalan: 50,100,200) - --parallel o'rniga")
+        parser.add_argument('--sekund', type=float, default=10, help="Har bir bosqich davomiyligi (standart: 10)")
+        parser.add_argument(
+            '--ulanishlar', type=int, default=256,
+            help="Ochiq siklda bir vaqtdagi ulanishlar chegarasi (standart: 256)",
+        )
+        parser.add_argument(
+            '--aralashma', default='',
+            help=f"Og'irliklarni o'zgartirish, masalan: mahsulot=60,sharh=0 ({', '.join(ARALASHMA)})",
+        )
+        parser.add_argument('--kirganlar', type=float, default=0.3, help="Kirgan foydalanuvchilar ulushi (standart: 0.3)")
+        parser.add_argument('--parol', default=PAROL, help="xaridorN foydalanuvchilari paroli (seed_katalog)")
+        parser.add_argument('--timeout', type=float, default=30, help="Bitta so'rov uchun timeout, sekund (standart: 30)")
+        parser.add_argument('--urug', type=int, default=42, help="Tasodifiy sonlar urug'i")
+        parser.add_argument('--json', help="Natijalarni JSON faylga yozish")
+
+    def handle(self, *args, **options):
+        if options['sekund'] <= 0 or options['ishchilar'] <= 0 or options['oqimlar'] <= 0 or options['ulanishlar'] <= 0:
+            raise CommandError("--sekund, --ishchilar, --oqimlar va --ulanishlar musbat bo'lishi kerak")
+        if not 0 <= options['kirganlar'] <= 1:
+            raise CommandError("--kirganlar 0 dan 1 gacha bo'lishi kerak")
+        ochiq = options['rps'] is not None
+        bosqichlar = _sonlar(options['rps'], '--rps') if ochiq else [
+            int(son) for son in _sonlar(options['parallel'], '--parallel')
+        ]
+        self.aralashma = _aralashma(options['aralashma'])
+        self.tasodif = random.Random(options['urug'])
+        self.manbalar = self._manbalar(options)
+
+        server = None
+        if options['url']:
+            manzil = urlsplit(options['url'])
+            host, port = manzil.hostname, manzil.port or 80
+        else:
+            server, host, port = self._server(options)
+        try:
+            natijalar = asyncio.run(self._yuklama(host, port, bosqichlar, ochiq, options))
+        finally:
+            if server is not None:
+                server.terminate()
+                try:
+                    server.wait(10)
+                except subprocess.TimeoutExpired:
+                    server.kill()
+
+        self._hisobot(natijalar, ochiq)
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as fayl:
+                json.dump(
+                    [{kalit: qiymat for kalit, qiymat in bosqich.items() if kalit != 'yozuvlar'} for bosqich in natijalar],
+                    fayl, indent=2, ensure_ascii=False,
+                )
+        self.stdout.write(self.style.SUCCESS("✓ Yuklama testi yakunlandi"))
+
+    # ------------------------------------------------------------------------
+    # Tayyorgarlik
+    # ------------------------------------------------------------------------
+
+    def _manbalar(self, options):
+        """
+        Trafik uchun yo'llar: mahsulotlar, kategoriyalar, qidiruv so'zlari va loginlar
+
+        Raises:
+            CommandError: Katalog bo'sh bo'lsa
+        """
+        eng_katta = Mahsulot.objects.aggregate(eng_katta=Max('id'))['eng_katta']
+        if eng_katta is None:
+            raise CommandError("Katalog bo'sh - avval seed_katalog bilan to'ldiring")
+        # Butun katalog bo'ylab tasodifiy 2000 ta (keshlar hamma narsani ushlab qolmasligi uchun)
+        idlar = self.tasodif.sample(range(1, eng_katta + 1), min(eng_katta, 2000))
+        mahsulotlar = list(Mahsulot.objects.filter(id__in=idlar, holat='mavjud').values_list('slug', 'nomi'))
+        if not mahsulotlar:
+            mahsulotlar = list(Mahsulot.objects.filter(holat='mavjud').values_list('slug', 'nomi')[:2000])
+        if not mahsulotlar:
+            raise CommandError("Bazada mavjud mahsulotlar yo'q")
+        sozlar = sorted({soz.lower() for _, nomi in mahsulotlar for soz in nomi.split() if not soz.isdigit()})
+
+        sahifalar = Mahsulot.objects.filter(holat='mavjud').count() // MahsulotlarListView.paginate_by + 1
+        loginlar = []
+        if options['kirganlar']:
+            loginlar = list(
+                User.objects.filter(username__startswith='xaridor', is_active=True)
+                .order_by('id').values_list('username', flat=True)[:options['ulanishlar']]
+            )
+            if not loginlar:
+                self.stdout.write("xaridorN foydalanuvchilari yo'q - barcha foydalanuvchilar anonim")
+        return {
+            'sluglar': [slug for slug, _ in mahsulotlar],
+            'kategoriyalar': list(Kategoriya.objects.filter(faol=True).values_list('id', flat=True)),
+            'qidiruvlar': sozlar + [soz[:3] for soz in sozlar if len(soz) > 3],
+            'sahifalar': min(sahifalar, 50),
+            'loginlar': loginlar,
+        }
+
+    def _server(self, options):
+        """
+        Serverni alohida jarayonda ishga tushirish va tayyor bo'lishini kutish
+
+        Returns:
+            tuple: (Popen, host, port)
+        """
+        port = _bosh_port()
+        if options['server'] == 'wsgi':
+            modul = 'gunicorn'
+            buyruq = [
+                sys.executable, '-m', 'gunicorn', 'config.wsgi:application', '--bind', f'127.0.0.1:{port}',
+                '--workers', str(options['ishchilar']), '--threads', str(options['oqimlar']),
+                '--worker-class', 'gthread', '--log-level', 'warning',
+            ]
+        elif options['server'] == 'asgi':
+            modul = 'uvicorn'
+            buyruq = [
+                sys.executable, '-m', 'uvicorn', 'config.asgi:application', '--host', '127.0.0.1', '--port', str(port),
+                '--workers', str(options['ishchilar']), '--log-level', 'warning', '--no-access-log',
+            ]
+        else:
+            modul = None
+            buyruq = [sys.executable, 'manage.py', 'runserver', f'127.0.0.1:{port}', '--noreload', '--skip-checks']
+            if options['ishchilar'] > 1:
+                self.stdout.write("runserver bitta jarayonda ishlaydi - --ishchilar e'tiborga olinmaydi")
+        if modul and importlib.util.find_spec(modul) is None:
+            raise CommandError(f"{modul} o'rnatilmagan: pip install {modul} (yoki --server runserver)")
+
+        muhit = {**os.environ, 'DEBUG': '0', 'KIRISH_CHEKLOVI': '0'}
+        jurnal = tempfile.TemporaryFile()
+        jarayon = subprocess.Popen(
+            buyruq, cwd=settings.BASE_DIR, env=muhit, stdout=subprocess.DEVNULL, stderr=jurnal,
+        )
+        tugash = time.monotonic() + 30
+        while time.monotonic() < tugash:
+            if jarayon.poll() is not None:
+                jurnal.seek(0)
+                raise CommandError(f"Server ishga tushmadi:\n{jurnal.read().decode(errors='replace')[-2000:]}")
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                break
+            except OSError:
+                time.sleep(0.2)
+        else:
+            jarayon.kill()
+            raise CommandError("Server 30 sekundda tayyor bo'lmadi")
+
+        self.stdout.write(
+            f"Server: {' '.join(buyruq[2 if modul else 1:4])} ... (127.0.0.1:{port}, "
+            f"{options['ishchilar'] if modul else 1} jarayon)"
+        )
+        return jarayon, '127.0.0.1', port
+
+    # ------------------------------------------------------------------------
+    # Trafik
+    # ------------------------------------------------------------------------
+
+    def _tanlash(self, foydalanuvchi):
+        nomlar = [nom for nom in self.aralashma if foydalanuvchi.login or nom not in FAQAT_KIRGANLAR]
+        return self.tasodif.choices(nomlar, [self.aralashma[nom] for nom in nomlar])[0]
+
+    async def _bajarish(self, foydalanuvchi, sahifa, options):
+        """
+        Bitta sahifa so'rovi
+
+        Returns:
+            int: HTTP status (0 - ulanish xatosi)
+        """
+        m, tasodif = self.manbalar, self.tasodif
+        if sahifa == 'bosh_sahifa':
+            return await foydalanuvchi.sorov('GET', reverse('bosh_sahifa'))
+        if sahifa == 'royxat':
+            if m['kategoriyalar'] and tasodif.random() < 0.3:
+                return await foydalanuvchi.sorov(
+                    'GET', reverse('kategoriya_mahsulotlar', args=[tasodif.choice(m['kategoriyalar'])]),
+                )
+            return await foydalanuvchi.sorov('GET', f"{reverse('mahsulotlar')}?page={tasodif.randint(1, m['sahifalar'])}")
+        if sahifa == 'qidiruv':
+            return await foydalanuvchi.sorov('GET', f"{reverse('qidiruv')}?{urlencode({'q': tasodif.choice(m['qidiruvlar'])})}")
+        if sahifa == 'mahsulot':
+            return await foydalanuvchi.sorov('GET', reverse('mahsulot_batafsil', args=[tasodif.choice(m['sluglar'])]))
+        if sahifa == 'sharh':
+            return await foydalanuvchi.sorov(
+                'POST', reverse('sharh_qoshish', args=[tasodif.choice(m['sluglar'])]),
+                {'matn': 'Yuklama testi sharhi', 'baho': tasodif.randint(1, 5)},
+            )
+        # Sessiyasiz qayta kirish - parol har safar haqiqatan tekshiriladi (CSRF cookie qoladi)
+        foydalanuvchi.cookies.pop(settings.SESSION_COOKIE_NAME, None)
+        return await foydalanuvchi.sorov('POST', reverse('kirish'), {'username': foydalanuvchi.login, 'password': options['parol']})
+
+    async def _foydalanuvchilar(self, host, port, soni, options):
+        """
+        Virtual foydalanuvchilarni tayyorlash: CSRF cookie va (ulush bo'yicha) kirish
+
+        O'lchovga kirmaydi. Kirish muvaffaqiyatsiz bo'lsa, foydalanuvchi anonim qoladi.
+        """
+        loginlar = self.manbalar['loginlar']
+        kirganlar = min(round(soni * options['kirganlar']), len(loginlar))
+        foydalanuvchilar = [
+            _Foydalanuvchi(host, port, options['timeout'], loginlar[raqam] if raqam < kirganlar else None)
+            for raqam in range(soni)
+        ]
+        cheklov = asyncio.Semaphore(16)
+
+        async def tayyorlash(foydalanuvchi):
+            async with cheklov:
+                if await foydalanuvchi.sorov('GET', reverse('kirish')) != 200:
+                    raise CommandError(f"{reverse('kirish')} ochilmadi - server ishlayaptimi?")
+                if foydalanuvchi.login:
+                    holat = await foydalanuvchi.sorov(
+                        'POST', reverse('kirish'), {'username': foydalanuvchi.login, 'password': options['parol']},
+                    )
+                    if holat != 302:
+                        foydalanuvchi.login = None
+
+        await asyncio.gather(*(tayyorlash(foydalanuvchi) for foydalanuvchi in foydalanuvchilar))
+        return foydalanuvchilar
+
+    async def _yuklama(self, host, port, bosqichlar, ochiq, options):
+        """
+        Barcha bosqichlar ketma-ket (foydalanuvchilar bosqichlar orasida qayta ishlatiladi)
+
+        Returns:
+            list: Har bir bosqich natijasi (_xulosa)
+        """
+        soni = options['ulanishlar'] if ochiq else int(max(bosqichlar))
+        foydalanuvchilar = await self._foydalanuvchilar(host, port, soni, options)
+        natijalar = []
+        self._bosqich_qatori(None, ochiq)
+        try:
+            for bosqich in bosqichlar:
+                if ochiq:
+                    yozuvlar, sekund = await self._ochiq_bosqich(foydalanuvchilar, bosqich, options)
+                else:
+                    yozuvlar, sekund = await self._yopiq_bosqich(foydalanuvchilar[:int(bosqich)], options)
+                natijalar.append(self._xulosa(bosqich, yozuvlar, sekund))
+                self._bosqich_qatori(natijalar[-1], ochiq)
+        finally:
+            await asyncio.gather(*(foydalanuvchi.yopish() for foydalanuvchi in foydalanuvchilar))
+        return natijalar
+
+    async def _yopiq_bosqich(self, foydalanuvchilar, options):
+        """
+        Har bir foydalanuvchi --sekund davomida javobni kutib, keyingisini yuboradi
+
+        Returns:
+            tuple: ([(sahifa, status, sekund), ...], davomiylik)
+        """
+        yozuvlar = []
+        boshlanish = time.perf_counter()
+        tugash = boshlanish + options['sekund']
+
+        async def ishchi(foydalanuvchi):
+            while time.perf_counter() < tugash:
+                sahifa = self._tanlash(foydalanuvchi)
+                vaqt = time.perf_counter()
+                holat = await self._bajarish(foydalanuvchi, sahifa, options)
+                yozuvlar.append((sahifa, holat, time.perf_counter() - vaqt))
+
+        await asyncio.gather(*(ishchi(foydalanuvchi) for foydalanuvchi in foydalanuvchilar))
+        return yozuvlar, time.perf_counter() - boshlanish
+
+    async def _ochiq_bosqich(self, foydalanuvchilar, rps, options):
+        """
+        So'rovlar 1/rps oraliq bilan rejalashtiriladi, javobni kutmasdan
+
+        Bo'sh ulanish bo'lmasa, so'rov navbatda kutadi - bu vaqt ham
+        kechikishga kiradi (coordinated omission yo'q).
+
+        Returns:
+            tuple: ([(sahifa, status, sekund), ...], davomiylik)
+        """
+        hovuz = asyncio.Queue()
+        for foydalanuvchi in foydalanuvchilar:
+            hovuz.put_nowait(foydalanuvchi)
+        yozuvlar = []
+
+        async def bitta(reja):
+            foydalanuvchi = await hovuz.get()
+            try:
+                sahifa = self._tanlash(foydalanuvchi)
+                holat = await self._bajarish(foydalanuvchi, sahifa, options)
+            finally:
+                hovuz.put_nowait(foydalanuvchi)
+            yozuvlar.append((sahifa, holat, time.perf_counter() - reja))
+
+        vazifalar = []
+        boshlanish = time.perf_counter()
+        for raqam in range(int(rps * options['sekund'])):
+            reja = boshlanish + raqam / rps
+            kutish = reja - time.perf_counter()
+            if kutish > 0:
+                await asyncio.sleep(kutish)
+            vazifalar.append(asyncio.create_task(bitta(reja)))
+        await asyncio.gather(*vazifalar)
+        return yozuvlar, time.perf_counter() - boshlanish
+
+    # ------------------------------------------------------------------------
+    # Hisobot
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def _korsatkichlar(yozuvlar):
+        kechikishlar = sorted(sekund * 1000 for _, _, sekund in yozuvlar)
+        return {
+            'sorovlar': len(yozuvlar),
+            'xatolar': sum(1 for _, holat, _ in yozuvlar if holat == 0 or holat >= 500),
+            'xatolar_4xx': sum(1 for _, holat, _ in yozuvlar if 400 <= holat < 500),
+            'p50_ms': round(_foizlik(kechikishlar, 0.50), 2),
+            'p95_ms': round(_foizlik(kechikishlar, 0.95), 2),
+            'p99_ms': round(_foizlik(kechikishlar, 0.99), 2),
+        }
+
+    def _xulosa(self, bosqich, yozuvlar, sekund):
+        kechikishlar = sorted(sekund * 1000 for _, _, sekund in yozuvlar)
+        gistogramma = [0] * (len(GISTOGRAMMA) + 1)
+        for kechikish in kechikishlar:
+            gistogramma[bisect.bisect_left(GISTOGRAMMA, kechikish)] += 1
+        return {
+            'bosqich': bosqich,
+            'sorov_s': round(len(yozuvlar) / sekund, 1) if sekund else 0,
+            **self._korsatkichlar(yozuvlar),
+            'gistogramma': gistogramma,
+            'sahifalar': {
+                sahifa: self._korsatkichlar([yozuv for yozuv in yozuvlar if yozuv[0] == sahifa])
+                for sahifa in self.aralashma if any(yozuv[0] == sahifa for yozuv in yozuvlar)
+            },
+        }
+
+    def _bosqich_qatori(self, natija, ochiq):
+        if natija is None:
+            self.stdout.write(
+                f"{'rps' if ochiq else 'parallel':>9}{'so`rov/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+                f"{'xato %':>8}{'4xx':>6}"
+            )
+            return
+        xato = natija['xatolar'] / natija['sorovlar'] * 100 if natija['sorovlar'] else 0
+        self.stdout.write(
+            f"{natija['bosqich']:>9g}{natija['sorov_s']:>10.1f}{natija['p50_ms']:>9.1f}{natija['p95_ms']:>9.1f}"
+            f"{natija['p99_ms']:>9.1f}{xato:>8.2f}{natija['xatolar_4xx']:>6}"
+        )
+
+    @staticmethod
+    def _tizza(natijalar):
+        """
+        Tizza nuqtasi: keyingi bosqich o'tkazuvchanlikni TIZZA_OSISH dan kam
+        oshiradigan yoki xatolar TIZZA_XATO dan oshadigan oxirgi "foydali" bosqich
+
+        Returns:
+            int | None: natijalar ichidagi indeks (topilmasa - None)
+        """
+        for raqam in range(1, len(natijalar)):
+            oldingi, joriy = natijalar[raqam - 1], natijalar[raqam]
+            xato = joriy['xatolar'] / joriy['sorovlar'] if joriy['sorovlar'] else 1
+            if not oldingi['sorov_s'] or joriy['sorov_s'] < oldingi['sorov_s'] * (1 + TIZZA_OSISH) or xato > TIZZA_XATO:
+                return raqam - 1
+        return None
+
+    def _hisobot(self, natijalar, ochiq):
+        tizza = self._tizza(natijalar)
+        self.stdout.write('')
+        if tizza is None:
+            self.stdout.write("Tizza topilmadi - o'tkazuvchanlik oxirgi bosqichgacha o'sdi, yuklamani oshiring")
+            tanlangan = natijalar[-1]
+        else:
+            tanlangan, keyingi = natijalar[tizza], natijalar[tizza + 1]
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"Tizza: {'rps' if ochiq else 'parallel'} {tanlangan['bosqich']:g} - "
+                f"{tanlangan['sorov_s']:.1f} so'rov/s, p95 {tanlangan['p95_ms']:.1f} ms"
+            ))
+            self.stdout.write(
+                f"  keyingi bosqich ({keyingi['bosqich']:g}): so'rov/s "
+                f"{(keyingi['sorov_s'] / max(tanlangan['sorov_s'], 1e-9) - 1) * 100:+.0f}%, "
+                f"p95 {(keyingi['p95_ms'] / max(tanlangan['p95_ms'], 1e-9) - 1) * 100:+.0f}%, "
+                f"xatolar {keyingi['xatolar']}"
+            )
+
+        self.stdout.write('')
+        self.stdout.write(f"Kechikish gistogrammasi (bosqich {tanlangan['bosqich']:g}):")
+        eng_kop = max(tanlangan['gistogramma']) or 1
+        chegaralar = [f'<= {chegara} ms' for chegara in GISTOGRAMMA] + [f'> {GISTOGRAMMA[-1]} ms']
+        for chegara, soni in zip(chegaralar, tanlangan['gistogramma']):
+            if soni:
+                self.stdout.write(f"  {chegara:>11} {soni:>8}  {'█' * max(round(soni / eng_kop * 40), 1)}")
+
+        self.stdout.write('')
+        self.stdout.write(f"{'Sahifa':<14}{'soni':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'xato':>7}{'4xx':>6}")
+        for sahifa, natija in tanlangan['sahifalar'].items():
+            self.stdout.write(
+                f"{sahifa:<14}{natija['sorovlar']:>8}{natija['p50_ms']:>9.1f}{natija['p95_ms']:>9.1f}"
+                f"{natija['p99_ms']:>9.1f}{natija['xatolar']:>7}{natija['xatolar_4xx']:>6}"
+            )
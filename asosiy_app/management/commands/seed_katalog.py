@@ -0,0 +1,387 @@
+"""
+seed_katalog - benchmarklar uchun katta katalog yaratish (takrorlanadigan)
+
+Bir xil argumentlar va bo'sh katalog bilan har safar aynan bir xil
+ma'lumot yaratiladi (id lar, nomlar, narxlar, sharhlar, sanalar) -
+sekinlikni boshqa kompyuterda ham aynan shu ma'lumotda qaytarish mumkin.
+
+Yaratiladi:
+- kategoriyalar (--kategoriyalar)
+- foydalanuvchilar xaridor0, xaridor1, ... (parol: parol12345)
+- mahsulotlar: to'g'ri slug, miqdorga mos holat, namuna rasmlar
+  (media/mahsulotlar/namuna/), narx va chegirmalar
+- sharhlar: (mahsulot, foydalanuvchi) takrorlanmaydi, har bir mahsulot
+  reytingi uning tasdiqlangan sharhlari o'rtachasiga teng (signal kabi)
+
+Tezlik uchun:
+- har bir partiya (--partiya ta mahsulot va ularning sharhlari) bitta
+  tranzaksiyada, id lar oldindan beriladi (RETURNING siz)
+- foydalanuvchi, mahsulot va sharh qatorlari model obyektlarisiz, tayyor
+  qiymatlar bilan executemany orqali yoziladi. bulk_create har bir
+  maydonni ORM orqali tayyorlaydi (~7 mks/maydon) va ~15 ming qator/s
+  dan oshmaydi; executemany - 100 ming qator/s dan ortiq (SQLite, WAL)
+- signallar ishlamaydi - slug, holat va reyting shu yerda hisoblanadi,
+  kesh teglari oxirida bir marta e'lon qilinadi
+
+Foydalanish (alohida baza tavsiya etiladi):
+    export DATABASE_URL=sqlite:////tmp/katalog.sqlite3 SQLITE_TEZKOR_PROFIL=1
+    python manage.py migrate
+    python manage.py seed_katalog --mahsulotlar 1000000 --sharhlar 5000000 --users 200000
+"""
+
+import random
+import struct
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils.text import slugify
+
+from asosiy_app.kesh import teglar_ozgardi
+from asosiy_app.models import Kategoriya, Mahsulot, Sharh
+
+KATEGORIYALAR = [
+    'Telefonlar', 'Noutbuklar', 'Televizorlar', 'Maishiy texnika', 'Kiyimlar', 'Poyabzallar',
+    'Kitoblar', "O'yinchoqlar", 'Sport', 'Mebel', 'Oziq-ovqat', "Go'zallik", 'Avtotovarlar',
+    "Bog' va hovli", 'Qurilish', 'Kanselyariya',
+]
+BRENDLAR = ['Samsung', 'Apple', 'Xiaomi', 'Artel', 'Lenovo', 'Philips', 'Bosch', 'Tefal', 'Nike', 'Adidas', 'Sony', 'LG']
+TURLAR = [
+    'telefon', 'noutbuk', 'televizor', 'muzlatgich', 'changyutgich', 'krossovka', 'kir yuvish mashinasi',
+    'planshet', 'quloqchin', 'soat', 'dazmol', 'choynak', 'kurtka', 'ryukzak',
+]
+SIFATLAR = ['Pro', 'Lite', 'Max', 'Mini', 'Plus', 'Ultra', 'Classic', 'Neo']
+SHARH_MATNLARI = [
+    "Juda yaxshi mahsulot, tavsiya qilaman", "Narxiga arziydi", "Yetkazib berish tez bo'ldi",
+    "Sifati o'rtacha", "Kutganimdek emas", "Ikkinchi marta olyapman", "Qadoqlash yaxshi edi",
+    "Rangi rasmdagidan biroz farq qiladi", "Ishlatish qulay", "Sovg'aga oldim, yoqdi",
+]
+
+# Namuna rasmlar (har xil rangli 64x64 PNG) - mahsulotlar navbat bilan oladi
+RASM_RANGLARI = [
+    (59, 130, 246), (16, 185, 129), (245, 158, 11), (239, 68, 68),
+    (139, 92, 246), (236, 72, 153), (20, 184, 166), (107, 114, 128),
+]
+RASM_PAPKASI = 'mahsulotlar/namuna'
+
+# Barcha sanalar shu vaqtdan hisoblanadi (takrorlanuvchanlik uchun)
+BOSHLANISH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+# Foydalanuvchilar uchun bitta umumiy parol (hash bir marta hisoblanadi)
+PAROL = 'parol12345'
+
+
+def _png(rang, olcham=64):
+    """
+    Bir rangli PNG fayl baytlari (Pillow siz)
+    """
+    def bolak(tur, malumot):
+        return struct.pack('>I', len(malumot)) + tur + malumot + struct.pack('>I', zlib.crc32(tur + malumot))
+
+    qator = b'\x00' + bytes(rang) * olcham
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + bolak(b'IHDR', struct.pack('>IIBBBBB', olcham, olcham, 8, 2, 0, 0, 0))
+        + bolak(b'IDAT', zlib.compress(qator * olcham, 9))
+        + bolak(b'IEND', b'')
+    )
+
+
+# Qatorlar shu tartibda yoziladi (modelga yangi maydon qo'shilsa - shu yerga ham)
+USTUNLAR = {
+    User: [
+        'id', 'password', 'last_login', 'is_superuser', 'username', 'first_name', 'last_name', 'email',
+        'is_staff', 'is_active', 'date_joined',
+    ],
+    Mahsulot: [
+        'id', 'nomi', 'slug', 'kategoriya_id', 'qisqacha_tavsif', 'toliq_tavsif', 'narx', 'chegirma_narxi',
+        'rasm', 'miqdor', 'holat', 'mashhur', 'yangi', 'korilganlar_soni', 'reyting', 'yaratuvchi_id',
+        'yaratilgan_sana', 'yangilangan_sana', 'versiya',
+    ],
+    Sharh: ['id', 'mahsulot_id', 'foydalanuvchi_id', 'matn', 'baho', 'tasdiqlangan', 'yaratilgan_sana'],
+}
+
+
+def _insert_sql(model):
+    """
+    INSERT INTO <jadval> (USTUNLAR[model]) VALUES (%s, ...)
+
+    Raises:
+        CommandError: Modeldagi ustunlar USTUNLAR bilan mos kelmasa
+    """
+    ustunlar = USTUNLAR[model]
+    if set(ustunlar) != {maydon.attname for maydon in model._meta.concrete_fields}:
+        raise CommandError(f"{model.__name__} maydonlari o'zgargan - seed_katalog.USTUNLAR ni yangilang")
+    nom = connection.ops.quote_name
+    return (
+        f"INSERT INTO {nom(model._meta.db_table)} "
+        f"({', '.join(nom(model._meta.get_field(ustun).column) for ustun in ustunlar)}) "
+        f"VALUES ({', '.join(['%s'] * len(ustunlar))})"
+    )
+
+
+@contextmanager
+def _indekslarsiz(*modellar):
+    """
+    SQLite: yuklash davomida ikkilamchi indekslarni olib tashlab, oxirida
+    qayta qurish
+
+    Bo'sh jadvalga million qator yozishda har bir INSERT da indeks
+    daraxtlarini yangilashdan ko'ra, oxirida bir marta saralab qurish
+    tezroq. Xato bo'lsa ham indekslar qaytariladi (unique indeks qayta
+    qurilmasa - ma'lumot noto'g'ri, xato ko'rinadi). Boshqa bazalarda
+    hech narsa qilmaydi.
+    """
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    jadvallar = [model._meta.db_table for model in modellar]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+            f"AND tbl_name IN ({', '.join(['%s'] * len(jadvallar))})",
+            jadvallar,
+        )
+        indekslar = cursor.fetchall()
+        for nom, _ in indekslar:
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name(nom)}')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for _, sql in indekslar:
+                cursor.execute(sql)
+
+
+class Command(BaseCommand):
+    help = "Benchmarklar uchun katta, takrorlanadigan katalog yaratadi (partiyalab, signallarsiz)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mahsulotlar', type=int, default=10000, help="Mahsulotlar soni (standart: 10000)")
+        parser.add_argument('--sharhlar', type=int, default=50000, help="Sharhlar soni (standart: 50000)")
+        parser.add_argument('--users', type=int, default=2000, help="Foydalanuvchilar soni (standart: 2000)")
+        parser.add_argument('--kategoriyalar', type=int, default=12, help="Kategoriyalar soni (standart: 12)")
+        parser.add_argument('--urug', type=int, default=42, help="Tasodifiy sonlar urug'i (standart: 42)")
+        parser.add_argument(
+            '--partiya', type=int, default=20000,
+            help="Bitta tranzaksiyadagi mahsulotlar/foydalanuvchilar soni (standart: 20000)",
+        )
+
+    def handle(self, *args, **options):
+        if options['mahsulotlar'] < 0 or options['sharhlar'] < 0 or options['users'] < 0:
+            raise CommandError("Sonlar manfiy bo'lishi mumkin emas")
+        if options['sharhlar'] and not (options['mahsulotlar'] and options['users']):
+            raise CommandError("Sharhlar uchun mahsulotlar va foydalanuvchilar kerak")
+        if not 1 <= options['kategoriyalar'] <= len(KATEGORIYALAR):
+            raise CommandError(f"--kategoriyalar 1 dan {len(KATEGORIYALAR)} gacha bo'lishi kerak")
+        if options['partiya'] <= 0:
+            raise CommandError("--partiya musbat bo'lishi kerak")
+        if Mahsulot.objects.exists():
+            raise CommandError("Katalog bo'sh emas - seed_katalog yangi bazada ishga tushiriladi")
+        if User.objects.filter(username='xaridor0').exists():
+            raise CommandError("xaridor0 allaqachon bor - katalog avval yaratilgan")
+
+        self.tasodif = random.Random(options['urug'])
+        self.partiya = options['partiya']
+        self.soni = {}
+        boshlanish = time.perf_counter()
+
+        rasmlar = self._rasmlar()
+        kategoriyalar = self._kategoriyalar(options['kategoriyalar'])
+        foydalanuvchilar = self._foydalanuvchilar(options['users'])
+        with _indekslarsiz(Mahsulot, Sharh):
+            self._mahsulotlar_va_sharhlar(
+                options['mahsulotlar'], options['sharhlar'], kategoriyalar, foydalanuvchilar, rasmlar,
+            )
+
+        # PostgreSQL: id lar qo'lda berildi - ketma-ketliklarni oxirgi id ga surish
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [User, Kategoriya, Mahsulot, Sharh]):
+                cursor.execute(sql)
+
+        # Signallar ishlamadi - keshlar (bosh sahifa, reestr, takliflar) shu yerda eskiradi
+        teglar_ozgardi(['mahsulot', 'kategoriya', 'sharh'])
+
+        sekund = time.perf_counter() - boshlanish
+        jami = sum(self.soni.values())
+        for nom, soni in self.soni.items():
+            self.stdout.write(f"{nom:<18}{soni:>12,}")
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {jami:,} qator {sekund:.1f} sekundda ({jami / max(sekund, 1e-9):,.0f} qator/s)"
+        ))
+
+    def _rasmlar(self):
+        """
+        Namuna rasmlarni MEDIA_ROOT ga yozish (bor bo'lsa - tegmaydi)
+
+        Returns:
+            list: ImageField ga yoziladigan nisbiy yo'llar
+        """
+        papka = settings.MEDIA_ROOT / RASM_PAPKASI
+        papka.mkdir(parents=True, exist_ok=True)
+        yollar = []
+        for raqam, rang in enumerate(RASM_RANGLARI):
+            fayl = papka / f'{raqam}.png'
+            if not fayl.exists():
+                fayl.write_bytes(_png(rang))
+            yollar.append(f'{RASM_PAPKASI}/{raqam}.png')
+        return yollar
+
+    def _kategoriyalar(self, soni):
+        """
+        Kategoriyalarni yaratish (shu nomdagilari bo'lsa - ular ishlatiladi)
+
+        Returns:
+            list: Kategoriya id lari
+        """
+        nomlar = KATEGORIYALAR[:soni]
+        Kategoriya.objects.bulk_create(
+            [Kategoriya(nomi=nomi, tavsif=f"{nomi} bo'limi", faol=True) for nomi in nomlar],
+            ignore_conflicts=True,
+        )
+        idlar = dict(Kategoriya.objects.filter(nomi__in=nomlar).values_list('nomi', 'id'))
+        self.soni['kategoriyalar'] = len(idlar)
+        return [idlar[nomi] for nomi in nomlar]
+
+    def _foydalanuvchilar(self, soni):
+        """
+        xaridor0..xaridor{soni-1} - bitta parol hashi bilan
+
+        Returns:
+            range: Foydalanuvchi id lari (ketma-ket)
+        """
+        birinchi = (User.objects.aggregate(eng_katta=Max('id'))['eng_katta'] or 0) + 1
+        parol = make_password(PAROL)
+        sana_qiymati = connection.ops.adapt_datetimefield_value
+        sql = _insert_sql(User)
+        for boshi in range(0, soni, self.partiya):
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, [
+                    (birinchi + raqam, parol, None, False, f'xaridor{raqam}', '', '', f'xaridor{raqam}@example.com',
+                     False, True, sana_qiymati(BOSHLANISH + timedelta(minutes=raqam)))
+                    for raqam in range(boshi, min(boshi + self.partiya, soni))
+                ])
+        self.soni['foydalanuvchilar'] = soni
+        return range(birinchi, birinchi + soni)
+
+    def _sharhlar_soni(self, mahsulotlar, sharhlar, foydalanuvchilar):
+        """
+        Har bir mahsulotga nechta sharh (jami aynan --sharhlar, lekin notekis)
+
+        Teng taqsimotdan boshlab, qo'shni juftliklar orasida sharhlar
+        tasodifiy ko'chiriladi - jami o'zgarmaydi. Bitta mahsulotga
+        foydalanuvchilar sonidan ko'p sharh bo'lmaydi.
+        """
+        sonlar = [sharhlar * (raqam + 1) // mahsulotlar - sharhlar * raqam // mahsulotlar for raqam in range(mahsulotlar)]
+        for raqam in range(0, mahsulotlar - 1, 2):
+            kochadi = self.tasodif.randint(-sonlar[raqam], sonlar[raqam + 1])
+            sonlar[raqam] += kochadi
+            sonlar[raqam + 1] -= kochadi
+        chegara = len(foydalanuvchilar)
+        return [min(soni, chegara) for soni in sonlar]
+
+    def _mahsulotlar_va_sharhlar(self, mahsulotlar, sharhlar, kategoriyalar, foydalanuvchilar, rasmlar):
+        """
+        Mahsulotlar va ularning sharhlarini partiyalab yaratish
+
+        Har bir partiya (mahsulotlar + ularning sharhlari) - bitta tranzaksiya.
+        Sanalar 30 sekundlik qadamda: mahsulot - raqam-qadam, uning sharhlari
+        - bir soatdan keyin (120 qadam) va h.k. Qadam -> bazadagi qiymat
+        keshlanadi: sharh sanalari keyingi mahsulotlarnikiga to'g'ri keladi.
+        """
+        # randint() dan ~4 marta tez - million qatorlarda sezilarli
+        tasodifiy = self.tasodif.random
+        sharh_sonlari = self._sharhlar_soni(mahsulotlar, sharhlar, foydalanuvchilar) if mahsulotlar else []
+        nom_asoslari = [
+            (f'{brend} {tur} {sifat}', slugify(f'{brend} {tur} {sifat}'))
+            for brend in BRENDLAR for tur in TURLAR for sifat in SIFATLAR
+        ]
+        matnlar, odamlar = len(SHARH_MATNLARI), len(foydalanuvchilar)
+        ops = connection.ops
+
+        @lru_cache(maxsize=1 << 16)
+        def sana_qiymati(qadam):
+            return ops.adapt_datetimefield_value(BOSHLANISH + timedelta(seconds=qadam * 30))
+
+        def pul(qiymat):
+            return ops.adapt_decimalfield_value(Decimal(qiymat), 10, 2)
+
+        mahsulot_sql, sharh_sql = _insert_sql(Mahsulot), _insert_sql(Sharh)
+        sharh_id = 0
+        self.soni['mahsulotlar'] = self.soni['sharhlar'] = 0
+
+        for boshi in range(0, mahsulotlar, self.partiya):
+            mahsulot_partiyasi, sharh_partiyasi = [], []
+            for raqam in range(boshi, min(boshi + self.partiya, mahsulotlar)):
+                mahsulot_id = raqam + 1
+                # Sharhlar: har bir mahsulotning o'z "sifati" atrofida baholar
+                sifat = 2 + tasodifiy() * 3
+                foydalanuvchi = int(tasodifiy() * odamlar)
+                tasdiqlangan_jami = tasdiqlangan_soni = 0
+                for tartib in range(sharh_sonlari[raqam]):
+                    son = tasodifiy()
+                    baho = min(max(round(sifat + (son - 0.5) * 3), 1), 5)
+                    tasdiqlangan = int(son * 1000) % 10 != 0     # ~90%
+                    if tasdiqlangan:
+                        tasdiqlangan_jami += baho
+                        tasdiqlangan_soni += 1
+                    sharh_id += 1
+                    sharh_partiyasi.append((
+                        sharh_id, mahsulot_id, foydalanuvchilar[(foydalanuvchi + tartib) % odamlar],
+                        SHARH_MATNLARI[int(son * 100000) % matnlar], baho, tasdiqlangan,
+                        sana_qiymati(raqam + 120 * (tartib + 1)),
+                    ))
+
+                # Mahsulot: holat miqdorga mos (mahsulot_holat_tekshirish signali kabi)
+                nomi, slug = nom_asoslari[raqam % len(nom_asoslari)]
+                narx = (10 + int(tasodifiy() * 4991)) * 1000
+                miqdor = 0 if tasodifiy() < 0.1 else 1 + int(tasodifiy() * 200)
+                if miqdor == 0:
+                    holat = 'tugagan'
+                elif tasodifiy() < 0.03:
+                    holat = 'buyurtma'
+                else:
+                    holat = 'mavjud'
+                reyting = round(tasdiqlangan_jami / tasdiqlangan_soni, 2) if tasdiqlangan_soni else 0
+                sana = sana_qiymati(raqam)
+                # USTUNLAR[Mahsulot] tartibida
+                mahsulot_partiyasi.append((
+                    mahsulot_id,
+                    f'{nomi} {mahsulot_id}',
+                    f'{slug}-{mahsulot_id}',
+                    kategoriyalar[raqam % len(kategoriyalar)],
+                    f'{nomi} - qisqacha tavsif',
+                    f"{nomi} haqida to'liq ma'lumot. Kafolat 12 oy.",
+                    pul(narx),
+                    pul(narx * 85 // 100) if tasodifiy() < 0.2 else None,
+                    rasmlar[raqam % len(rasmlar)],
+                    miqdor,
+                    holat,
+                    tasodifiy() < 0.05,
+                    raqam >= mahsulotlar * 9 // 10,
+                    int(tasodifiy() * 10001),
+                    pul(f'{reyting:.2f}'),
+                    None,
+                    sana,
+                    sana,
+                    0,
+                ))
+
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(mahsulot_sql, mahsulot_partiyasi)
+                if sharh_partiyasi:
+                    cursor.executemany(sharh_sql, sharh_partiyasi)
+            self.soni['mahsulotlar'] += len(mahsulot_partiyasi)
+            self.soni['sharhlar'] += len(sharh_partiyasi)
+            self.stdout.write(f"  {self.soni['mahsulotlar']:,} / {mahsulotlar:,} mahsulot", ending='\r')
+        self.stdout.write('')
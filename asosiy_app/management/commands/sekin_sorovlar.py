@@ -0,0 +1,75 @@
+"""
+sekin_sorovlar - Sekin SQL so'rovlar hisoboti
+
+asosiy_app/sekin_sorovlar.py yozgan jurnaldan eng sekin so'rovlarni
+ko'rinishi bo'yicha guruhlab chiqaradi (admin paneldagi
+/admin/sekin-sorovlar/ sahifasi bilan bir xil ma'lumot).
+
+Foydalanish:
+    python manage.py sekin_sorovlar
+    python manage.py sekin_sorovlar --top 5 --saralash maks_ms --reja
+    python manage.py sekin_sorovlar --json > sekin.json
+    python manage.py sekin_sorovlar --tozalash
+"""
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from asosiy_app import sekin_sorovlar
+
+
+class Command(BaseCommand):
+    help = "Eng sekin SQL so'rovlar hisobotini chiqaradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=20,
+            help="Nechta so'rov ko'rsatilsin (standart: 20)",
+        )
+        parser.add_argument(
+            '--saralash', default='jami_ms', choices=['jami_ms', 'soni', 'maks_ms', 'ortacha_ms'],
+            help="Saralash tartibi (standart: jami_ms - jami sarflangan vaqt)",
+        )
+        parser.add_argument(
+            '--reja', action='store_true',
+            help="Bajarilish rejasini (EXPLAIN) ham ko'rsatish",
+        )
+        parser.add_argument(
+            '--json', action='store_true',
+            help="Natijani JSON formatida chiqarish",
+        )
+        parser.add_argument(
+            '--tozalash', action='store_true',
+            help="Jurnalni o'chirish",
+        )
+
+    def handle(self, *args, **options):
+        if options['tozalash']:
+            sekin_sorovlar.tozalash()
+            self.stdout.write(self.style.SUCCESS("✓ Sekin so'rovlar jurnali tozalandi"))
+            return
+
+        sorovlar = sekin_sorovlar.hisobot(top=options['top'], saralash=options['saralash'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(sorovlar, ensure_ascii=False, indent=2))
+            return
+
+        if not sorovlar:
+            self.stdout.write(f"Sekin so'rovlar yo'q ({sekin_sorovlar.jurnal_fayli()})")
+            return
+
+        for tartib, sorov in enumerate(sorovlar, start=1):
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{tartib}. {sorov['soni']}x, jami {sorov['jami_ms']} ms, "
+                f"o'rtacha {sorov['ortacha_ms']} ms, maks {sorov['maks_ms']} ms [{sorov['baza']}]"
+            ))
+            self.stdout.write(f"   {sorov['korinish'][:500]}")
+            for qator in sorov['manba']:
+                self.stdout.write(f"      {qator}")
+            if options['reja'] and sorov['reja']:
+                self.stdout.write("   Reja:")
+                for qator in sorov['reja'].splitlines():
+                    self.stdout.write(f"      {qator}")
+            self.stdout.write('')
@@ -0,0 +1,57 @@
+"""
+sessiyalarni_tozalash - Eskirgan sessiyalarni partiyalab o'chirish
+
+Django ning clearsessions buyrug'i o'rniga: eskirgan sessiyalar bitta
+katta DELETE bilan emas, kichik partiyalar bilan o'chiriladi
+(django_session.expire_date indeksi bo'yicha). Har bir partiya alohida
+tranzaksiya - jadval uzoq qulflanmaydi va saytdagi so'rovlar kutmaydi.
+
+Foydalanish (cron orqali, masalan, har kuni tunda):
+    python manage.py sessiyalarni_tozalash
+    python manage.py sessiyalarni_tozalash --partiya 500 --pauza 0.2
+"""
+
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from asosiy_app.sessiyalar import SessiyaTozalashMixin
+
+
+class Command(BaseCommand):
+    help = "Eskirgan sessiyalarni jadvalni uzoq qulflamasdan partiyalab o'chiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--partiya', type=int, default=None,
+            help="Bitta DELETE dagi sessiyalar soni (standart: SESSIYA_TOZALASH_PARTIYASI)",
+        )
+        parser.add_argument(
+            '--pauza', type=float, default=0.05,
+            help="Partiyalar orasidagi kutish, sekund (standart: 0.05)",
+        )
+
+    def handle(self, *args, **options):
+        engine = import_module(settings.SESSION_ENGINE)
+        store = engine.SessionStore
+
+        if not hasattr(store, 'get_model_class'):
+            # signed_cookies - sessiyalar serverda saqlanmaydi
+            self.stdout.write(f"{settings.SESSION_ENGINE}: serverda sessiyalar saqlanmaydi, tozalash shart emas")
+            return
+
+        boshlanish = time.perf_counter()
+        if issubclass(store, SessiyaTozalashMixin):
+            soni = store.clear_expired(partiya=options['partiya'], pauza=options['pauza'])
+        else:
+            # Boshqa (partiyasiz) backend - Django standarti
+            store.clear_expired()
+            soni = None
+        sarflandi = time.perf_counter() - boshlanish
+
+        if soni is None:
+            self.stdout.write(self.style.SUCCESS(f"✓ Eskirgan sessiyalar o'chirildi ({sarflandi:.1f} s)"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✓ {soni} ta eskirgan sessiya o'chirildi ({sarflandi:.1f} s)"))
@@ -0,0 +1,235 @@
+"""
+sqlite_benchmark - SQLite profillarini bir vaqtdagi yuklama ostida taqqoslash
+
+Bir nechta jarayon (gunicorn workerlari kabi) bitta SQLite fayliga
+bir vaqtda murojaat qiladi:
+- o'quvchilar - katalog sahifasidagi kabi mahsulotlar ro'yxatini o'qiydi
+- yozuvchilar - sharh qo'shadi va mahsulot reytingini yangilaydi
+  (sharh_qoshish view + reyting signali kabi bitta tranzaksiyada)
+
+Ikkala profil alohida vaqtinchalik faylda sinaladi:
+- standart - Django ning standart SQLite sozlamalari (rollback journal,
+  BEGIN DEFERRED)
+- tezkor - settings.SQLITE_PRAGMALARI + BEGIN IMMEDIATE
+  (SQLITE_TEZKOR_PROFIL = True bo'lganda ishlatiladigan sozlamalar)
+
+Foydalanish:
+    python manage.py sqlite_benchmark
+    python manage.py sqlite_benchmark --sekund 10 --oquvchilar 8 --yozuvchilar 4
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Sinov jadvallari (asosiy_app jadvallarining soddalashtirilgan nusxasi)
+SXEMA = """
+CREATE TABLE kategoriya (id INTEGER PRIMARY KEY, nomi TEXT NOT NULL, faol INTEGER NOT NULL);
+CREATE TABLE mahsulot (
+    id INTEGER PRIMARY KEY, kategoriya_id INTEGER NOT NULL REFERENCES kategoriya(id),
+    nomi TEXT NOT NULL, narx REAL NOT NULL, holat TEXT NOT NULL,
+    reyting REAL NOT NULL DEFAULT 0, yaratilgan_sana REAL NOT NULL
+);
+CREATE INDEX mahsulot_sana ON mahsulot(yaratilgan_sana);
+CREATE TABLE sharh (
+    id INTEGER PRIMARY KEY, mahsulot_id INTEGER NOT NULL REFERENCES mahsulot(id),
+    baho INTEGER NOT NULL, matn TEXT NOT NULL, tasdiqlangan INTEGER NOT NULL
+);
+CREATE INDEX sharh_mahsulot ON sharh(mahsulot_id);
+"""
+
+MAHSULOTLAR_SONI = 2000
+
+# Django SQLite backendi sqlite3.connect ga beradigan standart timeout
+STANDART_TIMEOUT = 5
+
+
+def _ulanish(fayl, profil):
+    """
+    Profilga mos SQLite ulanishi (Django backendi kabi autocommit rejimida)
+    """
+    ulanish = sqlite3.connect(fayl, timeout=STANDART_TIMEOUT, isolation_level=None)
+    if profil['pragmalar']:
+        for nom, qiymat in profil['pragmalar'].items():
+            ulanish.execute(f'PRAGMA {nom} = {qiymat}')
+    return ulanish
+
+
+def _oquvchi(fayl, profil, tugash):
+    """
+    Katalog sahifasi: yangi mahsulotlar ro'yxati (kategoriya bilan)
+
+    Returns:
+        tuple: (bajarilgan amallar, xatolar, kechikishlar ro'yxati)
+    """
+    ulanish = _ulanish(fayl, profil)
+    amallar, xatolar, kechikishlar = 0, 0, []
+    while time.time() < tugash:
+        boshlanish = time.perf_counter()
+        try:
+            ulanish.execute(
+                "SELECT m.id, m.nomi, m.narx, m.reyting, k.nomi FROM mahsulot m "
+                "JOIN kategoriya k ON k.id = m.kategoriya_id "
+                "WHERE m.holat = 'mavjud' AND k.faol = 1 "
+                "ORDER BY m.yaratilgan_sana DESC LIMIT 12 OFFSET ?",
+                (random.randrange(0, MAHSULOTLAR_SONI - 12),),
+            ).fetchall()
+            amallar += 1
+        except sqlite3.OperationalError:
+            xatolar += 1
+        kechikishlar.append(time.perf_counter() - boshlanish)
+    ulanish.close()
+    return amallar, xatolar, kechikishlar
+
+
+def _yozuvchi(fayl, profil, tugash):
+    """
+    Sharh qo'shish: sharhni yozish va mahsulot reytingini qayta hisoblash
+
+    Returns:
+        tuple: (bajarilgan amallar, xatolar, kechikishlar ro'yxati)
+    """
+    ulanish = _ulanish(fayl, profil)
+    amallar, xatolar, kechikishlar = 0, 0, []
+    while time.time() < tugash:
+        mahsulot_id = random.randint(1, MAHSULOTLAR_SONI)
+        boshlanish = time.perf_counter()
+        try:
+            ulanish.execute(profil['begin'])
+            ulanish.execute(
+                "INSERT INTO sharh (mahsulot_id, baho, matn, tasdiqlangan) VALUES (?, ?, ?, 1)",
+                (mahsulot_id, random.randint(1, 5), 'Yaxshi mahsulot'),
+            )
+            (reyting,) = ulanish.execute(
+                "SELECT AVG(baho) FROM sharh WHERE mahsulot_id = ? AND tasdiqlangan = 1", (mahsulot_id,),
+            ).fetchone()
+            ulanish.execute("UPDATE mahsulot SET reyting = ? WHERE id = ?", (reyting, mahsulot_id))
+            ulanish.execute('COMMIT')
+            amallar += 1
+        except sqlite3.OperationalError:
+            # "database is locked" - Django da bu 500 xato bo'lardi
+            if ulanish.in_transaction:
+                ulanish.execute('ROLLBACK')
+            xatolar += 1
+        kechikishlar.append(time.perf_counter() - boshlanish)
+    ulanish.close()
+    return amallar, xatolar, kechikishlar
+
+
+class Command(BaseCommand):
+    help = "SQLite ning standart va tezkor (WAL) profillarini bir vaqtdagi yuklama ostida taqqoslaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sekund', type=float, default=5,
+            help="Har bir profil necha sekund sinalsin (standart: 5)",
+        )
+        parser.add_argument(
+            '--oquvchilar', type=int, default=4,
+            help="O'quvchi jarayonlar soni (standart: 4)",
+        )
+        parser.add_argument(
+            '--yozuvchilar', type=int, default=2,
+            help="Yozuvchi jarayonlar soni (standart: 2)",
+        )
+
+    def handle(self, *args, **options):
+        if options['sekund'] <= 0 or options['oquvchilar'] < 0 or options['yozuvchilar'] < 0:
+            raise CommandError("--sekund musbat, jarayonlar soni manfiy bo'lmasligi kerak")
+        if options['oquvchilar'] + options['yozuvchilar'] == 0:
+            raise CommandError("Kamida bitta o'quvchi yoki yozuvchi kerak")
+
+        profillar = {
+            'standart': {'pragmalar': {}, 'begin': 'BEGIN'},
+            'tezkor': {'pragmalar': dict(settings.SQLITE_PRAGMALARI), 'begin': 'BEGIN IMMEDIATE'},
+        }
+
+        self.stdout.write(
+            f"O'quvchilar: {options['oquvchilar']}, yozuvchilar: {options['yozuvchilar']}, "
+            f"har bir profil: {options['sekund']} s"
+        )
+        natijalar = {}
+        with tempfile.TemporaryDirectory() as papka:
+            for nom, profil in profillar.items():
+                fayl = os.path.join(papka, f'{nom}.sqlite3')
+                self._tayyorlash(fayl, profil)
+                natijalar[nom] = self._sinash(fayl, profil, options)
+                self._chiqarish(nom, natijalar[nom], options['sekund'])
+
+        self._taqqoslash(natijalar)
+
+    def _tayyorlash(self, fayl, profil):
+        """
+        Sinov bazasini yaratish va mahsulotlar bilan to'ldirish
+        """
+        ulanish = _ulanish(fayl, profil)
+        ulanish.executescript(SXEMA)
+        ulanish.execute('BEGIN')
+        ulanish.executemany(
+            "INSERT INTO kategoriya (id, nomi, faol) VALUES (?, ?, 1)",
+            [(i, f'Kategoriya {i}') for i in range(1, 21)],
+        )
+        ulanish.executemany(
+            "INSERT INTO mahsulot (id, kategoriya_id, nomi, narx, holat, yaratilgan_sana) "
+            "VALUES (?, ?, ?, ?, 'mavjud', ?)",
+            [(i, i % 20 + 1, f'Mahsulot {i}', 1000 + i, time.time() - i) for i in range(1, MAHSULOTLAR_SONI + 1)],
+        )
+        ulanish.execute('COMMIT')
+        ulanish.close()
+
+    def _sinash(self, fayl, profil, options):
+        """
+        O'quvchi va yozuvchi jarayonlarni bir vaqtda ishga tushirish
+        """
+        jami = options['oquvchilar'] + options['yozuvchilar']
+        with ProcessPoolExecutor(max_workers=jami) as pool:
+            # Jarayonlar ishga tushishi uchun kichik zaxira vaqt
+            tugash = time.time() + 0.5 + options['sekund']
+            oquvchilar = [pool.submit(_oquvchi, fayl, profil, tugash) for _ in range(options['oquvchilar'])]
+            yozuvchilar = [pool.submit(_yozuvchi, fayl, profil, tugash) for _ in range(options['yozuvchilar'])]
+            return {
+                'oqish': self._yigish(oquvchilar),
+                'yozish': self._yigish(yozuvchilar),
+            }
+
+    def _yigish(self, vazifalar):
+        """
+        Jarayonlar natijalarini birlashtirish
+        """
+        amallar, xatolar, kechikishlar = 0, 0, []
+        for vazifa in vazifalar:
+            a, x, k = vazifa.result()
+            amallar += a
+            xatolar += x
+            kechikishlar += k
+        kechikishlar.sort()
+        p99 = kechikishlar[int(len(kechikishlar) * 0.99)] if kechikishlar else 0
+        return {'amallar': amallar, 'xatolar': xatolar, 'p99': p99}
+
+    def _chiqarish(self, nom, natija, sekund):
+        self.stdout.write('')
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Profil: {nom}"))
+        for tur in ('oqish', 'yozish'):
+            qiymat = natija[tur]
+            self.stdout.write(
+                f"  {tur:<7} {qiymat['amallar'] / sekund:10.0f} amal/s   "
+                f"xatolar (database is locked): {qiymat['xatolar']:<6}  p99: {qiymat['p99'] * 1000:.1f} ms"
+            )
+
+    def _taqqoslash(self, natijalar):
+        """
+        Tezkor profil standartdan necha marta tezroq
+        """
+        self.stdout.write('')
+        for tur in ('oqish', 'yozish'):
+            standart = natijalar['standart'][tur]['amallar']
+            tezkor = natijalar['tezkor'][tur]['amallar']
+            if standart:
+                self.stdout.write(f"{tur}: tezkor profil {tezkor / standart:.1f}x")
+        self.stdout.write(self.style.SUCCESS("✓ Taqqoslash yakunlandi"))
@@ -0,0 +1,378 @@
+"""
+Metrikalar - Prometheus formatidagi metrikalar (/metrics)
+
+Hisoblagichlar (counter), gistogrammalar (histogram) va joriy qiymatlar
+(gauge) har bir jarayonning xotirasida yig'iladi - issiq yo'lda faqat
+lug'atdagi bir nechta qo'shish (qulf ostida), fayl yoki tarmoq yo'q.
+
+Gunicorn workerlari orasida yig'ish (fayl orqali, teglar.py kabi):
+- Har bir jarayon o'z holatini METRIKALAR_YOZISH_ORALIGI da bir marta
+  (so'rov oxirida) METRIKALAR_PAPKASI/<pid>.json ga yozadi - vaqtinchalik
+  faylga yozib, os.replace() bilan almashtiriladi (o'qiyotgan worker
+  yarim yozilgan faylni ko'rmaydi)
+- /metrics qaysi workerga tushsa ham, papkadagi barcha fayllarni
+  (o'zinikini - xotiradan) qo'shib chiqaradi
+- To'xtagan worker faylini /metrics ni chiqarayotgan worker o'z hisobiga
+  qo'shib oladi (hisoblagich va gistogrammalar - jami qiymat kamaymaydi,
+  joriy qiymatlar (gauge) tashlab yuboriladi) va faylni o'chiradi - fayllar
+  soni tirik workerlar sonidan oshmaydi. Yangi jarayon o'z PID li eski
+  faylni (PID qayta ishlatilgan) ham birinchi yozishdan oldin shunday oladi
+
+Papka server ishga tushishidan oldin tozalanishi mumkin (tozalash());
+tozalanmasa, eski jarayonlar hisobi jami qiymatlarda qoladi.
+
+Ma'lumot manbalari:
+- SorovVaqtlariMiddleware (vaqtlar.py hisobi) - so'rov vaqti URL nomi va
+  status bo'yicha, SQL so'rovlar soni va vaqti, kesh hit/miss, signallar
+- olchash('korish_yozish_seconds') - ko'rilganlar hisoblagichini yozish
+- ulanishlar.hovuz_statistikasi() - ulanishlar hovuzi (PostgreSQL pool)
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+from .ulanishlar import hovuz_statistikasi
+
+# Sekundlardagi standart chegaralar (Prometheus mijozlaridagi kabi)
+VAQT_CHEGARALARI = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QISQA_VAQT_CHEGARALARI = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+SON_CHEGARALARI = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# nom -> (tur, tavsif, yorliqlar, gistogramma chegaralari)
+METRIKALAR = {
+    'sorov_davomiyligi_seconds': (
+        'histogram', "So'rov davomiyligi", ('url_nomi', 'method', 'status'), VAQT_CHEGARALARI,
+    ),
+    'sorov_sql_soni': (
+        'histogram', "Bitta so'rovdagi SQL so'rovlar soni", ('url_nomi',), SON_CHEGARALARI,
+    ),
+    'sql_davomiyligi_seconds_total': (
+        'counter', "SQL so'rovlarga ketgan jami vaqt", ('url_nomi',), None,
+    ),
+    'kesh_oqishlar_total': (
+        'counter', "Kesh o'qishlari (hit/miss) - hit ulushi: hit / (hit + miss)", ('natija',), None,
+    ),
+    'signal_davomiyligi_seconds': (
+        'histogram', "asosiy_app.signals qabul qiluvchilari davomiyligi", ('qabul_qiluvchi',), QISQA_VAQT_CHEGARALARI,
+    ),
+    'korish_yozish_seconds': (
+        'histogram', "Ko'rilganlar hisoblagichini bazaga yozish (so'rov ichida)", (), QISQA_VAQT_CHEGARALARI,
+    ),
+    'db_hovuz_ulanishlar': (
+        'gauge', "Ulanishlar hovuzi: band, bosh va kutayotgan oqimlar", ('baza', 'holat'), None,
+    ),
+    'db_hovuz_kutish_seconds_total': (
+        'counter', "Hovuzdan bo'sh ulanish kutishga ketgan jami vaqt", ('baza',), None,
+    ),
+    'db_hovuz_muddati_otgan_total': (
+        'counter', "Timeout gacha ulanish berilmagan so'rovlar", ('baza',), None,
+    ),
+}
+
+
+def papka():
+    return Path(getattr(settings, 'METRIKALAR_PAPKASI', settings.BASE_DIR / 'metrikalar'))
+
+
+# ============================================================================
+# REESTR (JARAYON ICHIDA)
+# ============================================================================
+
+class Reestr:
+    """
+    Joriy jarayonning metrikalari
+
+    Qiymatlar {(nom, yorliqlar): qiymat} ko'rinishida; gistogramma qiymati -
+    [chegaralar bo'yicha sonlar..., +Inf, yig'indi].
+    """
+
+    def __init__(self):
+        self._qulf = threading.Lock()
+        self._qiymatlar = {}
+        self._gistogrammalar = {}
+        self._oxirgi_yozish = 0.0
+        self._pid = None          # Fayliga yozgan jarayon (fork dan keyin - yangi jarayon)
+
+    def oshirish(self, nom, yorliqlar=(), qiymat=1):
+        kalit = (nom, yorliqlar)
+        with self._qulf:
+            self._qiymatlar[kalit] = self._qiymatlar.get(kalit, 0) + qiymat
+
+    def ornatish(self, nom, yorliqlar=(), qiymat=0):
+        with self._qulf:
+            self._qiymatlar[(nom, yorliqlar)] = qiymat
+
+    def kuzatish(self, nom, yorliqlar=(), qiymat=0):
+        chegaralar = METRIKALAR[nom][3]
+        kalit = (nom, yorliqlar)
+        raqam = bisect.bisect_left(chegaralar, qiymat)   # qiymat <= chegara bo'lgan birinchi chegara
+        with self._qulf:
+            qatorlar = self._gistogrammalar.get(kalit)
+            if qatorlar is None:
+                qatorlar = self._gistogrammalar[kalit] = [0] * (len(chegaralar) + 2)
+            qatorlar[raqam] += 1
+            qatorlar[-1] += qiymat
+
+    def qoshish(self, holat):
+        """
+        To'xtagan jarayon hisobini qo'shish (joriy qiymatlar - gauge - tashlanadi)
+        """
+        with self._qulf:
+            for nom, yorliqlar, qiymat in holat['qiymatlar']:
+                if nom in METRIKALAR and METRIKALAR[nom][0] != 'gauge':
+                    kalit = (nom, tuple(yorliqlar))
+                    self._qiymatlar[kalit] = self._qiymatlar.get(kalit, 0) + qiymat
+            for nom, yorliqlar, qatorlar in holat['gistogrammalar']:
+                if nom not in METRIKALAR or len(qatorlar) != len(METRIKALAR[nom][3]) + 2:
+                    continue  # Chegaralar o'zgargan (eski versiya fayli)
+                jami = self._gistogrammalar.setdefault((nom, tuple(yorliqlar)), [0] * len(qatorlar))
+                for raqam, son in enumerate(qatorlar):
+                    jami[raqam] += son
+
+    def holat(self):
+        """
+        JSON ga yoziladigan nusxa (joriy qiymatlar - hovuz statistikasi bilan)
+        """
+        self._hovuzlar()
+        with self._qulf:
+            return {
+                'pid': os.getpid(),
+                'qiymatlar': [[nom, list(yorliqlar), qiymat] for (nom, yorliqlar), qiymat in self._qiymatlar.items()],
+                'gistogrammalar': [
+                    [nom, list(yorliqlar), list(qatorlar)] for (nom, yorliqlar), qatorlar in self._gistogrammalar.items()
+                ],
+            }
+
+    def _hovuzlar(self):
+        for alias in connections:
+            stat = hovuz_statistikasi(connections[alias])
+            if stat is None:
+                continue
+            for holat in ('band', 'bosh', 'kutayotganlar'):
+                self.ornatish('db_hovuz_ulanishlar', (alias, holat), stat[holat])
+            self.ornatish('db_hovuz_kutish_seconds_total', (alias,), stat['kutish_ms'] / 1000)
+            self.ornatish('db_hovuz_muddati_otgan_total', (alias,), stat['muddati_otganlar'])
+
+    def tozalash(self):
+        with self._qulf:
+            self._qiymatlar.clear()
+            self._gistogrammalar.clear()
+        self._oxirgi_yozish = 0.0
+
+    def yozish(self, majburiy=False):
+        """
+        Holatni jarayon fayliga yozish (oxirgi yozishdan METRIKALAR_YOZISH_ORALIGI o'tgan bo'lsa)
+        """
+        hozir = time.monotonic()
+        if not majburiy and hozir - self._oxirgi_yozish < getattr(settings, 'METRIKALAR_YOZISH_ORALIGI', 5):
+            return
+        self._oxirgi_yozish = hozir
+        try:
+            papka().mkdir(parents=True, exist_ok=True)
+            fayl = papka() / f'{os.getpid()}.json'
+            olingan = None
+            if self._pid != os.getpid():
+                # Shu PID li to'xtagan jarayon fayli - ustiga yozishdan oldin qo'shib olinadi
+                self._pid = os.getpid()
+                olingan = _olish(fayl)
+                if olingan:
+                    self.qoshish(olingan[1])
+            vaqtinchalik = fayl.with_name(f'{fayl.name}.{threading.get_ident()}')
+            vaqtinchalik.write_text(json.dumps(self.holat()), encoding='utf-8')
+            os.replace(vaqtinchalik, fayl)
+            if olingan:
+                olingan[0].unlink(missing_ok=True)
+        except OSError:
+            # Metrika yozilmasa ham so'rov foydalanuvchiga yetib borishi kerak
+            pass
+
+
+reestr = Reestr()
+
+
+def sorov_yakunlandi(request, response, hisob):
+    """
+    So'rov metrikalari (SorovVaqtlariMiddleware chaqiradi)
+
+    Args:
+        request: HTTP so'rov obyekti
+        response: Javob
+        hisob: vaqtlar.SorovVaqtlari (tugatilgan)
+    """
+    url_nomi = getattr(request.resolver_match, 'view_name', None) or 'nomalum'
+    reestr.kuzatish(
+        'sorov_davomiyligi_seconds', (url_nomi, request.method, str(response.status_code)), hisob.jami_ms / 1000,
+    )
+    reestr.kuzatish('sorov_sql_soni', (url_nomi,), hisob.db_soni)
+    if hisob.db_ms:
+        reestr.oshirish('sql_davomiyligi_seconds_total', (url_nomi,), hisob.db_ms / 1000)
+    if hisob.kesh_hit:
+        reestr.oshirish('kesh_oqishlar_total', ('hit',), hisob.kesh_hit)
+    if hisob.kesh_miss:
+        reestr.oshirish('kesh_oqishlar_total', ('miss',), hisob.kesh_miss)
+    for nom, sekund in hisob.signallar:
+        reestr.kuzatish('signal_davomiyligi_seconds', (nom,), sekund)
+    reestr.yozish()
+
+
+@contextmanager
+def olchash(nom, yorliqlar=()):
+    """
+    Blok davomiyligini gistogrammaga yozish (METRIKALAR yoqilgan bo'lsa)
+    """
+    if not getattr(settings, 'METRIKALAR', False):
+        yield
+        return
+    boshlanish = time.perf_counter()
+    try:
+        yield
+    finally:
+        reestr.kuzatish(nom, yorliqlar, time.perf_counter() - boshlanish)
+
+
+# ============================================================================
+# YIG'ISH VA PROMETHEUS MATNI
+# ============================================================================
+
+def _tirikmi(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _olish(fayl):
+    """
+    Faylni boshqa nomga o'tkazib (atomar) o'qish
+
+    Bir vaqtda ikki worker bitta to'xtagan jarayon faylini olmoqchi bo'lsa,
+    faqat bittasi muvaffaqiyatli bo'ladi - hisob ikki marta qo'shilmaydi.
+    Olingan nom *.json ga mos kelmaydi, yig'ishda ko'rinmaydi.
+
+    Returns:
+        tuple: (yangi yo'l, holat) yoki None (fayl yo'q yoki buzilgan)
+    """
+    olingan = fayl.with_name(f'{fayl.name}.olingan.{os.getpid()}')
+    try:
+        os.rename(fayl, olingan)
+    except FileNotFoundError:
+        return None
+    try:
+        return olingan, json.loads(olingan.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        olingan.unlink(missing_ok=True)
+        return None
+
+
+def yigish():
+    """
+    Barcha jarayonlar metrikalarini qo'shish
+
+    To'xtagan jarayonlar fayllari joriy jarayon hisobiga o'tkaziladi va
+    o'chiriladi (fayl o'z faylimiz yozilgandan keyin o'chadi).
+
+    Returns:
+        tuple: ({(nom, yorliqlar): qiymat}, {(nom, yorliqlar): [gistogramma]})
+    """
+    holatlar, olinganlar = [], []
+    ozimniki = f'{os.getpid()}.json'
+    for fayl in sorted(papka().glob('*.json')) if papka().is_dir() else ():
+        if fayl.name == ozimniki:
+            continue
+        try:
+            holat = json.loads(fayl.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            continue
+        if holat['pid'] == os.getpid() or _tirikmi(holat['pid']):
+            holatlar.append(holat)
+            continue
+        olingan = _olish(fayl)
+        if olingan:
+            reestr.qoshish(olingan[1])
+            olinganlar.append(olingan[0])
+    if olinganlar:
+        reestr.yozish(majburiy=True)
+        for yol in olinganlar:
+            yol.unlink(missing_ok=True)
+    holatlar.insert(0, reestr.holat())
+
+    qiymatlar, gistogrammalar = {}, {}
+    for holat in holatlar:
+        for nom, yorliqlar, qiymat in holat['qiymatlar']:
+            if nom not in METRIKALAR:
+                continue
+            kalit = (nom, tuple(yorliqlar))
+            qiymatlar[kalit] = qiymatlar.get(kalit, 0) + qiymat
+        for nom, yorliqlar, qatorlar in holat['gistogrammalar']:
+            if nom not in METRIKALAR or len(qatorlar) != len(METRIKALAR[nom][3]) + 2:
+                continue  # Chegaralar o'zgargan (eski versiya fayli)
+            kalit = (nom, tuple(yorliqlar))
+            jami = gistogrammalar.setdefault(kalit, [0] * len(qatorlar))
+            for raqam, son in enumerate(qatorlar):
+                jami[raqam] += son
+    return qiymatlar, gistogrammalar
+
+
+def _yorliq_qiymati(qiymat):
+    return str(qiymat).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _yorliqlar(nomlar, qiymatlar, le=None):
+    juftlar = [f'{nom}="{_yorliq_qiymati(qiymat)}"' for nom, qiymat in zip(nomlar, qiymatlar)]
+    if le is not None:
+        juftlar.append(f'le="{le}"')
+    return '{' + ','.join(juftlar) + '}' if juftlar else ''
+
+
+def _son(qiymat):
+    return repr(float(qiymat)) if isinstance(qiymat, float) else str(qiymat)
+
+
+def prometheus_matni():
+    """
+    Prometheus text exposition formati (version 0.0.4)
+    """
+    qiymatlar, gistogrammalar = yigish()
+    qatorlar = []
+    for nom, (tur, tavsif, yorliq_nomlari, chegaralar) in METRIKALAR.items():
+        qatorlar.append(f'# HELP {nom} {tavsif}')
+        qatorlar.append(f'# TYPE {nom} {tur}')
+        if tur != 'histogram':
+            for (metrika, yorliqlar), qiymat in sorted(qiymatlar.items()):
+                if metrika == nom:
+                    qatorlar.append(f'{nom}{_yorliqlar(yorliq_nomlari, yorliqlar)} {_son(qiymat)}')
+            continue
+        for (metrika, yorliqlar), sonlar in sorted(gistogrammalar.items()):
+            if metrika != nom:
+                continue
+            jami = 0
+            for chegara, son in zip([*map(str, chegaralar), '+Inf'], sonlar):
+                jami += son
+                qatorlar.append(f'{nom}_bucket{_yorliqlar(yorliq_nomlari, yorliqlar, le=chegara)} {jami}')
+            qatorlar.append(f'{nom}_sum{_yorliqlar(yorliq_nomlari, yorliqlar)} {_son(sonlar[-1])}')
+            qatorlar.append(f'{nom}_count{_yorliqlar(yorliq_nomlari, yorliqlar)} {jami}')
+    return '\n'.join(qatorlar) + '\n'
+
+
+def tozalash():
+    """
+    Barcha jarayonlar fayllarini va joriy jarayon hisobini o'chirish
+    """
+    reestr.tozalash()
+    if papka().is_dir():
+        for fayl in papka().glob('*.json*'):
+            try:
+                fayl.unlink()
+            except FileNotFoundError:
+                pass
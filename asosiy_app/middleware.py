@@ -0,0 +1,419 @@
+"""
+Middleware - So'rov va javoblarni qayta ishlovchi komponentlar
+
+Bu faylda asosiy_app ilovasining middleware classlari aniqlanadi.
+Middleware'lar settings.py dagi MIDDLEWARE ro'yxatiga qo'shilgandan
+keyin har bir so'rovda ishga tushadi.
+
+Barcha middleware'lar sync va async rejimda ishlaydi (sync_capable,
+async_capable): ASGI serverida async views (asinxron_views.py) oldida
+sync middleware bo'lsa, Django har bir so'rovni oqimga o'tkazib qaytarardi.
+"""
+
+import hashlib
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.http import HttpResponse
+
+from .kesh import korish_hisoblanadimi, teglangan_kalit
+from .metrikalar import olchash, sorov_yakunlandi
+from .models import Mahsulot
+from .routers import sorov_boshlash, sorov_tugatish, yopishtirmasdan
+from .sorovlar import SorovlarHisobi, sorovlarni_kuzatish, url_byudjeti
+from .templatetags.sahifa_keshi import qismlarni_toldirish
+from .vaqtlar import hisob_boshlash, hisob_tugatish, jurnalga_yozish
+
+# ============================================================================
+# ANONIM FOYDALANUVCHILAR UCHUN SAHIFA KESHI
+# ============================================================================
+
+# Sahifa tarkibiga ta'sir qiluvchi teglar.
+# Ulardan biri bekor qilinsa (signallar orqali), barcha keshlangan
+# sahifalar eskiradi.
+SAHIFA_KESHI_TEGLARI = ('mahsulot', 'kategoriya', 'sharh')
+
+
+class SahifaKeshiMiddleware:
+    """
+    Anonim foydalanuvchilarning katalog sahifalarini to'liq keshlash
+
+    Trafikning katta qismi tizimga kirmagan foydalanuvchilardan keladi
+    va ular bir xil sahifalarni ko'radi. Bu middleware shunday sahifalarni
+    (SAHIFA_KESHI_URL_NOMLARI) bir marta render qilib, keshdan beradi.
+
+    Foydalanuvchiga xos qismlar (xabarlar, menyu, CSRF token) keshga
+    yozilmaydi: ular {% shaxsiy_qism %} tegi orqali belgi bilan
+    almashtiriladi va har bir javobda alohida to'ldiriladi.
+
+    MIDDLEWARE ro'yxatida AuthenticationMiddleware va MessageMiddleware
+    dan keyin turishi kerak.
+
+    X-Sahifa-Keshi sarlavhasi: HIT - keshdan, MISS - render qilindi va
+    keshga yozildi, BYPASS - render qilindi, lekin keshga yozilmadi
+    (foydalanuvchiga xos javob).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if getattr(request, 'sahifa_keshlanmoqda', False):
+            self._keshga_yozish(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if getattr(request, 'sahifa_keshlanmoqda', False):
+            # Kesh va shaxsiy qismlarni to'ldirish (shablon teglari) - sync kod
+            await sync_to_async(self._keshga_yozish)(request, response)
+        return response
+
+    def _keshga_yozish(self, request, response):
+        """
+        Javobni keshga yozish (mumkin bo'lsa) va belgilarni to'ldirish
+        """
+        request.sahifa_keshlanmoqda = False
+        if self._keshlash_mumkinmi(request, response):
+            html = response.content.decode(response.charset)
+            cache.set(
+                request.sahifa_kesh_kaliti,
+                (response['Content-Type'], html),
+                getattr(settings, 'SAHIFA_KESHI_MUDDATI', 300),
+            )
+            self._toldirish(response, html, request)
+            response['X-Sahifa-Keshi'] = 'MISS'
+            return
+        if not response.streaming:
+            # Keshlanmaydigan javobda ham belgilar qolmasligi kerak
+            self._toldirish(response, response.content.decode(response.charset), request)
+        response['X-Sahifa-Keshi'] = 'BYPASS'
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """
+        View chaqirilishidan oldin: keshdan javob berish yoki keshlashni belgilash
+        """
+        if request.method not in ('GET', 'HEAD'):
+            return None
+
+        url_nomi = request.resolver_match.url_name
+        if url_nomi not in getattr(settings, 'SAHIFA_KESHI_URL_NOMLARI', ()):
+            return None
+
+        # Sessiya cookie si bo'lmasa - foydalanuvchi aniq anonim (DB so'rovsiz).
+        # Cookie bo'lsa, foydalanuvchini tekshirishga to'g'ri keladi.
+        sessiya_bor = settings.SESSION_COOKIE_NAME in request.COOKIES
+        if sessiya_bor and request.user.is_authenticated:
+            return None
+
+        kalit = self._kesh_kaliti(request)
+        keshlangan = cache.get(kalit)
+
+        if keshlangan is not None:
+            if korish_hisoblanadimi(request):
+                self._korishni_hisoblash(url_nomi, view_kwargs)
+            content_type, html = keshlangan
+            response = HttpResponse(content_type=content_type)
+            self._toldirish(response, html, request)
+            response['X-Sahifa-Keshi'] = 'HIT'
+            return response
+
+        # Faqat sessiyasiz GET so'rovdan keshga yoziladi: bunday
+        # so'rovda sahifa tarkibi boshqa foydalanuvchiga xos bo'lmaydi
+        if request.method == 'GET' and not sessiya_bor:
+            request.sahifa_keshlanmoqda = True
+            request.sahifa_kesh_kaliti = kalit
+        return None
+
+    def _kesh_kaliti(self, request):
+        """
+        So'rov yo'li (query string bilan) va teg versiyalaridan kalit yasash
+        """
+        yol = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        return teglangan_kalit(f'sahifa:{yol}', SAHIFA_KESHI_TEGLARI)
+
+    def _keshlash_mumkinmi(self, request, response):
+        """
+        Javob barcha foydalanuvchilar uchun bir xilmi?
+
+        - Faqat 200 status, oddiy (streaming bo'lmagan) javoblar
+        - View cookie o'rnatmagan, sessiyaga yozmagan va yangi xabar
+          (messages) qo'shmagan bo'lishi kerak
+        - Sahifada teshiksiz {% csrf_token %} bo'lmasligi kerak
+
+        Sessiyani o'qish mumkin: keshga faqat sessiya cookie si yo'q
+        so'rovlar yoziladi, ularning sessiyasi esa bo'sh.
+        """
+        if response.status_code != 200 or response.streaming:
+            return False
+        if response.cookies:
+            return False
+        if getattr(request, 'session', None) is not None and request.session.modified:
+            return False
+        if getattr(getattr(request, '_messages', None), 'added_new', False):
+            return False
+        if request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+            return False
+        return True
+
+    def _toldirish(self, response, html, request):
+        """
+        Belgilarni joriy foydalanuvchi uchun to'ldirib, javob tanasiga yozish
+        """
+        response.content = qismlarni_toldirish(html, request)
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
+
+    def _korishni_hisoblash(self, url_nomi, view_kwargs):
+        """
+        Keshdan berilgan mahsulot sahifasi uchun ko'rilganlar sonini oshirish
+
+        View chaqirilmagani uchun MahsulotDetailView.get_object ishlamaydi.
+        F() ifodasi bilan bitta UPDATE so'rovi yuboriladi (SELECT siz).
+        """
+        if url_nomi == 'mahsulot_batafsil':
+            with yopishtirmasdan(), olchash('korish_yozish_seconds'):
+                Mahsulot.objects.filter(slug=view_kwargs.get('slug')).update(
+                    korilganlar_soni=F('korilganlar_soni') + 1
+                )
+
+
+# ============================================================================
+# O'QISH REPLIKALARI: "O'Z YOZGANINGNI O'QI"
+# ============================================================================
+
+# Oxirgi yozish vaqti saqlanadigan cookie
+REPLIKA_COOKIE_NOMI = 'asosiy_baza'
+
+
+class ReplikaYopishishMiddleware:
+    """
+    Yozishdan keyin foydalanuvchini asosiy bazaga "yopishtirish"
+
+    - GET/HEAD so'rovlardagi katalog o'qishlari replikaga boradi (routers.py)
+    - POST va boshqa o'zgartiruvchi so'rovlar boshidanoq asosiy bazadan
+      o'qiydi (eskirgan ma'lumot ustidan yozib yubormaslik uchun)
+    - So'rov davomida yozish bo'lsa, javobga cookie qo'yiladi va keyingi
+      REPLIKA_YOPISHISH_MUDDATI sekund ichida shu brauzer so'rovlari ham
+      asosiy bazadan o'qiydi - replika kechiksa ham foydalanuvchi o'z
+      sharhini, buyurtmasini va h.k. darhol ko'radi
+
+    Replikalar sozlanmagan bo'lsa, hech narsa qilmaydi.
+    MIDDLEWARE ro'yxatining boshida turishi kerak (sessiya va
+    autentifikatsiya so'rovlari ham qamrab olinishi uchun).
+
+    Holat ContextVar da saqlanadi (routers.py) - async rejimda ham har
+    bir so'rov o'z holatiga ega, sync_to_async oqimlari uni ko'radi.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not getattr(settings, 'REPLIKA_BAZALAR', None):
+            return self.get_response(request)
+
+        muddat = getattr(settings, 'REPLIKA_YOPISHISH_MUDDATI', 5)
+        token = sorov_boshlash(self._asosiymi(request, muddat))
+        try:
+            response = self.get_response(request)
+        finally:
+            yozildi = sorov_tugatish(token)
+        return self._cookie_qoyish(response, yozildi, muddat)
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'REPLIKA_BAZALAR', None):
+            return await self.get_response(request)
+
+        muddat = getattr(settings, 'REPLIKA_YOPISHISH_MUDDATI', 5)
+        token = sorov_boshlash(self._asosiymi(request, muddat))
+        try:
+            response = await self.get_response(request)
+        finally:
+            yozildi = sorov_tugatish(token)
+        return self._cookie_qoyish(response, yozildi, muddat)
+
+    def _asosiymi(self, request, muddat):
+        """
+        So'rov boshidanoq asosiy bazadan o'qishi kerakmi
+        """
+        return request.method not in ('GET', 'HEAD', 'OPTIONS') or self._yaqinda_yozganmi(request, muddat)
+
+    def _cookie_qoyish(self, response, yozildi, muddat):
+        """
+        So'rov davomida yozish bo'lsa - keyingi so'rovlar uchun cookie
+        """
+        if yozildi:
+            response.set_cookie(
+                REPLIKA_COOKIE_NOMI, str(int(time.time())),
+                max_age=muddat, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def _yaqinda_yozganmi(self, request, muddat):
+        """
+        Cookie dagi oxirgi yozish vaqti muddat ichidami
+        """
+        try:
+            oxirgi_yozish = int(request.COOKIES[REPLIKA_COOKIE_NOMI])
+        except (KeyError, ValueError):
+            return False
+        return time.time() - oxirgi_yozish < muddat
+
+
+# ============================================================================
+# SQL SO'ROVLAR BYUDJETI VA N+1 ANIQLASH
+# ============================================================================
+
+class SorovByudjetiMiddleware:
+    """
+    Har bir view uchun SQL so'rovlar sonini byudjet bilan solishtirish
+
+    SOROV_BYUDJETI_REJIMI:
+    - None  - o'chirilgan (ishlab chiqarish)
+    - 'log' - byudjet oshsa yoki N+1 aniqlansa, hisobot logga yoziladi
+    - 'xato' - SorovByudjetiOshdi xatosi (testlarda regressiyani to'xtatish uchun)
+
+    Byudjetlar URL nomi bo'yicha: SOROV_BYUDJETI = {'mahsulotlar': 6, '*': 20}
+    Javobga X-Sorovlar-Soni sarlavhasi qo'shiladi.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        rejim = getattr(settings, 'SOROV_BYUDJETI_REJIMI', None)
+        if not rejim:
+            return self.get_response(request)
+
+        hisob = SorovlarHisobi()
+        with sorovlarni_kuzatish(hisob):
+            response = self.get_response(request)
+        return self._tekshirish(request, response, hisob, rejim)
+
+    async def __acall__(self, request):
+        rejim = getattr(settings, 'SOROV_BYUDJETI_REJIMI', None)
+        if not rejim:
+            return await self.get_response(request)
+
+        # Ulanishlar oqimga bog'langan: execute_wrapper lar so'rovning ORM
+        # chaqiruvlari bajariladigan oqimda (sync_to_async) o'rnatiladi
+        hisob = SorovlarHisobi()
+        stek = ExitStack()
+        await sync_to_async(stek.enter_context)(sorovlarni_kuzatish(hisob))
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stek.close)()
+        return self._tekshirish(request, response, hisob, rejim)
+
+    def _tekshirish(self, request, response, hisob, rejim):
+        """
+        Hisobni byudjet bilan solishtirish va sarlavha qo'shish
+        """
+        url_nomi = getattr(request.resolver_match, 'url_name', None)
+        hisob.chegara = url_byudjeti(url_nomi)
+        hisob.nom = f'{request.method} {request.path} ({url_nomi})'
+        response['X-Sorovlar-Soni'] = str(hisob.soni)
+        hisob.tekshirish(rejim)
+        return response
+
+
+# ============================================================================
+# SO'ROV FAZALARI VAQTI (SERVER-TIMING)
+# ============================================================================
+
+class SorovVaqtlariMiddleware:
+    """
+    So'rov vaqti qayerga ketganini Server-Timing sarlavhasida ko'rsatish
+
+    SQL, shablon render, kesh (hit/miss) va asosiy_app.signals qabul
+    qiluvchilari vaqti vaqtlar.py dagi o'lchagichlar orqali yig'iladi.
+
+    - SOROV_VAQTLARI: Server-Timing sarlavhasi (brauzer devtools da ko'rinadi;
+      ichki ma'lumot - ishlab chiqarishda o'chiriladi)
+    - SOROV_VAQTLARI_JURNALI: har bir so'rov uchun URL nomi bilan JSON qator
+      'asosiy_app.vaqtlar' loggeriga
+    - METRIKALAR: xuddi shu hisob Prometheus metrikalariga (metrikalar.py, /metrics)
+
+    MIDDLEWARE ro'yxatining eng boshida turishi kerak (sessiya,
+    autentifikatsiya va sahifa keshi ham jami vaqtga kirishi uchun).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._yoqilganmi():
+            return self.get_response(request)
+
+        hisob, token = hisob_boshlash()
+        try:
+            response = self.get_response(request)
+        finally:
+            hisob_tugatish(token)
+        return self._yozish(request, response, hisob)
+
+    async def __acall__(self, request):
+        if not self._yoqilganmi():
+            return await self.get_response(request)
+
+        # ContextVar sync_to_async oqimlariga ham o'tadi - ORM va shablonlar
+        # qaysi oqimda bajarilsa ham shu hisobga yozadi
+        hisob, token = hisob_boshlash()
+        try:
+            response = await self.get_response(request)
+        finally:
+            hisob_tugatish(token)
+        return self._yozish(request, response, hisob)
+
+    def _yoqilganmi(self):
+        return (
+            getattr(settings, 'SOROV_VAQTLARI', False)
+            or getattr(settings, 'SOROV_VAQTLARI_JURNALI', False)
+            or getattr(settings, 'METRIKALAR', False)
+        )
+
+    def _yozish(self, request, response, hisob):
+        hisob.tugatish()
+        if getattr(settings, 'SOROV_VAQTLARI', False):
+            oldingi = response.get('Server-Timing')
+            response['Server-Timing'] = f'{oldingi}, {hisob.sarlavha()}' if oldingi else hisob.sarlavha()
+        if getattr(settings, 'SOROV_VAQTLARI_JURNALI', False):
+            jurnalga_yozish(request, response, hisob)
+        if getattr(settings, 'METRIKALAR', False):
+            sorov_yakunlandi(request, response, hisob)
+        return response
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asosiy_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mahsulot',
+            name='versiya',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Versiya'),
+        ),
+        migrations.CreateModel(
+            name='Buyurtma',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('holat', models.CharField(choices=[('yangi', 'Yangi'), ('tolandi', "To'landi"), ('yetkazildi', 'Yetkazildi'), ('bekor', 'Bekor qilindi')], default='yangi', max_length=20, verbose_name='Holat')),
+                ('jami', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Jami summa')),
+                ('yaratilgan_sana', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan sana')),
+                ('foydalanuvchi', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='buyurtmalar', to=settings.AUTH_USER_MODEL, verbose_name='Foydalanuvchi')),
+            ],
+            options={
+                'verbose_name': 'Buyurtma',
+                'verbose_name_plural': 'Buyurtmalar',
+                'ordering': ['-yaratilgan_sana'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BuyurtmaQatori',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nomi', models.CharField(max_length=200, verbose_name='Mahsulot nomi')),
+                ('narx', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Narx')),
+                ('miqdor', models.PositiveIntegerField(verbose_name='Miqdor')),
+                ('buyurtma', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='qatorlar', to='asosiy_app.buyurtma', verbose_name='Buyurtma')),
+                ('mahsulot', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='buyurtma_qatorlari', to='asosiy_app.mahsulot', verbose_name='Mahsulot')),
+            ],
+            options={
+                'verbose_name': 'Buyurtma qatori',
+                'verbose_name_plural': 'Buyurtma qatorlari',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='buyurtma',
+            index=models.Index(fields=['foydalanuvchi', '-yaratilgan_sana'], name='asosiy_app__foydala_cf22f5_idx'),
+        ),
+    ]
@@ -9,7 +9,9 @@ Django ORM (Object-Relational Mapping) orqali SQL yozmasdan
 ma'lumotlar bazasi bilan ishlash mumkin.
 """
 
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Now
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
@@ -101,6 +103,167 @@ class Kategoriya(models.Model):
     mahsulotlar_soni.short_description = "Mahsulotlar soni"
 
 
+# ============================================================================
+# OMBOR AMALLARI (MIQDORNI ATOMAR O'ZGARTIRISH)
+# ============================================================================
+
+class MiqdorYetarliEmas(Exception):
+    """
+    Omborda so'ralgan miqdor yo'q - band qilish bekor qilindi
+
+    Attributes:
+        yetishmaydi: {mahsulot_id: ombordagi miqdor} - yetmagan mahsulotlar
+            (bazada yo'q mahsulot uchun 0)
+    """
+
+    def __init__(self, yetishmaydi):
+        self.yetishmaydi = yetishmaydi
+        super().__init__(f"Omborda yetarli emas: {yetishmaydi}")
+
+
+class VersiyaEskirgan(Exception):
+    """
+    Mahsulot o'qilgandan keyin o'zgargan (narx, nom va h.k.) - band qilinmadi
+
+    Chaqiruvchi mahsulotni qayta o'qib, amalni takrorlashi kerak.
+
+    Attributes:
+        idlar: Versiyasi mos kelmagan mahsulotlar id lari
+    """
+
+    def __init__(self, idlar):
+        self.idlar = idlar
+        super().__init__(f"Mahsulot o'zgargan: {sorted(idlar)}")
+
+
+def _talablarni_tekshirish(talablar):
+    """
+    {mahsulot_id: miqdor} ni tekshirish - miqdorlar musbat butun son
+    """
+    talablar = {int(mahsulot_id): int(soni) for mahsulot_id, soni in talablar.items()}
+    if not talablar:
+        raise ValueError("Kamida bitta mahsulot kerak")
+    if min(talablar.values()) <= 0:
+        raise ValueError("Miqdor musbat bo'lishi kerak")
+    return talablar
+
+
+def _qator_qiymati(qiymatlar):
+    """
+    Har bir qator uchun o'z qiymati: CASE id WHEN 1 THEN 2 WHEN 5 THEN 1 END
+    """
+    if len(qiymatlar) == 1:
+        return Value(next(iter(qiymatlar.values())))
+    return Case(
+        *[When(id=mahsulot_id, then=Value(qiymat)) for mahsulot_id, qiymat in qiymatlar.items()],
+        output_field=models.PositiveIntegerField(),
+    )
+
+
+class MahsulotQuerySet(models.QuerySet):
+    """
+    Mahsulotlar uchun qo'shimcha so'rov metodlari - ombor amallari
+
+    Miqdor Python da o'qib-o'zgartirib saqlanmaydi (bir vaqtdagi xaridlarda
+    o'zgarishlar yo'qolardi): har bir amal - bitta shartli UPDATE, miqdor
+    va holat bazaning o'zida hisoblanadi, qator qulfi faqat shu so'rov
+    davomida ushlanadi.
+
+        Mahsulot.objects.band_qilish({mahsulot.id: 2})          # sotib olish
+        Mahsulot.objects.band_qilish({1: 2, 5: 1})               # savat - hammasi yoki hech biri
+        Mahsulot.objects.qaytarish({1: 2})                       # buyurtma bekor qilindi
+        Mahsulot.objects.toldirish({1: 100})                     # yangi partiya keldi
+
+    update() signallarni chaqirmaydi - kesh teglari shu yerda e'lon qilinadi.
+    """
+
+    def _teglar(self, talablar):
+        from .kesh import teglar_ozgardi   # kesh.py bu modulni import qiladi
+        teglar_ozgardi(['mahsulot', *(f'mahsulot:{mahsulot_id}' for mahsulot_id in talablar)])
+
+    def band_qilish(self, talablar, versiyalar=None):
+        """
+        Mahsulotlarni omborda band qilish (miqdorni kamaytirish)
+
+        Bitta so'rov:
+            UPDATE mahsulot
+            SET holat = CASE WHEN holat = 'mavjud' AND miqdor = <n> THEN 'tugagan' ELSE holat END,
+                miqdor = miqdor - <n>
+            WHERE id IN (...) AND miqdor >= <n>
+
+        holat miqdordan OLDIN yoziladi: MySQL SET dagi ifodalarni chapdan
+        o'ngga, yangilangan qiymatlar bilan hisoblaydi.
+
+        versiyalar berilsa, WHERE ga "AND versiya = <v>" qo'shiladi: mahsulot
+        o'qilgandan keyin tahrirlangan bo'lsa (masalan, narxi), hech narsa
+        band qilinmaydi. Miqdorning o'zgarishi versiyani oshirmaydi - bir
+        vaqtdagi xaridorlar bir-biriga xalaqit bermaydi.
+
+        Args:
+            talablar: {mahsulot_id: miqdor}
+            versiyalar: {mahsulot_id: o'qilgan versiya} (ixtiyoriy)
+
+        Raises:
+            MiqdorYetarliEmas: Birorta mahsulot yetmasa - hech biri band qilinmaydi
+            VersiyaEskirgan: Birorta mahsulot versiyasi o'zgargan bo'lsa
+            ValueError: Miqdor musbat bo'lmasa
+        """
+        talablar = _talablarni_tekshirish(talablar)
+        kerak = _qator_qiymati(talablar)
+        qatorlar = self.filter(id__in=talablar, miqdor__gte=kerak)
+        if versiyalar is not None:
+            qatorlar = qatorlar.filter(versiya=_qator_qiymati({i: versiyalar[i] for i in talablar}))
+        try:
+            with transaction.atomic(using=router.db_for_write(self.model)):
+                yangilandi = qatorlar.update(
+                    holat=Case(When(holat='mavjud', miqdor=kerak, then=Value('tugagan')), default=F('holat')),
+                    miqdor=F('miqdor') - kerak,
+                    yangilangan_sana=Now(),
+                )
+                if yangilandi != len(talablar):
+                    raise MiqdorYetarliEmas({})   # Qisman band qilinganlar bekor qilinadi
+        except MiqdorYetarliEmas:
+            mavjud = {i: (miqdor, versiya) for i, miqdor, versiya in
+                      self.filter(id__in=talablar).values_list('id', 'miqdor', 'versiya')}
+            yetishmaydi = {
+                mahsulot_id: mavjud.get(mahsulot_id, (0, None))[0]
+                for mahsulot_id, soni in talablar.items() if mavjud.get(mahsulot_id, (0, None))[0] < soni
+            }
+            if yetishmaydi or versiyalar is None:
+                raise MiqdorYetarliEmas(yetishmaydi)
+            raise VersiyaEskirgan({i for i in talablar if mavjud[i][1] != versiyalar[i]})
+        self._teglar(talablar)
+
+    def toldirish(self, talablar):
+        """
+        Omborga miqdor qo'shish ('tugagan' mahsulot yana 'mavjud' bo'ladi)
+
+        Args:
+            talablar: {mahsulot_id: qo'shiladigan miqdor}
+
+        Returns:
+            int: Yangilangan mahsulotlar soni
+        """
+        talablar = _talablarni_tekshirish(talablar)
+        qoshiladi = _qator_qiymati(talablar)
+        yangilandi = self.filter(id__in=talablar).update(
+            holat=Case(When(holat='tugagan', then=Value('mavjud')), default=F('holat')),
+            miqdor=F('miqdor') + qoshiladi,
+            yangilangan_sana=Now(),
+        )
+        self._teglar(talablar)
+        return yangilandi
+
+    def qaytarish(self, talablar):
+        """
+        Band qilingan miqdorni omborga qaytarish (buyurtma bekor qilinganda)
+
+        toldirish() bilan bir xil so'rov - alohida nom chaqiruvchi kodni
+        o'qishni osonlashtiradi.
+        """
+        return self.toldirish(talablar)
+
+
 # ============================================================================
 # MAHSULOT MODELI
 # ============================================================================
@@ -264,6 +427,16 @@ class Mahsulot(models.Model):
         verbose_name="Yangilangan sana"
     )
     
+    # Versiya - har bir saqlashda oshadi (qarang: save). Buyurtma berishda
+    # narx o'qilgandan keyin o'zgarmaganini tekshirish uchun (optimistik qulflash)
+    versiya = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Versiya"
+    )
+    
+    objects = MahsulotQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Mahsulot"
         verbose_name_plural = "Mahsulotlar"
@@ -276,6 +449,21 @@ class Mahsulot(models.Model):
     def __str__(self):
         return self.nomi
     
+    def save(self, *args, **kwargs):
+        """
+        Saqlashda versiyani oshirish
+
+        Faqat ko'rilganlar soni yozilganda oshmaydi. Ombor amallari
+        (band_qilish, toldirish) update() bilan ishlaydi - ular ham
+        versiyaga tegmaydi.
+        """
+        update_fields = kwargs.get('update_fields')
+        if not self._state.adding and (update_fields is None or set(update_fields) - {'korilganlar_soni'}):
+            self.versiya += 1
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'versiya'}
+        super().save(*args, **kwargs)
+    
     def chegirma_foizi(self):
         """
         Chegirma foizini hisoblash
@@ -302,6 +490,23 @@ class Mahsulot(models.Model):
 # SHARH MODELI
 # ============================================================================
 
+class SharhQuerySet(models.QuerySet):
+    """
+    Sharhlar uchun qo'shimcha so'rov metodlari
+    """
+
+    def tasdiqlangan(self):
+        """
+        Faqat tasdiqlangan (moderatsiyadan o'tgan) sharhlar
+
+        Bu sharhlar faqat ko'rsatish uchun - ular o'qish replikasidan
+        olinishi mumkin (routers.py, 'replikadan' ishorasi).
+        """
+        queryset = self.filter(tasdiqlangan=True)
+        queryset._add_hints(replikadan=True)
+        return queryset
+
+
 class Sharh(models.Model):
     """
     Sharh modeli - foydalanuvchilar mahsulotlarga sharh qoldirishi uchun
@@ -348,7 +553,9 @@ class Sharh(models.Model):
         auto_now_add=True,
         verbose_name="Yaratilgan sana"
     )
-    
+
+    objects = SharhQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Sharh"
         verbose_name_plural = "Sharhlar"
@@ -498,3 +705,115 @@ class Profil(models.Model):
                 yosh -= 1
             return yosh
         return None
+
+
+# ============================================================================
+# BUYURTMA MODELLARI
+# ============================================================================
+
+class Buyurtma(models.Model):
+    """
+    Buyurtma modeli - savatdan rasmiylashtirilgan xarid
+
+    Buyurtma faqat savat.buyurtma_berish() orqali yaratiladi: mahsulotlar
+    omborda band qilinadi va narxlar qatorlarga yozib qo'yiladi.
+    """
+    
+    HOLAT_TANLOVI = [
+        ('yangi', 'Yangi'),
+        ('tolandi', "To'landi"),
+        ('yetkazildi', 'Yetkazildi'),
+        ('bekor', 'Bekor qilindi'),
+    ]
+    
+    # Buyurtmachi - foydalanuvchi o'chirilsa ham buyurtma qoladi
+    foydalanuvchi = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='buyurtmalar',
+        verbose_name="Foydalanuvchi"
+    )
+    
+    holat = models.CharField(
+        max_length=20,
+        choices=HOLAT_TANLOVI,
+        default='yangi',
+        verbose_name="Holat"
+    )
+    
+    # Jami summa - qatorlar narxlaridan buyurtma paytida hisoblanadi
+    jami = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        verbose_name="Jami summa"
+    )
+    
+    yaratilgan_sana = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Yaratilgan sana"
+    )
+    
+    class Meta:
+        verbose_name = "Buyurtma"
+        verbose_name_plural = "Buyurtmalar"
+        ordering = ['-yaratilgan_sana']
+        indexes = [
+            models.Index(fields=['foydalanuvchi', '-yaratilgan_sana']),  # Profildagi buyurtmalar
+        ]
+    
+    def __str__(self):
+        return f"Buyurtma #{self.pk}"
+
+
+class BuyurtmaQatori(models.Model):
+    """
+    Buyurtmadagi bitta mahsulot
+
+    Nomi va narxi buyurtma paytidagi holatda saqlanadi - mahsulot keyin
+    tahrirlansa yoki o'chirilsa ham buyurtma o'zgarmaydi.
+    """
+    
+    buyurtma = models.ForeignKey(
+        Buyurtma,
+        on_delete=models.CASCADE,
+        related_name='qatorlar',
+        verbose_name="Buyurtma"
+    )
+    
+    mahsulot = models.ForeignKey(
+        Mahsulot,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='buyurtma_qatorlari',
+        verbose_name="Mahsulot"
+    )
+    
+    # Buyurtma paytidagi nom va narx (joriy_narx - chegirma bo'lsa, chegirma narxi)
+    nomi = models.CharField(
+        max_length=200,
+        verbose_name="Mahsulot nomi"
+    )
+    
+    narx = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        verbose_name="Narx"
+    )
+    
+    miqdor = models.PositiveIntegerField(
+        verbose_name="Miqdor"
+    )
+    
+    class Meta:
+        verbose_name = "Buyurtma qatori"
+        verbose_name_plural = "Buyurtma qatorlari"
+    
+    def __str__(self):
+        return f"{self.nomi} x {self.miqdor}"
+    
+    def summa(self):
+        """
+        Qator summasi (narx x miqdor)
+        """
+        return self.narx * self.miqdor
@@ -0,0 +1,64 @@
+"""
+Parollar - sozlanadigan parol hasherlari
+
+Django ning standart PBKDF2 hasheri har bir kirishda ~1 000 000 marta
+SHA256 hisoblaydi - ilovadagi eng qimmat (CPU) amal. Bu yerdagi hasherlar
+parametrlarini settings dan oladi (PAROL_SCRYPT, PAROL_ARGON2), shuning
+uchun xavfsizlik va tezlik orasidagi muvozanatni kodni o'zgartirmasdan
+sozlash mumkin.
+
+Profil settings.PAROL_PROFILI bilan tanlanadi. Eski profildagi (yoki eski
+parametrli) parollar foydalanuvchi keyingi marta kirganda avtomatik
+yangi hasherga o'tkaziladi: Django check_password() da must_update()
+True bo'lsa, parol qayta hashlab saqlanadi.
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+
+class SozlanganScryptHasher(ScryptPasswordHasher):
+    """
+    scrypt - Python standart kutubxonasida (hashlib), qo'shimcha paketsiz
+
+    settings.PAROL_SCRYPT: work_factor (N), block_size (r), parallelism (p).
+    Xotira sarfi: 128 * N * r bayt (N=2**14, r=8 - 16 MB).
+    """
+
+    @property
+    def work_factor(self):
+        return settings.PAROL_SCRYPT['work_factor']
+
+    @property
+    def block_size(self):
+        return settings.PAROL_SCRYPT['block_size']
+
+    @property
+    def parallelism(self):
+        return settings.PAROL_SCRYPT['parallelism']
+
+    @property
+    def maxmem(self):
+        # OpenSSL standart chegarasi 32 MB - katta N uchun zaxira bilan oshiriladi
+        return 2 * 128 * self.work_factor * self.block_size
+
+
+class SozlanganArgon2Hasher(Argon2PasswordHasher):
+    """
+    Argon2id - argon2-cffi paketini talab qiladi
+
+    settings.PAROL_ARGON2: time_cost (iteratsiyalar), memory_cost (KiB),
+    parallelism (oqimlar).
+    """
+
+    @property
+    def time_cost(self):
+        return settings.PAROL_ARGON2['time_cost']
+
+    @property
+    def memory_cost(self):
+        return settings.PAROL_ARGON2['memory_cost']
+
+    @property
+    def parallelism(self):
+        return settings.PAROL_ARGON2['parallelism']
@@ -0,0 +1,219 @@
+"""
+Routers - Ma'lumotlar bazasi routerlari
+
+Bu faylda so'rovlarni qaysi ma'lumotlar bazasiga yuborish kerakligini
+belgilovchi router aniqlanadi (settings.py dagi DATABASE_ROUTERS).
+
+O'qish replikalari:
+- Yozishlar har doim asosiy bazaga ('default') yuboriladi
+- Katalog o'qishlari (Mahsulot, Kategoriya, tasdiqlangan Sharh)
+  replikalardan biriga yuboriladi
+- "O'z yozganingni o'qi" (read-your-writes): so'rov davomida yozish
+  bo'lsa, so'rovning qolgan qismi va shu foydalanuvchining keyingi
+  REPLIKA_YOPISHISH_MUDDATI sekund ichidagi so'rovlari asosiy bazadan
+  o'qiydi (replikaga ma'lumot kechikib yetib borishi mumkin)
+
+Replikalar sozlanmagan bo'lsa (REPLIKA_BAZALAR bo'sh), router hech
+narsaga aralashmaydi - barcha so'rovlar 'default' ga boradi.
+"""
+
+import itertools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from .models import Mahsulot, Kategoriya, Sharh
+
+# Replikadan o'qilishi mumkin bo'lgan modellar
+# (Sharh - faqat Sharh.objects.tasdiqlangan() orqali)
+REPLIKA_MODELLARI = (Mahsulot, Kategoriya)
+
+# ============================================================================
+# SO'ROV HOLATI
+# ============================================================================
+
+class _BazaHolati:
+    """
+    Bitta so'rov (yoki asosiy_bazadan() bloki) davomidagi holat
+    """
+    __slots__ = ('asosiy', 'yozildi', 'replika')
+
+    def __init__(self, asosiy=False):
+        self.asosiy = asosiy    # True - barcha o'qishlar asosiy bazadan
+        self.yozildi = False    # So'rov davomida yozish bo'ldimi
+        self.replika = None     # So'rov uchun tanlangan replika
+
+
+# Har bir oqim / asyncio vazifasi o'z holatiga ega
+_holat = ContextVar('baza_holati', default=None)
+
+
+def sorov_boshlash(asosiy=False):
+    """
+    So'rov boshida chaqiriladi (ReplikaYopishishMiddleware)
+
+    Args:
+        asosiy: True bo'lsa, so'rov boshidanoq asosiy bazadan o'qiydi
+
+    Returns:
+        Token - sorov_tugatish() ga berilishi kerak
+    """
+    return _holat.set(_BazaHolati(asosiy))
+
+
+def sorov_tugatish(token):
+    """
+    So'rov oxirida chaqiriladi
+
+    Returns:
+        bool: So'rov davomida ma'lumot yozildimi
+    """
+    holat = _holat.get()
+    _holat.reset(token)
+    if holat is None:
+        return False
+    if holat.replika is not None:
+        _tanlovchi.qaytarish(holat.replika)
+    return holat.yozildi
+
+
+@contextmanager
+def asosiy_bazadan():
+    """
+    Blok ichidagi barcha o'qishlarni asosiy bazaga yo'naltirish
+
+    Masalan, keshni qayta qurishda: replika hali yangi ma'lumotni
+    olmagan bo'lsa, eski ma'lumot yangi versiya ostida keshlanib qolardi.
+
+        with asosiy_bazadan():
+            blokni_qurish(nom)
+    """
+    token = _holat.set(_BazaHolati(asosiy=True))
+    try:
+        yield
+    finally:
+        _holat.reset(token)
+
+
+@contextmanager
+def yopishtirmasdan():
+    """
+    Blok ichidagi yozishlar so'rovni asosiy bazaga yopishtirmaydi
+
+    Ko'rilganlar soni kabi hisoblagichlar uchun: ular har bir sahifada
+    yoziladi, lekin foydalanuvchi ularni "o'qib" tekshirmaydi.
+    """
+    holat = _holat.get()
+    oldingi = holat.yozildi if holat is not None else False
+    try:
+        yield
+    finally:
+        if holat is not None:
+            holat.yozildi = oldingi
+
+
+# ============================================================================
+# REPLIKA TANLASH
+# ============================================================================
+
+class _ReplikaTanlovchi:
+    """
+    Replikani tanlash strategiyasi (REPLIKA_TANLASH sozlamasi)
+
+    - 'round_robin' - navbat bilan
+    - 'kam_ulanish' - shu jarayonda eng kam faol so'rovga ega replika
+    """
+
+    def __init__(self):
+        self._qulf = threading.Lock()
+        self._navbat = None
+        self._navbat_uchun = None
+        self._faol = {}
+
+    def tanlash(self):
+        replikalar = tuple(settings.REPLIKA_BAZALAR)
+        with self._qulf:
+            if getattr(settings, 'REPLIKA_TANLASH', 'round_robin') == 'kam_ulanish':
+                replika = min(replikalar, key=lambda alias: self._faol.get(alias, 0))
+            else:
+                if self._navbat_uchun != replikalar:
+                    self._navbat = itertools.cycle(replikalar)
+                    self._navbat_uchun = replikalar
+                replika = next(self._navbat)
+            self._faol[replika] = self._faol.get(replika, 0) + 1
+        return replika
+
+    def qaytarish(self, replika):
+        with self._qulf:
+            self._faol[replika] = max(self._faol.get(replika, 0) - 1, 0)
+
+
+_tanlovchi = _ReplikaTanlovchi()
+
+
+def oqish_bazasi():
+    """
+    Joriy holatda katalog o'qishlari uchun baza nomi
+
+    Returns:
+        str: 'default' yoki replika nomi
+    """
+    if not getattr(settings, 'REPLIKA_BAZALAR', None):
+        return 'default'
+
+    holat = _holat.get()
+    if holat is None or holat.asosiy or holat.yozildi:
+        # So'rovdan tashqarida (buyruqlar, signallar, fon oqimlari) kod
+        # o'qigan ma'lumot asosida yozishi mumkin - asosiy bazadan o'qiladi
+        return 'default'
+
+    # Bitta so'rov davomida bitta replika ishlatiladi (izchil natijalar uchun)
+    if holat.replika is None:
+        holat.replika = _tanlovchi.tanlash()
+    return holat.replika
+
+
+# ============================================================================
+# ROUTER
+# ============================================================================
+
+class ReplikaRouter:
+    """
+    Katalog o'qishlarini replikalarga, yozishlarni asosiy bazaga yo'naltirish
+    """
+
+    def db_for_read(self, model, **hints):
+        """
+        O'qish uchun baza
+
+        None qaytarilsa, Django standart bazani ('default') ishlatadi.
+        """
+        if not getattr(settings, 'REPLIKA_BAZALAR', None):
+            return None
+        if issubclass(model, REPLIKA_MODELLARI):
+            return oqish_bazasi()
+        if issubclass(model, Sharh) and hints.get('replikadan'):
+            return oqish_bazasi()
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        """
+        Yozish har doim asosiy bazaga - va so'rovning qolgan qismi ham
+        asosiy bazadan o'qiydi
+        """
+        holat = _holat.get()
+        if holat is not None:
+            holat.yozildi = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """
+        Asosiy baza va replikalar bir xil ma'lumotga ega - ular orasidagi
+        bog'lanishlarga ruxsat beriladi
+        """
+        bazalar = {'default', *getattr(settings, 'REPLIKA_BAZALAR', ())}
+        if obj1._state.db in bazalar and obj2._state.db in bazalar:
+            return True
+        return None
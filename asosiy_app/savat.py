@@ -0,0 +1,232 @@
+"""
+Savat va buyurtma berish
+
+Savat imzolangan cookie da saqlanadi ({mahsulot_id: miqdor}) - mahsulot
+qo'shish, miqdorni o'zgartirish va savatni ko'rish bazaga hech narsa
+yozmaydi, sessiya ham kerak emas. Cookie imzolangan: foydalanuvchi uni
+o'zgartirsa, savat bo'sh deb o'qiladi.
+
+Buyurtma berish (buyurtma_yaratish) - qisqa tranzaksiya:
+    1. Tranzaksiyasiz: mahsulotlar nomi, joriy narxi va versiyasi o'qiladi
+    2. BEGIN
+       UPDATE mahsulot SET miqdor = miqdor - n ... WHERE miqdor >= n AND versiya = v
+       INSERT buyurtma
+       INSERT buyurtma_qatori (barcha qatorlar bitta so'rovda)
+       COMMIT
+
+Mahsulot qatorlari SELECT ... FOR UPDATE bilan qulflanmaydi: qulf faqat
+UPDATE dan COMMIT gacha ushlanadi. Narx o'qilgandan keyin mahsulot
+tahrirlangan bo'lsa (versiya oshgan), tranzaksiya bekor qilinadi va
+hammasi qaytadan o'qiladi - buyurtmaga doim UPDATE paytidagi narx yoziladi.
+
+Foydalanish:
+    savat = Savat(request)
+    savat.qoshish(mahsulot.id, 2)
+    javob = redirect('savat')
+    savat.saqlash(javob)      # cookie ni yangilash
+
+    buyurtma = buyurtma_yaratish(request.user, savat.talablar)
+"""
+
+from django.conf import settings
+from django.db import router, transaction
+
+from .api import MAKS_ID
+from .models import Buyurtma, BuyurtmaQatori, Mahsulot, MiqdorYetarliEmas, VersiyaEskirgan
+from .routers import asosiy_bazadan
+
+# Imzo tuzi - boshqa imzolangan cookie lar savat sifatida o'qilmasligi uchun
+_TUZ = 'asosiy_app.savat'
+
+
+class SavatXatosi(Exception):
+    """
+    Savatga qo'shib bo'lmaydi (chegaradan oshdi)
+    """
+
+
+# ============================================================================
+# SAVAT (COOKIE)
+# ============================================================================
+
+class Savat:
+    """
+    Imzolangan cookie dagi savat
+
+    Cookie ko'rinishi: "12-2.15-1" (mahsulot_id-miqdor, nuqta bilan) -
+    50 ta qator ham 1 KB ga sig'adi.
+    """
+
+    def __init__(self, request):
+        self._qatorlar = self._oqish(request)
+        self.ozgardi = False
+
+    @staticmethod
+    def _oqish(request):
+        """
+        Cookie dan savatni o'qish (imzo noto'g'ri yoki muddati o'tgan bo'lsa - bo'sh)
+
+        MAKS_ID dan katta ID lar tashlanadi - bazadagi id__in so'rovi
+        OverflowError bermasligi uchun.
+        """
+        matn = request.get_signed_cookie(
+            settings.SAVAT_COOKIE_NOMI, default='', salt=_TUZ, max_age=settings.SAVAT_COOKIE_MUDDATI,
+        )
+        qatorlar = {}
+        for qism in matn.split('.') if matn else ():
+            try:
+                mahsulot_id, miqdor = map(int, qism.split('-'))
+            except ValueError:
+                return {}
+            if 0 < mahsulot_id <= MAKS_ID and miqdor > 0:
+                qatorlar[mahsulot_id] = min(miqdor, settings.SAVAT_MAKS_MIQDOR)
+        return dict(list(qatorlar.items())[:settings.SAVAT_MAKS_QATORLAR])
+
+    def __len__(self):
+        """
+        Savatdagi mahsulotlar umumiy soni (menyudagi belgi uchun)
+        """
+        return sum(self._qatorlar.values())
+
+    @property
+    def talablar(self):
+        """
+        {mahsulot_id: miqdor} nusxasi (buyurtma_yaratish uchun)
+        """
+        return dict(self._qatorlar)
+
+    def ozgartirish(self, mahsulot_id, miqdor):
+        """
+        Mahsulot miqdorini o'rnatish (0 - savatdan olib tashlash)
+
+        Raises:
+            SavatXatosi: Savatda SAVAT_MAKS_QATORLAR ta turli mahsulot bor
+        """
+        mahsulot_id, miqdor = int(mahsulot_id), min(int(miqdor), settings.SAVAT_MAKS_MIQDOR)
+        if miqdor <= 0:
+            if self._qatorlar.pop(mahsulot_id, None) is not None:
+                self.ozgardi = True
+            return
+        if mahsulot_id not in self._qatorlar and len(self._qatorlar) >= settings.SAVAT_MAKS_QATORLAR:
+            raise SavatXatosi(f"Savatga {settings.SAVAT_MAKS_QATORLAR} tadan ortiq mahsulot qo'shib bo'lmaydi")
+        if self._qatorlar.get(mahsulot_id) != miqdor:
+            self._qatorlar[mahsulot_id] = miqdor
+            self.ozgardi = True
+
+    def qoshish(self, mahsulot_id, miqdor=1):
+        """
+        Mahsulotni savatga qo'shish (bor bo'lsa - miqdorini oshirish)
+        """
+        self.ozgartirish(mahsulot_id, self._qatorlar.get(int(mahsulot_id), 0) + int(miqdor))
+
+    def tozalash(self):
+        if self._qatorlar:
+            self._qatorlar = {}
+            self.ozgardi = True
+
+    def mahsulotlar(self):
+        """
+        Savat sahifasi uchun mahsulotlar (bitta so'rov, joriy narxlar bilan)
+
+        Bazada yo'q mahsulotlar tashlab ketiladi.
+
+        Returns:
+            tuple: ([{'mahsulot', 'miqdor', 'summa'}, ...], jami summa)
+        """
+        if not self._qatorlar:
+            return [], 0
+        mahsulotlar = Mahsulot.objects.in_bulk(list(self._qatorlar))
+        qatorlar = [
+            {'mahsulot': mahsulotlar[mahsulot_id], 'miqdor': miqdor,
+             'summa': mahsulotlar[mahsulot_id].joriy_narx() * miqdor}
+            for mahsulot_id, miqdor in self._qatorlar.items() if mahsulot_id in mahsulotlar
+        ]
+        return qatorlar, sum(qator['summa'] for qator in qatorlar)
+
+    def saqlash(self, javob):
+        """
+        Savat o'zgargan bo'lsa, javobga yangi cookie yozish
+        """
+        if not self.ozgardi:
+            return
+        if not self._qatorlar:
+            javob.delete_cookie(settings.SAVAT_COOKIE_NOMI)
+            return
+        javob.set_signed_cookie(
+            settings.SAVAT_COOKIE_NOMI,
+            '.'.join(f'{mahsulot_id}-{miqdor}' for mahsulot_id, miqdor in self._qatorlar.items()),
+            salt=_TUZ,
+            max_age=settings.SAVAT_COOKIE_MUDDATI,
+            secure=settings.SESSION_COOKIE_SECURE,
+            httponly=True,
+            samesite='Lax',
+        )
+
+
+# ============================================================================
+# BUYURTMA BERISH
+# ============================================================================
+
+def buyurtma_yaratish(foydalanuvchi, talablar):
+    """
+    Savatdan buyurtma yaratish
+
+    Narxlar tranzaksiyadan tashqarida o'qiladi, tranzaksiya ichida esa
+    uchta so'rov: band qilish (bitta UPDATE, versiya tekshiruvi bilan),
+    buyurtma va barcha qatorlar (bulk_create). Mahsulot shu orada
+    tahrirlansa, BUYURTMA_URINISHLAR marta qaytadan urinib ko'riladi.
+
+    Args:
+        foydalanuvchi: Buyurtmachi (User yoki None)
+        talablar: {mahsulot_id: miqdor}
+
+    Returns:
+        Buyurtma: Yaratilgan buyurtma (urinishlar atributi - nechanchi urinishda)
+
+    Raises:
+        MiqdorYetarliEmas: Birorta mahsulot omborda yetmasa yoki o'chirilgan bo'lsa
+        VersiyaEskirgan: Barcha urinishlarda mahsulot o'zgarib ulgurgan bo'lsa
+        ValueError: Savat bo'sh yoki miqdor musbat bo'lmasa
+    """
+    if not talablar:
+        raise ValueError("Savat bo'sh")
+    urinishlar = settings.BUYURTMA_URINISHLAR
+    for urinish in range(1, urinishlar + 1):
+        # Replika kechiksa, eski narx yoki versiya o'qilmasligi uchun
+        with asosiy_bazadan():
+            mahsulotlar = {
+                mahsulot['id']: mahsulot for mahsulot in
+                Mahsulot.objects.filter(id__in=talablar).order_by()
+                .values('id', 'nomi', 'narx', 'chegirma_narxi', 'versiya')
+            }
+        topilmadi = set(talablar) - set(mahsulotlar)
+        if topilmadi:
+            raise MiqdorYetarliEmas({mahsulot_id: 0 for mahsulot_id in topilmadi})
+
+        # Narx - Mahsulot.joriy_narx() bilan bir xil: chegirma bo'lsa, chegirma narxi
+        qatorlar = [
+            BuyurtmaQatori(
+                mahsulot_id=mahsulot_id,
+                nomi=mahsulotlar[mahsulot_id]['nomi'],
+                narx=mahsulotlar[mahsulot_id]['chegirma_narxi'] or mahsulotlar[mahsulot_id]['narx'],
+                miqdor=miqdor,
+            )
+            for mahsulot_id, miqdor in talablar.items()
+        ]
+        try:
+            with transaction.atomic(using=router.db_for_write(Buyurtma)):
+                Mahsulot.objects.band_qilish(
+                    talablar, versiyalar={mahsulot_id: mahsulot['versiya'] for mahsulot_id, mahsulot in mahsulotlar.items()},
+                )
+                buyurtma = Buyurtma.objects.create(
+                    foydalanuvchi=foydalanuvchi, jami=sum(qator.summa() for qator in qatorlar),
+                )
+                for qator in qatorlar:
+                    qator.buyurtma = buyurtma
+                BuyurtmaQatori.objects.bulk_create(qatorlar)
+        except VersiyaEskirgan:
+            if urinish == urinishlar:
+                raise
+            continue
+        buyurtma.urinishlar = urinish
+        return buyurtma
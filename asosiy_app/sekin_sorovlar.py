@@ -0,0 +1,231 @@
+"""
+Sekin so'rovlar - SEKIN_SOROV_CHEGARASI_MS dan uzoq davom etgan SQL so'rovlar jurnali
+
+Har bir ma'lumotlar bazasi ulanishiga execute_wrapper o'rnatiladi
+(apps.py -> AsosiyAppConfig.ready). Chegaradan sekin so'rov:
+- ko'rinishi (parametrlarsiz SQL), davomiyligi va chaqirilgan joyi
+  (fayl:qator, shablon:qator) bilan jurnalga yoziladi
+- ba'zilari uchun (SEKIN_SOROV_EXPLAIN_ULUSHI) bajarilish rejasi olinadi:
+  EXPLAIN (PostgreSQL, MySQL) yoki EXPLAIN QUERY PLAN (SQLite)
+
+Jurnal - umumiy, faqat oxiriga yoziladigan fayl (teglar.py dagi kabi):
+barcha workerlar bitta faylga yozadi, hisobotni esa admin paneldagi
+sahifa (/admin/sekin-sorovlar/) yoki buyruq ko'rsatadi:
+
+    python manage.py sekin_sorovlar --top 20
+
+Fayl SEKIN_SOROVLAR_FAYLI_HAJMI dan oshsa, .1 nusxaga ko'chiriladi -
+hisobot oxirgi ikki fayldagi yozuvlardan tuziladi.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.db import transaction
+
+from .sorovlar import sorov_korinishi, sorov_manbasi
+
+# EXPLAIN faqat o'qish so'rovlari uchun olinadi
+EXPLAIN_QILINADIGAN = ('SELECT', 'WITH')
+
+# Bitta ko'rinish uchun reja qayta olinmaydigan vaqt (sekund)
+EXPLAIN_ORALIGI = 600
+
+# Oxirgi EXPLAIN vaqti eslab qolinadigan ko'rinishlar soni (eng eskilari o'chiriladi)
+EXPLAIN_KORINISHLARI_MAKS = 1000
+
+_oqim = threading.local()
+
+
+def jurnal_fayli():
+    return str(getattr(settings, 'SEKIN_SOROVLAR_FAYLI', settings.BASE_DIR / 'sekin_sorovlar.log'))
+
+
+# ============================================================================
+# EXECUTE WRAPPER
+# ============================================================================
+
+class SekinSorovlarYozuvchisi:
+    """
+    Sekin so'rovlarni jurnalga yozuvchi execute_wrapper
+
+    Tez so'rovlar uchun qo'shimcha ish - faqat ikki marta perf_counter().
+    Stek va EXPLAIN faqat sekin so'rovlar uchun olinadi.
+    """
+
+    def __init__(self):
+        # ko'rinish -> oxirgi EXPLAIN vaqti; eng eski yozuv - birinchi
+        # (lug'at qo'shilish tartibini saqlaydi, yangilanganda oxiriga o'tkaziladi)
+        self._explain_vaqtlari = {}
+        self._qulf = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_oqim, 'ichkarida', False):
+            # EXPLAIN so'rovining o'zi hisobga olinmaydi
+            return execute(sql, params, many, context)
+
+        boshlanish = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            ms = (time.perf_counter() - boshlanish) * 1000
+            chegara = getattr(settings, 'SEKIN_SOROV_CHEGARASI_MS', None)
+            if chegara and ms >= chegara:
+                self._yozish(sql, params, many, context, ms)
+
+    def _yozish(self, sql, params, many, context, ms):
+        ulanish = context['connection']
+        korinish = sorov_korinishi(sql)
+        yozuv = {
+            'vaqt': round(time.time(), 3),
+            'ms': round(ms, 2),
+            'baza': ulanish.alias,
+            'korinish': korinish,
+            'manba': sorov_manbasi(3),
+            'reja': None,
+        }
+        if not many and self._explain_kerakmi(korinish):
+            yozuv['reja'] = self._explain(ulanish, sql, params)
+
+        try:
+            qator = (json.dumps(yozuv, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+            fd = os.open(jurnal_fayli(), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, qator)
+                hajm = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+            if hajm > getattr(settings, 'SEKIN_SOROVLAR_FAYLI_HAJMI', 5 * 1024 * 1024):
+                os.replace(jurnal_fayli(), jurnal_fayli() + '.1')
+        except OSError:
+            # Jurnal yozilmasa ham so'rov natijasi foydalanuvchiga yetib borishi kerak
+            pass
+
+    def _explain_kerakmi(self, korinish):
+        """
+        Reja olish kerakmi: faqat SELECT, tasodifiy ulush va har bir
+        ko'rinish uchun EXPLAIN_ORALIGI da ko'pi bilan bir marta
+        """
+        if not korinish.lstrip().upper().startswith(EXPLAIN_QILINADIGAN):
+            return False
+        if random.random() >= getattr(settings, 'SEKIN_SOROV_EXPLAIN_ULUSHI', 0.1):
+            return False
+        hozir = time.monotonic()
+        with self._qulf:
+            vaqtlar = self._explain_vaqtlari
+            if hozir - vaqtlar.get(korinish, -EXPLAIN_ORALIGI) < EXPLAIN_ORALIGI:
+                return False
+            vaqtlar.pop(korinish, None)
+            vaqtlar[korinish] = hozir
+            # Muddati o'tgan va chegaradan ortiq eski yozuvlar - lug'at cheksiz o'smaydi
+            for eski, vaqt in list(vaqtlar.items()):
+                if len(vaqtlar) <= EXPLAIN_KORINISHLARI_MAKS and hozir - vaqt < EXPLAIN_ORALIGI:
+                    break
+                del vaqtlar[eski]
+        return True
+
+    def _explain(self, ulanish, sql, params):
+        """
+        So'rovning bajarilish rejasi (xato bo'lsa - None)
+
+        Tranzaksiya ichida savepoint bilan: PostgreSQL da EXPLAIN xatosi
+        chaqiruvchining tranzaksiyasini buzmasligi kerak (xato yutiladi,
+        needs_rollback esa o'rnatilmaydi - keyingi so'rov xato berardi).
+        """
+        if ulanish.needs_rollback:
+            return None  # Buzilgan tranzaksiyada yangi so'rov yuborib bo'lmaydi
+        _oqim.ichkarida = True
+        try:
+            savepoint = transaction.atomic(using=ulanish.alias) if ulanish.in_atomic_block else nullcontext()
+            with savepoint, ulanish.cursor() as cursor:
+                cursor.execute(f'{ulanish.ops.explain_query_prefix()} {sql}', params)
+                return '\n'.join(' '.join(str(ustun) for ustun in qator) for qator in cursor.fetchall())
+        except Exception:
+            return None
+        finally:
+            _oqim.ichkarida = False
+
+
+yozuvchi = SekinSorovlarYozuvchisi()
+
+
+def yozuvchini_ornatish(sender, connection, **kwargs):
+    """
+    Har bir yangi ulanishga yozuvchini o'rnatish (connection_created signali)
+
+    Ro'yxat boshiga qo'yiladi: vaqtinchalik execute_wrapper() bloklari
+    oxirgi elementni olib tashlaydi, doimiy yozuvchi esa joyida qoladi.
+    """
+    if yozuvchi not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, yozuvchi)
+
+
+# ============================================================================
+# HISOBOT
+# ============================================================================
+
+def yozuvlar():
+    """
+    Jurnaldagi barcha yozuvlar (avval eski .1 fayl, keyin joriysi)
+    """
+    for fayl in (jurnal_fayli() + '.1', jurnal_fayli()):
+        try:
+            with open(fayl, encoding='utf-8', errors='replace') as jurnal:
+                for qator in jurnal:
+                    try:
+                        yield json.loads(qator)
+                    except ValueError:
+                        continue  # Yarim yozilgan qator
+        except FileNotFoundError:
+            continue
+
+
+def hisobot(top=20, saralash='jami_ms'):
+    """
+    Ko'rinish bo'yicha yig'ilgan eng sekin so'rovlar
+
+    Args:
+        top: Nechta ko'rinish qaytarilsin
+        saralash: 'jami_ms', 'soni', 'maks_ms' yoki 'ortacha_ms'
+
+    Returns:
+        list: [{'korinish', 'soni', 'jami_ms', 'ortacha_ms', 'maks_ms',
+                'oxirgi_vaqt', 'manba', 'reja', 'baza'}, ...]
+    """
+    guruhlar = {}
+    for yozuv in yozuvlar():
+        guruh = guruhlar.setdefault(yozuv['korinish'], {
+            'korinish': yozuv['korinish'], 'soni': 0, 'jami_ms': 0.0, 'maks_ms': 0.0,
+            'oxirgi_vaqt': 0, 'manba': [], 'reja': None, 'baza': yozuv.get('baza'),
+        })
+        guruh['soni'] += 1
+        guruh['jami_ms'] += yozuv['ms']
+        if yozuv['ms'] >= guruh['maks_ms']:
+            guruh['maks_ms'] = yozuv['ms']
+            guruh['manba'] = yozuv.get('manba') or []
+        guruh['oxirgi_vaqt'] = max(guruh['oxirgi_vaqt'], yozuv['vaqt'])
+        if yozuv.get('reja'):
+            guruh['reja'] = yozuv['reja']
+
+    natija = list(guruhlar.values())
+    for guruh in natija:
+        guruh['jami_ms'] = round(guruh['jami_ms'], 2)
+        guruh['ortacha_ms'] = round(guruh['jami_ms'] / guruh['soni'], 2)
+    natija.sort(key=lambda guruh: guruh[saralash], reverse=True)
+    return natija[:top]
+
+
+def tozalash():
+    """
+    Jurnalni o'chirish
+    """
+    for fayl in (jurnal_fayli(), jurnal_fayli() + '.1'):
+        try:
+            os.unlink(fayl)
+        except FileNotFoundError:
+            pass
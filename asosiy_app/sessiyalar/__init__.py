@@ -0,0 +1,122 @@
+"""
+Sessiyalar - kamroq yoziladigan sessiya backendlari
+
+settings.SESSIYA_TURI ga qarab SESSION_ENGINE shu paketdagi modullardan
+biriga o'rnatiladi:
+- 'db'             - asosiy_app.sessiyalar.db (Django standarti kabi)
+- 'cached_db'      - asosiy_app.sessiyalar.cached_db: o'qish keshdan,
+                     yozish keshga va bazaga
+- 'signed_cookies' - asosiy_app.sessiyalar.signed_cookies: sessiya
+                     imzolangan cookie ichida, bazaga umuman murojaat yo'q
+                     (faqat kichik sessiyalar uchun - cookie 4 KB gacha)
+
+Barcha backendlarga umumiy qo'shimchalar (SessiyaYozishMixin):
+- Sessiya ma'lumoti o'zgarmagan bo'lsa, saqlanmaydi (masalan, view
+  sessiyaga avvalgi qiymatning o'zini yozganda)
+- Muddat har bir so'rovda emas, "dangasa" uzaytiriladi: oxirgi saqlashdan
+  SESSIYA_UZAYTIRISH_ORALIGI o'tgan bo'lsa, sessiya qayta saqlanadi
+  (faol foydalanuvchi tizimdan chiqib ketmaydi, lekin kuniga ko'pi bilan
+  bir marta yoziladi)
+
+Bazadagi eskirgan sessiyalar partiyalab o'chiriladi (SessiyaTozalashMixin)
+- clearsessions va sessiyalarni_tozalash buyruqlari jadvalni uzoq
+  qulflamaydi.
+"""
+
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+# Oxirgi saqlash vaqti (unix sekund) - sessiya ma'lumoti ichida saqlanadi
+VAQT_KALITI = '_sessiya_vaqti'
+
+
+class SessiyaYozishMixin:
+    """
+    O'zgarmagan sessiyani yozmaslik va muddatni dangasa uzaytirish
+
+    SessionStore classlaridan oldin meros qilinadi:
+        class SessionStore(SessiyaYozishMixin, DBStore): ...
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._yuklangan = None      # Yuklangan ma'lumotning serializatsiyasi
+        self._uzaytirish = False    # Muddatni uzaytirish uchun saqlash kerak
+
+    def _korinish(self, malumot):
+        return self.serializer().dumps(malumot)
+
+    def load(self):
+        return self._yuklandi(super().load())
+
+    async def aload(self):
+        # Async views (request.auser()) sessiyani shu yo'l bilan o'qiydi.
+        # Ba'zi backendlar aload() ichida load() ni chaqiradi - _yuklandi
+        # ikki marta ishlasa ham natija bir xil
+        return self._yuklandi(await super().aload())
+
+    def _yuklandi(self, malumot):
+        """
+        Yuklangan ma'lumotni eslab qolish va muddatni uzaytirish kerakligini belgilash
+        """
+        self._yuklangan = self._korinish(malumot)
+        if malumot:
+            oraliq = getattr(settings, 'SESSIYA_UZAYTIRISH_ORALIGI', 60 * 60 * 24)
+            if time.time() - malumot.get(VAQT_KALITI, 0) >= oraliq:
+                # SessionMiddleware javobda sessiyani saqlaydi va cookie ni yangilaydi
+                self._uzaytirish = True
+                self.modified = True
+        return malumot
+
+    def save(self, must_create=False):
+        if (
+            not must_create
+            and not self._uzaytirish
+            and self._yuklangan is not None
+            and self._korinish(self._session) == self._yuklangan
+        ):
+            return
+        self._session[VAQT_KALITI] = int(time.time())
+        super().save(must_create)
+        self._yuklangan = self._korinish(self._session)
+        self._uzaytirish = False
+
+
+class SessiyaTozalashMixin:
+    """
+    Eskirgan sessiyalarni partiyalab o'chirish (bazada saqlanadigan backendlar)
+
+    Bitta katta DELETE o'rniga expire_date indeksi bo'yicha SESSIYA_TOZALASH_PARTIYASI
+    tadan o'chiriladi - har bir partiya alohida tranzaksiya, jadval uzoq
+    qulflanmaydi va sessiya yozayotgan so'rovlar kutib qolmaydi.
+    """
+
+    @classmethod
+    def clear_expired(cls, partiya=None, pauza=0):
+        """
+        Args:
+            partiya: Bitta DELETE dagi qatorlar soni
+                (standart: SESSIYA_TOZALASH_PARTIYASI)
+            pauza: Partiyalar orasidagi kutish (sekund)
+
+        Returns:
+            int: O'chirilgan sessiyalar soni
+        """
+        partiya = partiya or getattr(settings, 'SESSIYA_TOZALASH_PARTIYASI', 1000)
+        model = cls.get_model_class()
+        hozir = timezone.now()
+        jami = 0
+        while True:
+            kalitlar = list(
+                model.objects.filter(expire_date__lt=hozir).values_list('pk', flat=True)[:partiya]
+            )
+            if not kalitlar:
+                break
+            jami += model.objects.filter(pk__in=kalitlar).delete()[0]
+            if len(kalitlar) < partiya:
+                break
+            if pauza:
+                time.sleep(pauza)
+        return jami
@@ -0,0 +1,16 @@
+"""
+Keshlangan, bazada saqlanadigan sessiyalar (SESSIYA_TURI = 'cached_db')
+
+O'qish SESSION_CACHE_ALIAS keshidan (topilmasa - bazadan), yozish ham
+keshga, ham bazaga. Bir nechta worker bo'lsa, kesh umumiy bo'lishi kerak
+(Redis): lokal xotira keshida boshqa worker sessiyaning eski nusxasini
+ko'rishi mumkin.
+"""
+
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+
+from . import SessiyaTozalashMixin, SessiyaYozishMixin
+
+
+class SessionStore(SessiyaYozishMixin, SessiyaTozalashMixin, CachedDBStore):
+    pass
@@ -0,0 +1,11 @@
+"""
+Bazada saqlanadigan sessiyalar (SESSIYA_TURI = 'db')
+"""
+
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+
+from . import SessiyaTozalashMixin, SessiyaYozishMixin
+
+
+class SessionStore(SessiyaYozishMixin, SessiyaTozalashMixin, DBStore):
+    pass
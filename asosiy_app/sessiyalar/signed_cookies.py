@@ -0,0 +1,30 @@
+"""
+Imzolangan cookie dagi sessiyalar (SESSIYA_TURI = 'signed_cookies')
+
+Sessiya serverda saqlanmaydi - bazaga ham, keshga ham murojaat yo'q.
+Cheklovlar: cookie 4 KB dan oshmasligi kerak va sessiyani serverdan
+bekor qilib bo'lmaydi (chiqishda faqat brauzerdagi cookie o'chiriladi).
+"""
+
+import logging
+
+from django.contrib.sessions.backends.signed_cookies import SessionStore as CookieStore
+
+from . import SessiyaYozishMixin
+
+logger = logging.getLogger(__name__)
+
+# Brauzerlar bitta cookie uchun ~4096 bayt qabul qiladi
+COOKIE_CHEGARASI = 4000
+
+
+class SessionStore(SessiyaYozishMixin, CookieStore):
+
+    def save(self, must_create=False):
+        super().save(must_create)
+        if self._session_key and len(self._session_key) > COOKIE_CHEGARASI:
+            logger.warning(
+                "Sessiya cookie si %d bayt - brauzer uni qabul qilmasligi mumkin. "
+                "Katta sessiyalar uchun SESSIYA_TURI = 'cached_db' ishlating.",
+                len(self._session_key),
+            )
@@ -5,63 +5,52 @@ Bu faylda Django signallari aniqlanadi.
 Signallar - ma'lum hodisalar sodir bo'lganda avtomatik ishga tushadigan funksiyalar.
 
 Masalan:
-- Foydalanuvchi yaratilganda avtomatik profil yaratish
+- Foydalanuvchi yoki profil o'zgarganda uning keshini eskirtirish
 - Mahsulot saqlanganida reyting hisoblash
 - Email yuborish va h.k.
 """
 
+from django.db.models import Avg
 from django.db.models.signals import post_save, pre_save
 from django.contrib.auth.models import User
-from django.dispatch import receiver
 from .models import Profil, Mahsulot, Sharh
+from .kesh import teglar_ozgardi
+# django.dispatch.receiver + qabul qiluvchilar vaqti Server-Timing ga (vaqtlar.py)
+from .vaqtlar import receiver
 
 # ============================================================================
-# PROFIL YARATISH SIGNALI
+# MAHSULOT REYTING YANGILASH SIGNALI
 # ============================================================================
 
-@receiver(post_save, sender=User)
-def profil_yaratish(sender, instance, created, **kwargs):
-    """
-    Yangi foydalanuvchi yaratilganda avtomatik profil yaratish
-    
-    Bu signal User modeli saqlanganidan keyin (post_save) ishga tushadi.
-    Agar yangi foydalanuvchi yaratilgan bo'lsa (created=True),
-    unga avtomatik profil yaratiladi.
-    
-    Args:
-        sender: Signal yuboruvchi model (User)
-        instance: Yaratilgan yoki yangilangan User obyekti
-        created: Yangi obyekt yaratildimi? (True/False)
-        **kwargs: Qo'shimcha argumentlar
+def _reytingni_yozish(mahsulot_id, bosh_bolsa):
     """
-    if created:
-        # Yangi foydalanuvchi uchun profil yaratish
-        Profil.objects.create(foydalanuvchi=instance)
-        print(f"✓ {instance.username} uchun profil yaratildi")
+    Mahsulot reytingini tasdiqlangan sharhlardan qayta hisoblab, faqat
+    reyting ustunini yozish
 
+    mahsulot.save() ishlatilmaydi: sharh bilan yuklangan Mahsulot obyekti
+    eski miqdor/holat ni saqlaydi va u orada bajarilgan band_qilish()
+    ni bekor qilib yuborardi (ortiqcha sotish). save() versiyani ham
+    oshiradi - shu mahsulot bilan boshlangan buyurtmalar VersiyaEskirgan
+    bilan to'xtardi. Reyting narx emas, shuning uchun versiya o'zgarmaydi.
+
+    update() post_save chaqirmaydi - kesh teglari shu yerda bekor qilinadi.
 
-@receiver(post_save, sender=User)
-def profil_saqlash(sender, instance, **kwargs):
-    """
-    Foydalanuvchi saqlanganida profilni ham saqlash
-    
-    Bu signal User modeli har safar saqlanganida ishga tushadi
-    va unga tegishli profilni ham saqlaydi.
-    
     Args:
-        sender: Signal yuboruvchi model (User)
-        instance: Saqlangan User obyekti
-        **kwargs: Qo'shimcha argumentlar
+        mahsulot_id: Mahsulot ID si
+        bosh_bolsa: Tasdiqlangan sharh bo'lmasa yoziladigan reyting
+            (None - reytingga tegmaslik)
     """
-    # Agar profil mavjud bo'lsa, uni saqlash
-    if hasattr(instance, 'profil'):
-        instance.profil.save()
+    ortacha = Sharh.objects.filter(mahsulot_id=mahsulot_id, tasdiqlangan=True).aggregate(
+        ortacha=Avg('baho'),
+    )['ortacha']
+    reyting = round(ortacha, 2) if ortacha is not None else bosh_bolsa
+    if reyting is None:
+        return
+    Mahsulot.objects.filter(pk=mahsulot_id).update(reyting=reyting)
+    teglar_ozgardi(['mahsulot', f'mahsulot:{mahsulot_id}'])
+    print(f"✓ Mahsulot #{mahsulot_id} reytingi yangilandi: {reyting}")
 
 
-# ============================================================================
-# MAHSULOT REYTING YANGILASH SIGNALI
-# ============================================================================
-
 @receiver(post_save, sender=Sharh)
 def mahsulot_reyting_yangilash(sender, instance, **kwargs):
     """
@@ -75,24 +64,8 @@ def mahsulot_reyting_yangilash(sender, instance, **kwargs):
         instance: Saqlangan Sharh obyekti
         **kwargs: Qo'shimcha argumentlar
     """
-    # Mahsulotni olish
-    mahsulot = instance.mahsulot
-    
-    # Mahsulotning barcha tasdiqlangan sharhlarini olish
-    sharhlar = mahsulot.sharhlar.filter(tasdiqlangan=True)
-    
-    # Agar sharhlar bo'lsa, o'rtacha reytingni hisoblash
-    if sharhlar.exists():
-        # Barcha baholarning o'rtacha qiymatini hisoblash
-        jami_baho = sum([sharh.baho for sharh in sharhlar])
-        sharhlar_soni = sharhlar.count()
-        ortacha_reyting = jami_baho / sharhlar_soni
-        
-        # Mahsulot reytingini yangilash
-        mahsulot.reyting = round(ortacha_reyting, 2)
-        mahsulot.save()
-        
-        print(f"✓ {mahsulot.nomi} reytingi yangilandi: {mahsulot.reyting}")
+    # Faqat tasdiqlangan sharhlar bo'lsa reyting o'zgaradi
+    _reytingni_yozish(instance.mahsulot_id, bosh_bolsa=None)
 
 
 # ============================================================================
@@ -180,24 +153,166 @@ def sharh_ochirilganda_reyting_yangilash(sender, instance, **kwargs):
         instance: O'chirilgan Sharh obyekti
         **kwargs: Qo'shimcha argumentlar
     """
-    # Mahsulotni olish
-    mahsulot = instance.mahsulot
+    # Agar sharh qolmagan bo'lsa, reyting 0 ga o'rnatiladi
+    _reytingni_yozish(instance.mahsulot_id, bosh_bolsa=0)
+
+
+# ============================================================================
+# KESHNI YANGILASH SIGNALLARI
+# ============================================================================
+
+from .models import Kategoriya
+
+@receiver(post_save, sender=Mahsulot)
+@receiver(post_delete, sender=Mahsulot)
+def mahsulot_keshini_yangilash(sender, instance, **kwargs):
+    """
+    Mahsulot saqlanganda yoki o'chirilganda keshni yangilash
+    
+    'mahsulot' va 'mahsulot:<id>' teglari barcha workerlarda bekor
+    qilinadi, mashhur/yangi mahsulotlar bloklari fonda qayta quriladi.
+    
+    Args:
+        sender: Signal yuboruvchi model (Mahsulot)
+        instance: Saqlangan yoki o'chirilgan Mahsulot obyekti
+        **kwargs: Qo'shimcha argumentlar (update_fields va h.k.)
+    """
+    # Faqat ko'rilganlar soni yangilangan bo'lsa (har bir ko'rishda),
+    # bosh sahifa bloklari o'zgarmaydi - keshni saqlab qolamiz
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) <= {'korilganlar_soni'}:
+        return
     
-    # Mahsulotning qolgan tasdiqlangan sharhlarini olish
-    sharhlar = mahsulot.sharhlar.filter(tasdiqlangan=True)
+    teglar_ozgardi(['mahsulot', f'mahsulot:{instance.pk}'])
+
+
+@receiver(post_save, sender=Kategoriya)
+@receiver(post_delete, sender=Kategoriya)
+def kategoriya_keshini_yangilash(sender, instance, **kwargs):
+    """
+    Kategoriya saqlanganda yoki o'chirilganda keshni yangilash
     
-    # Agar sharhlar bo'lsa, o'rtacha reytingni hisoblash
-    if sharhlar.exists():
-        jami_baho = sum([sharh.baho for sharh in sharhlar])
-        sharhlar_soni = sharhlar.count()
-        ortacha_reyting = jami_baho / sharhlar_soni
-        mahsulot.reyting = round(ortacha_reyting, 2)
-    else:
-        # Agar sharh qolmagan bo'lsa, reytingni 0 ga o'rnatish
-        mahsulot.reyting = 0
+    'kategoriya' va 'kategoriya:<id>' teglari bekor qilinadi - kategoriyalar
+    reestri va kategoriyalar bloki barcha workerlarda yangilanadi.
     
-    mahsulot.save()
-    print(f"✓ {mahsulot.nomi} reytingi yangilandi (sharh o'chirildi): {mahsulot.reyting}")
+    Args:
+        sender: Signal yuboruvchi model (Kategoriya)
+        instance: Saqlangan yoki o'chirilgan Kategoriya obyekti
+        **kwargs: Qo'shimcha argumentlar
+    """
+    teglar_ozgardi(['kategoriya', f'kategoriya:{instance.pk}'])
+
+
+@receiver(post_save, sender=Sharh)
+@receiver(post_delete, sender=Sharh)
+def sharh_keshini_yangilash(sender, instance, **kwargs):
+    """
+    Sharh saqlanganda yoki o'chirilganda keshlangan sahifalarni eskirtirish
+    
+    Mahsulot sahifasida sharhlar ro'yxati ko'rsatiladi, shuning uchun
+    'sharh' va tegishli 'mahsulot:<id>' teglari bekor qilinadi.
+    
+    Args:
+        sender: Signal yuboruvchi model (Sharh)
+        instance: Saqlangan yoki o'chirilgan Sharh obyekti
+        **kwargs: Qo'shimcha argumentlar
+    """
+    teglar_ozgardi(['sharh', f'mahsulot:{instance.mahsulot_id}'])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def foydalanuvchi_keshini_yangilash(sender, instance, **kwargs):
+    """
+    Foydalanuvchi saqlanganda yoki o'chirilganda keshini eskirtirish
+    
+    backends.ProfilBilanBackend foydalanuvchini profili bilan keshlaydi.
+    Parol, is_active yoki last_login o'zgarsa, keyingi so'rov uni
+    bazadan qayta yuklaydi.
+    
+    Args:
+        sender: Signal yuboruvchi model (User)
+        instance: Saqlangan yoki o'chirilgan User obyekti
+        **kwargs: Qo'shimcha argumentlar
+    """
+    teglar_ozgardi([f'foydalanuvchi:{instance.pk}'])
+
+
+@receiver(post_save, sender=Profil)
+@receiver(post_delete, sender=Profil)
+def profil_keshini_yangilash(sender, instance, **kwargs):
+    """
+    Profil saqlanganda yoki o'chirilganda foydalanuvchi keshini eskirtirish
+    
+    Args:
+        sender: Signal yuboruvchi model (Profil)
+        instance: Saqlangan yoki o'chirilgan Profil obyekti
+        **kwargs: Qo'shimcha argumentlar
+    """
+    teglar_ozgardi([f'foydalanuvchi:{instance.foydalanuvchi_id}'])
+
+
+# ============================================================================
+# SQLITE TEZKOR PROFILI
+# ============================================================================
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+
+# PRAGMA da parametr (?) ishlatib bo'lmaydi - SQL satr bilan yasaladi.
+# Shuning uchun faqat shu nomlar va qiymatlar qabul qilinadi
+# (int - butun son, to'plam - shu so'zlardan biri)
+SQLITE_RUXSAT_ETILGAN_PRAGMALAR = {
+    'journal_mode': {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'},
+    'synchronous': {'OFF', 'NORMAL', 'FULL', 'EXTRA'},
+    'temp_store': {'DEFAULT', 'FILE', 'MEMORY'},
+    'foreign_keys': {'ON', 'OFF'},
+    'mmap_size': int,
+    'cache_size': int,
+    'busy_timeout': int,
+    'wal_autocheckpoint': int,
+}
+
+
+def _pragma_sql(nom, qiymat):
+    """
+    SQLITE_PRAGMALARI dagi bitta yozuvdan PRAGMA so'rovi
+
+    Raises:
+        ImproperlyConfigured: Nom yoki qiymat ruxsat etilmagan bo'lsa
+    """
+    ruxsat = SQLITE_RUXSAT_ETILGAN_PRAGMALAR.get(nom)
+    if ruxsat is int:
+        # bool ham int - lekin True/False PRAGMA uchun ma'nosiz
+        if isinstance(qiymat, int) and not isinstance(qiymat, bool):
+            return f'PRAGMA {nom} = {qiymat}'
+    elif ruxsat is not None and str(qiymat).upper() in ruxsat:
+        return f'PRAGMA {nom} = {str(qiymat).upper()}'
+    raise ImproperlyConfigured(f"SQLITE_PRAGMALARI: ruxsat etilmagan qiymat {nom} = {qiymat!r}")
+
+
+@receiver(connection_created)
+def sqlite_profilini_qollash(sender, connection, **kwargs):
+    """
+    Har bir yangi SQLite ulanishiga SQLITE_PRAGMALARI ni qo'llash
+    
+    Faqat SQLITE_TEZKOR_PROFIL = True bo'lganda ishlaydi (settings.py).
+    WAL rejimida o'quvchilar yozuvchini kutmaydi, shuning uchun sharh
+    yozilayotganda katalog sahifalari bloklanmaydi.
+    
+    Pragmalar SQLITE_RUXSAT_ETILGAN_PRAGMALAR bo'yicha tekshiriladi.
+    
+    Args:
+        sender: Ma'lumotlar bazasi backend classi
+        connection: Yangi ochilgan ulanish
+        **kwargs: Qo'shimcha argumentlar
+    """
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_TEZKOR_PROFIL', False):
+        return
+    with connection.cursor() as cursor:
+        for nom, qiymat in settings.SQLITE_PRAGMALARI.items():
+            cursor.execute(_pragma_sql(nom, qiymat))
 
 
 # ============================================================================
@@ -0,0 +1,228 @@
+"""
+Sorovlar - SQL so'rovlar byudjeti va N+1 muammosini aniqlash
+
+Har bir view uchun ruxsat etilgan SQL so'rovlar soni (byudjet) belgilanadi
+(settings.SOROV_BYUDJETI). Byudjet oshsa yoki bir xil ko'rinishdagi so'rov
+ko'p marta takrorlansa (N+1: ro'yxatning har bir qatori uchun alohida
+so'rov), hisobot chiqariladi: qaysi so'rov necha marta bajarilgani va
+u kodning (yoki shablonning) qaysi qatoridan kelgani.
+
+Ishlatish:
+- Har bir so'rov uchun - SorovByudjetiMiddleware (settings.SOROV_BYUDJETI_REJIMI)
+- Kodning bir qismi uchun (masalan, testlarda):
+
+    with sorov_byudjeti(5, nom='mahsulotlar ro\\'yxati'):
+        list(Mahsulot.objects.all())
+
+Bu vosita ishlab chiqish va testlar uchun: har bir so'rovda stek
+o'qiladi, shuning uchun ishlab chiqarishda o'chirilgan bo'lishi kerak.
+"""
+
+import logging
+import re
+import sys
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Bir xil ko'rinish: IN (%s, %s, %s) -> IN (...)
+IN_REGEX = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+
+# Loyiha fayllari (stekdan faqat shular olinadi)
+LOYIHA_PAPKASI = str(Path(settings.BASE_DIR).resolve())
+# Bu fayl, middleware zanjiri va doimiy execute_wrapper lar stekda
+# ko'rsatilmaydi (har bir so'rovda bir xil)
+YASHIRIN_FAYLLAR = {
+    str(Path(__file__).resolve()),
+    str(Path(__file__).resolve().with_name('middleware.py')),
+    str(Path(__file__).resolve().with_name('sekin_sorovlar.py')),
+    str(Path(__file__).resolve().with_name('vaqtlar.py')),
+}
+STEK_CHUQURLIGI = 4
+
+
+class SorovByudjetiOshdi(Exception):
+    """
+    So'rovlar soni byudjetdan oshdi yoki N+1 aniqlandi (rejim: 'xato')
+    """
+
+
+def sorov_korinishi(sql):
+    """
+    SQL so'rovning "ko'rinishi" - parametrlarsiz shakli
+
+    Django so'rovlari allaqachon parametrlangan (%s), shuning uchun faqat
+    IN (...) ro'yxatlarining uzunligi olib tashlanadi.
+    """
+    return IN_REGEX.sub('(...)', sql)
+
+
+def _nisbiy(yol):
+    """
+    Loyiha papkasiga nisbatan yo'l (loyihadan tashqarida - o'zgarishsiz)
+    """
+    if yol.startswith(LOYIHA_PAPKASI):
+        return yol[len(LOYIHA_PAPKASI):].lstrip('/\\')
+    return yol
+
+
+def sorov_manbasi(chuqurlik=2):
+    """
+    So'rov qayerdan kelgani: shablon qatori va loyiha fayllaridagi chaqiruvlar
+
+    Args:
+        chuqurlik: Stekning qaysi freymidan boshlab qidirish
+            (2 - execute_wrapper ni chaqirgan joy)
+
+    Returns:
+        tuple: ('templates/...html:42', 'asosiy_app/views.py:88 get_context_data', ...)
+    """
+    qatorlar = []
+    shablon = None
+    freym = sys._getframe(chuqurlik)
+    while freym is not None and len(qatorlar) < STEK_CHUQURLIGI:
+        fayl = freym.f_code.co_filename
+        if shablon is None and freym.f_code.co_name == 'render_annotated':
+            # django.template.base.Node.render_annotated - eng ichki shablon tugun
+            tugun = freym.f_locals.get('self')
+            origin = getattr(tugun, 'origin', None)
+            token = getattr(tugun, 'token', None)
+            if origin is not None and token is not None:
+                shablon = f'{_nisbiy(origin.name)}:{token.lineno}'
+                qatorlar.append(shablon)
+        elif fayl.startswith(LOYIHA_PAPKASI) and fayl not in YASHIRIN_FAYLLAR and 'site-packages' not in fayl:
+            qatorlar.append(f'{_nisbiy(fayl)}:{freym.f_lineno} {freym.f_code.co_name}')
+        freym = freym.f_back
+    return tuple(qatorlar)
+
+
+class SorovlarHisobi:
+    """
+    Blok davomida bajarilgan SQL so'rovlar hisobi
+
+    connection.execute_wrapper() sifatida barcha bazalarga o'rnatiladi.
+    """
+
+    def __init__(self, chegara=None, nom='', takrorlanish=None):
+        self.chegara = chegara
+        self.nom = nom
+        self.takrorlanish = takrorlanish or getattr(settings, 'SOROV_TAKRORLANISH_CHEGARASI', 5)
+        self.soni = 0
+        self.vaqt = 0.0
+        # ko'rinish -> {manba: soni}
+        self.korinishlar = defaultdict(lambda: defaultdict(int))
+
+    def __call__(self, execute, sql, params, many, context):
+        boshlanish = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.vaqt += time.perf_counter() - boshlanish
+            self.soni += 1
+            self.korinishlar[sorov_korinishi(sql)][sorov_manbasi()] += 1
+
+    @property
+    def takrorlanganlar(self):
+        """
+        N+1 gumonlari: chegaradan ko'p takrorlangan so'rov ko'rinishlari
+
+        Returns:
+            list: [(ko'rinish, jami soni, {manba: soni}), ...] - eng ko'pi birinchi
+        """
+        natija = []
+        for korinish, manbalar in self.korinishlar.items():
+            jami = sum(manbalar.values())
+            if jami >= self.takrorlanish:
+                natija.append((korinish, jami, dict(manbalar)))
+        return sorted(natija, key=lambda qator: -qator[1])
+
+    @property
+    def oshdimi(self):
+        return self.chegara is not None and self.soni > self.chegara
+
+    def hisobot(self, barchasi=False):
+        """
+        Matnli hisobot: jami so'rovlar va takrorlangan so'rovlar manbasi bilan
+
+        Args:
+            barchasi: True - takrorlanmagan so'rovlar ham ro'yxatga qo'shiladi
+        """
+        qatorlar = [
+            f"{self.nom or 'blok'}: {self.soni} ta so'rov, {self.vaqt * 1000:.1f} ms"
+            + (f" (byudjet: {self.chegara})" if self.chegara is not None else '')
+        ]
+        takrorlanganlar = self.takrorlanganlar
+        if takrorlanganlar:
+            qatorlar.append("Takrorlangan so'rovlar (N+1 gumoni):")
+        for korinish, jami, manbalar in takrorlanganlar:
+            qatorlar.append(f"  {jami}x {korinish[:200]}")
+            for manba, soni in sorted(manbalar.items(), key=lambda qator: -qator[1]):
+                qatorlar.append(f"     {soni}x dan:")
+                for qator in manba or ("(loyiha tashqarisida)",):
+                    qatorlar.append(f"        {qator}")
+        if barchasi:
+            qatorlar.append("Barcha so'rovlar:")
+            for korinish, manbalar in self.korinishlar.items():
+                manba = max(manbalar, key=manbalar.get)
+                qatorlar.append(f"  {sum(manbalar.values())}x {korinish[:200]}")
+                qatorlar.append(f"        {manba[0] if manba else '(loyiha tashqarisida)'}")
+        return '\n'.join(qatorlar)
+
+    def tekshirish(self, rejim):
+        """
+        Byudjet va takrorlanishni tekshirish
+
+        Args:
+            rejim: 'log' - ogohlantirish yozish, 'xato' - SorovByudjetiOshdi
+        """
+        if not self.oshdimi and not self.takrorlanganlar:
+            return
+        if rejim == 'xato':
+            raise SorovByudjetiOshdi(self.hisobot())
+        logger.warning(self.hisobot())
+
+
+@contextmanager
+def sorovlarni_kuzatish(hisob):
+    """
+    Blok davomida barcha bazalardagi so'rovlarni hisobga yozish
+    """
+    with ExitStack() as stek:
+        for ulanish in connections.all(initialized_only=False):
+            stek.enter_context(ulanish.execute_wrapper(hisob))
+        yield hisob
+
+
+@contextmanager
+def sorov_byudjeti(chegara=None, nom='', rejim='xato', takrorlanish=None):
+    """
+    Blokdagi SQL so'rovlar sonini cheklash va N+1 ni aniqlash
+
+    Args:
+        chegara: Ruxsat etilgan so'rovlar soni (None - faqat N+1 tekshiriladi)
+        nom: Hisobotdagi nom
+        rejim: 'xato' (standart) yoki 'log'
+        takrorlanish: Nechta bir xil so'rov N+1 hisoblanadi
+            (standart: SOROV_TAKRORLANISH_CHEGARASI)
+
+    Yields:
+        SorovlarHisobi: Blok tugagach soni, vaqti va hisobotni beradi
+    """
+    hisob = SorovlarHisobi(chegara, nom, takrorlanish)
+    with sorovlarni_kuzatish(hisob):
+        yield hisob
+    hisob.tekshirish(rejim)
+
+
+def url_byudjeti(url_nomi):
+    """
+    URL nomi uchun byudjet (SOROV_BYUDJETI, yo'q bo'lsa - '*' qiymati)
+    """
+    byudjetlar = getattr(settings, 'SOROV_BYUDJETI', {})
+    return byudjetlar.get(url_nomi, byudjetlar.get('*'))
@@ -0,0 +1,341 @@
+"""
+Taklif - Qidiruv maydoni uchun avtomatik takliflar (autocomplete)
+
+Har bir harf bosilganda bazaga nomi__icontains so'rovi yuborilmaydi:
+mahsulot va kategoriya nomlari jarayon xotirasidagi indeksdan qidiriladi.
+
+Normallashtirish:
+- Kirill yozuvi lotinga o'giriladi (ўзбек -> o'zbek), apostroflar
+  (o', g', ʻ, ’) olib tashlanadi, kichik harflar, faqat harf va raqamlar
+- Shuning uchun "телефон", "Telefon" va "TELEFON" bir xil topiladi
+
+Qidirish:
+1. Prefiks - har bir nomning har bir so'zidan boshlanuvchi qatorlar
+   tartiblangan ro'yxatda saqlanadi, bisect bilan topiladi:
+   "sam" -> "Samsung Galaxy", "gal" -> "Samsung Galaxy"
+2. Trigrammalar (xato yozilganda) - prefiks yetarli natija bermasa, qidiruv
+   so'zlari lug'atdagi (barcha nomlardagi takrorlanmas so'zlar) so'zlar bilan
+   uch harfli bo'laklari bo'yicha solishtiriladi: "samsng" -> "samsung".
+   Lug'at mahsulotlardan ancha kichik - qidiruv katalog hajmiga deyarli
+   bog'liq emas
+
+Yangilanish (qarang: teglar.py):
+- 'mahsulot' tegi o'zgarsa - faqat o'zgargan mahsulotlar ('mahsulot:<id>'
+  teglari) bazadan qayta o'qiladi va indeksda almashtiriladi
+- 'kategoriya' tegi o'zgarsa - kategoriyalar qismi qayta quriladi (ular kam)
+- Teglar fayli almashtirilsa - indeks to'liq qayta quriladi
+"""
+
+import heapq
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import product
+
+from .models import Kategoriya, Mahsulot
+from .routers import asosiy_bazadan
+from .teglar import ozgargan_teglar, teg_versiyasi
+
+# Xato yozilgan so'z uchun eng kam o'xshashlik (0..1, trigrammalar ulushi)
+TRIGRAM_CHEGARASI = 0.3
+
+# Prefiks bo'yicha nechta moslik ko'rib chiqiladi (tartiblash uchun)
+PREFIKS_NOMZODLARI = 5
+
+# Trigram qidiruvida: har bir so'z uchun lug'atdan nechta o'xshash so'z
+# olinadi va qidiruvning nechta oxirgi so'zi hisobga olinadi
+TRIGRAM_NOMZODLARI = 3
+TRIGRAM_SOZLARI = 3
+
+KIRILL_LOTIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo', 'ж': 'j',
+    'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o',
+    'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'x', 'ц': 'ts',
+    'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '', 'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu',
+    'я': 'ya', 'ў': 'o', 'қ': 'q', 'ғ': 'g', 'ҳ': 'h',
+}
+_JADVAL = str.maketrans(KIRILL_LOTIN)
+
+
+# ============================================================================
+# NORMALLASHTIRISH
+# ============================================================================
+
+def normallashtirish(matn):
+    """
+    Matnni qidiruv ko'rinishiga keltirish
+
+    Masalan: "Ўзбек Телефони" -> "ozbek telefoni", "O'zbek  telefoni!" -> "ozbek telefoni"
+
+    Returns:
+        str: Bo'shliq bilan ajratilgan kichik lotin so'zlar
+    """
+    matn = unicodedata.normalize('NFC', matn).lower().translate(_JADVAL)
+    # Lotin diakritikalari (é, ü) - asosiy harfga
+    matn = ''.join(
+        belgi for belgi in unicodedata.normalize('NFKD', matn) if not unicodedata.combining(belgi)
+    ).lower()
+    sozlar, soz = [], []
+    for belgi in matn:
+        if belgi.isascii() and belgi.isalnum():
+            soz.append(belgi)
+        elif belgi in "'`ʻʼ‘’":
+            continue    # o'zbek, oʻzbek, ozbek - bir xil
+        elif soz:
+            sozlar.append(''.join(soz))
+            soz = []
+    if soz:
+        sozlar.append(''.join(soz))
+    return ' '.join(sozlar)
+
+
+@lru_cache(maxsize=100_000)
+def trigrammalar(soz):
+    """
+    So'zning uch harfli bo'laklari (boshi va oxiri bo'shliq bilan to'ldiriladi)
+
+    Masalan: "olma" -> {'  o', ' ol', 'olm', 'lma', 'ma '}
+    """
+    soz = f'  {soz} '
+    return frozenset(soz[i:i + 3] for i in range(len(soz) - 2))
+
+
+# ============================================================================
+# INDEKS
+# ============================================================================
+
+class TaklifIndeksi:
+    """
+    Mahsulot va kategoriya nomlarining jarayon darajasidagi indeksi
+
+    Tuzilma:
+        _elementlar:  (tur, id) -> {'tur', 'id', 'nomi', 'slug', 'sozlar'}
+        _qatorlar:    tartiblangan [(normallashgan qator, so'z o'rni, tur, id)]
+        _lugat:       so'z -> {(tur, id)} - so'z qatnashgan elementlar
+        _trigramlar:  trigram -> {so'z} - lug'atdagi so'zlar
+    """
+
+    def __init__(self):
+        self._qulf = threading.Lock()
+        self._tozalash()
+
+    def _tozalash(self):
+        self._versiyalar = {'mahsulot': None, 'kategoriya': None}
+        self._elementlar = {}
+        self._qatorlar = []
+        self._lugat = defaultdict(set)
+        self._trigramlar = defaultdict(set)
+
+    # ------------------------------------------------------------------------
+    # Qo'shish va o'chirish
+    # ------------------------------------------------------------------------
+
+    def _qoshish(self, tur, element_id, nomi, slug=None, saralash=True):
+        """
+        Elementni qo'shish yoki almashtirish
+
+        saralash=False - qatorlar ro'yxat oxiriga qo'shiladi (to'liq yuklashda
+        oxirida bir marta sort() qilinadi - har birini insort qilishdan tez)
+        """
+        kalit = (tur, element_id)
+        self._olib_tashlash(kalit)
+        sozlar = normallashtirish(nomi).split()
+        if not sozlar:
+            return
+        self._elementlar[kalit] = {'tur': tur, 'id': element_id, 'nomi': nomi, 'slug': slug, 'sozlar': sozlar}
+        for orin, soz in enumerate(sozlar):
+            qator = (' '.join(sozlar[orin:]), orin, tur, element_id)
+            if saralash:
+                insort(self._qatorlar, qator)
+            else:
+                self._qatorlar.append(qator)
+            if soz not in self._lugat:
+                for trigram in trigrammalar(soz):
+                    self._trigramlar[trigram].add(soz)
+            self._lugat[soz].add(kalit)
+
+    def _olib_tashlash(self, kalit):
+        element = self._elementlar.pop(kalit, None)
+        if element is None:
+            return
+        tur, element_id = kalit
+        sozlar = element['sozlar']
+        for orin, soz in enumerate(sozlar):
+            qator = (' '.join(sozlar[orin:]), orin, tur, element_id)
+            i = bisect_left(self._qatorlar, qator)
+            if i < len(self._qatorlar) and self._qatorlar[i] == qator:
+                del self._qatorlar[i]
+            elementlar = self._lugat.get(soz)
+            if elementlar is not None:
+                elementlar.discard(kalit)
+                if not elementlar:
+                    # So'z boshqa hech qayerda yo'q - lug'atdan ham olib tashlanadi
+                    del self._lugat[soz]
+                    for trigram in trigrammalar(soz):
+                        self._trigramlar[trigram].discard(soz)
+
+    # ------------------------------------------------------------------------
+    # Yuklash
+    # ------------------------------------------------------------------------
+
+    def _mahsulotlarni_yuklash(self, idlar=None):
+        """
+        Mavjud mahsulotlarni yuklash (idlar berilsa - faqat shularni yangilash)
+        """
+        queryset = Mahsulot.objects.all() if idlar is None else Mahsulot.objects.filter(id__in=idlar)
+        qolganlar = set(idlar or ())
+        for mahsulot_id, nomi, slug, holat in queryset.values_list('id', 'nomi', 'slug', 'holat').order_by():
+            qolganlar.discard(mahsulot_id)
+            if holat == 'mavjud':
+                self._qoshish('mahsulot', mahsulot_id, nomi, slug, saralash=idlar is not None)
+            else:
+                self._olib_tashlash(('mahsulot', mahsulot_id))
+        for mahsulot_id in qolganlar:   # O'chirilgan mahsulotlar
+            self._olib_tashlash(('mahsulot', mahsulot_id))
+
+    def _kategoriyalarni_yuklash(self):
+        for kalit in [kalit for kalit in self._elementlar if kalit[0] == 'kategoriya']:
+            self._olib_tashlash(kalit)
+        for kategoriya_id, nomi in Kategoriya.objects.filter(faol=True).values_list('id', 'nomi').order_by():
+            self._qoshish('kategoriya', kategoriya_id, nomi)
+
+    def _tekshirish(self):
+        """
+        Teglar o'zgargan bo'lsa, indeksni yangilash (qulf ichida chaqiriladi)
+
+        Versiya so'rovdan OLDIN olinadi - yuklash vaqtida bo'lgan o'zgarish
+        keyingi murojaatda yana qo'llanadi.
+        """
+        versiyalar = {teg: teg_versiyasi(teg) for teg in self._versiyalar}
+        if versiyalar == self._versiyalar:
+            return
+
+        oldingi = self._versiyalar['mahsulot']
+        ozgarganlar = None if oldingi is None else ozgargan_teglar('mahsulot:', oldingi)
+        if not ozgarganlar and versiyalar['mahsulot'] != oldingi:
+            # Faqat umumiy 'mahsulot' tegi (masalan, seed_katalog yoki
+            # bulk_create dan keyin) - qaysi mahsulotlar o'zgargani noma'lum
+            ozgarganlar = None
+        # Asosiy bazadan: replika hali yangi ma'lumotni olmagan bo'lsa, eski
+        # nom yangi versiya ostida indeksda qolib ketardi
+        with asosiy_bazadan():
+            if ozgarganlar is None:
+                # Birinchi yuklash, teglar fayli almashtirilgan yoki butun katalog o'zgargan
+                self._tozalash()
+                self._mahsulotlarni_yuklash()
+                self._qatorlar.sort()
+                self._kategoriyalarni_yuklash()
+            else:
+                if ozgarganlar:
+                    self._mahsulotlarni_yuklash([int(teg.partition(':')[2]) for teg in ozgarganlar])
+                if versiyalar['kategoriya'] != self._versiyalar['kategoriya']:
+                    self._kategoriyalarni_yuklash()
+        self._versiyalar = versiyalar
+
+    # ------------------------------------------------------------------------
+    # Qidirish
+    # ------------------------------------------------------------------------
+
+    def _prefiks(self, qidiruv, soni):
+        """
+        Prefiks bo'yicha mosliklar: (tur, id) -> so'z o'rni (0 - nom boshida)
+        """
+        topilganlar = {}
+        i = bisect_left(self._qatorlar, (qidiruv,))
+        while i < len(self._qatorlar) and len(topilganlar) < soni * PREFIKS_NOMZODLARI:
+            qator, orin, tur, element_id = self._qatorlar[i]
+            if not qator.startswith(qidiruv):
+                break
+            kalit = (tur, element_id)
+            topilganlar[kalit] = min(orin, topilganlar.get(kalit, orin))
+            i += 1
+        return topilganlar
+
+    def _oxshashlar(self, qidiruv, soni, chiqarib_tashlash):
+        """
+        Trigrammalar bo'yicha o'xshash elementlar (eng o'xshashlari birinchi)
+
+        Har bir qidiruv so'zi uchun lug'atdan eng o'xshash bir nechta so'z
+        tanlanadi. So'zlar kombinatsiyalari ball (o'xshashliklar o'rtachasi)
+        kamayishi tartibida ko'rib chiqiladi va kombinatsiyadagi barcha
+        so'zlar qatnashgan elementlar olinadi (to'plamlar kesishmasi) -
+        har bir mahsulot alohida baholanmaydi.
+
+        Returns:
+            list: (tur, id) kalitlari
+        """
+        sozlar = qidiruv.split()[-TRIGRAM_SOZLARI:]
+        variantlar = []
+        for soz in sozlar:
+            soz_trigramlari = trigrammalar(soz)
+            umumiy = Counter()
+            for trigram in soz_trigramlari:
+                umumiy.update(self._trigramlar.get(trigram, ()))
+            oxshashlar = heapq.nlargest(TRIGRAM_NOMZODLARI, (
+                (ortaq / (len(soz_trigramlari) + len(trigrammalar(lugat_sozi)) - ortaq), lugat_sozi)
+                for lugat_sozi, ortaq in umumiy.items()
+            ))
+            # None - bu so'z e'tiborga olinmaydi (masalan, ortiqcha yozilgan so'z)
+            variantlar.append([*oxshashlar, (0.0, None)])
+
+        kombinatsiyalar = sorted(
+            ((sum(oxshashlik for oxshashlik, _ in kombinatsiya) / len(sozlar), kombinatsiya)
+             for kombinatsiya in product(*variantlar)),
+            key=lambda juftlik: -juftlik[0],
+        )
+        natija, korilgan = [], set(chiqarib_tashlash)
+        for ball, kombinatsiya in kombinatsiyalar:
+            if ball < TRIGRAM_CHEGARASI or len(natija) >= soni:
+                break
+            toplamlar = sorted((self._lugat[soz] for _, soz in kombinatsiya if soz is not None), key=len)
+            mos = toplamlar[0].intersection(*toplamlar[1:]) - korilgan
+            yangilar = heapq.nsmallest(
+                soni - len(natija), mos, key=lambda kalit: (len(self._elementlar[kalit]['nomi']), kalit),
+            )
+            natija += yangilar
+            korilgan.update(yangilar)
+        return natija
+
+    def qidirish(self, matn, soni=10):
+        """
+        Matn uchun takliflar
+
+        Avval prefiks mosliklari (nom boshidagilar birinchi, keyin
+        kategoriyalar, keyin qisqa nomlar), yetmasa - trigrammalar bo'yicha
+        eng o'xshashlari.
+
+        Args:
+            matn: Foydalanuvchi yozgan matn (istalgan yozuvda)
+            soni: Eng ko'p takliflar soni
+
+        Returns:
+            list: [{'tur': 'mahsulot'|'kategoriya', 'id', 'nomi', 'slug'}, ...]
+        """
+        qidiruv = normallashtirish(matn)
+        if not qidiruv:
+            return []
+
+        with self._qulf:
+            self._tekshirish()
+            topilganlar = self._prefiks(qidiruv, soni)
+            kalitlar = heapq.nsmallest(soni, topilganlar, key=lambda kalit: (
+                topilganlar[kalit] > 0, kalit[0] != 'kategoriya', len(self._elementlar[kalit]['nomi']), kalit,
+            ))
+            if len(kalitlar) < soni and len(qidiruv) >= 3:
+                kalitlar += self._oxshashlar(qidiruv, soni - len(kalitlar), kalitlar)
+            return [
+                {nom: self._elementlar[kalit][nom] for nom in ('tur', 'id', 'nomi', 'slug')} for kalit in kalitlar
+            ]
+
+    def tozalash(self):
+        """
+        Indeksni tozalash - keyingi murojaatda to'liq qayta quriladi
+        """
+        with self._qulf:
+            self._tozalash()
+
+
+# Jarayon bo'yicha yagona indeks
+taklif_indeksi = TaklifIndeksi()
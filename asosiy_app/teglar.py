@@ -0,0 +1,289 @@
+"""
+Teglar - Kesh teglarini bekor qilish shinasi (workerlar orasida)
+
+Gunicorn bir nechta worker (jarayon) ishga tushiradi. Har bir worker
+o'z xotirasida ma'lumot saqlaydi (kategoriyalar reestri, lokal kesh).
+Bitta workerda mahsulot o'zgarsa, qolganlari bu haqda bilishi kerak.
+
+Teglar:
+- Keshlangan har bir yozuv o'zi bog'liq bo'lgan teglarni e'lon qiladi
+  Masalan: 'mahsulot', 'mahsulot:42', 'kategoriya:3'
+- Signallar o'zgargan obyekt teglarini "bekor qilingan" deb e'lon qiladi
+- Tegning versiyasi o'zgaradi va unga bog'liq kesh kalitlari eskiradi
+
+Shina (transport):
+- Umumiy, faqat oxiriga yoziladigan fayl (KESH_TEGLAR_FAYLI)
+- Har bir e'lon - bitta qator: "mahsulot mahsulot:42\\n"
+- Workerlar faylni os.stat() bilan tekshiradi (mikrosekundlar) va
+  yangi qatorlarni o'qiydi - ma'lumotlar bazasiga so'rov yo'q
+- Teg versiyasi = uni oxirgi marta e'lon qilgan qatorning fayldagi o'rni.
+  Barcha workerlar bir xil faylni o'qigani uchun versiyalar hamma joyda
+  bir xil bo'ladi va umumiy keshdagi (Redis) kalitlar ham mos keladi
+"""
+
+import os
+import threading
+import uuid
+
+from django.conf import settings
+
+# ============================================================================
+# BEKOR QILISH SHINASI
+# ============================================================================
+
+class BekorQilishShinasi:
+    """
+    Fayl orqali ishlaydigan teglarni bekor qilish shinasi
+
+    Fayl tuzilishi:
+        # <fayl identifikatori>
+        mahsulot mahsulot:42
+        kategoriya kategoriya:3
+        ...
+
+    Fayl KESH_TEGLAR_FAYLI_HAJMI dan oshsa, yangisi bilan almashtiriladi.
+    Yangi faylning identifikatori boshqacha bo'lgani uchun barcha teglar
+    versiyasi o'zgaradi (to'liq bekor qilish) - bu kamdan-kam bo'ladi.
+    """
+
+    def __init__(self, fayl_yoli=None, maksimal_hajm=None):
+        self._fayl_yoli = fayl_yoli
+        self._maksimal_hajm = maksimal_hajm
+        self._qulf = threading.Lock()
+        self._fayl_belgisi = None   # (st_dev, st_ino) - fayl almashganini sezish uchun
+        self._fayl_id = 'yoq'       # Fayl boshidagi identifikator
+        self._orin = 0              # Qayergacha o'qilgan (bayt)
+        self._versiyalar = {}       # teg -> qator o'rni
+
+    @property
+    def fayl_yoli(self):
+        if self._fayl_yoli is None:
+            return str(getattr(settings, 'KESH_TEGLAR_FAYLI', settings.BASE_DIR / 'kesh_teglari.log'))
+        return str(self._fayl_yoli)
+
+    @property
+    def maksimal_hajm(self):
+        if self._maksimal_hajm is None:
+            return getattr(settings, 'KESH_TEGLAR_FAYLI_HAJMI', 1024 * 1024)
+        return self._maksimal_hajm
+
+    # ------------------------------------------------------------------------
+    # O'qish
+    # ------------------------------------------------------------------------
+
+    def yangilash(self):
+        """
+        Fayldagi yangi e'lonlarni o'qib, teg versiyalarini yangilash
+
+        Har bir versiya so'ralganda chaqiriladi. Fayl o'zgarmagan bo'lsa,
+        faqat bitta os.stat() chaqiruvi bajariladi.
+        """
+        try:
+            holat = os.stat(self.fayl_yoli)
+        except FileNotFoundError:
+            if self._fayl_belgisi is not None:
+                with self._qulf:
+                    self._boshidan(None, 'yoq')
+            return
+
+        belgi = (holat.st_dev, holat.st_ino)
+        if belgi == self._fayl_belgisi and holat.st_size == self._orin:
+            return  # Yangi e'lon yo'q - eng ko'p uchraydigan holat
+
+        with self._qulf:
+            if (belgi != self._fayl_belgisi or holat.st_size < self._orin
+                    or self._sarlavha_oqish() != self._fayl_id):
+                # Fayl yangi, almashtirilgan yoki qisqartirilgan - boshidan o'qiymiz.
+                # Sarlavha ham tekshiriladi: o'chirilgan faylning inode raqami
+                # yangi faylga qayta berilishi mumkin
+                self._boshidan(belgi, None)
+            self._oqish()
+
+    def _boshidan(self, belgi, fayl_id):
+        """
+        Holatni tozalash (fayl almashtirilganda)
+        """
+        self._fayl_belgisi = belgi
+        self._fayl_id = fayl_id
+        self._orin = 0
+        self._versiyalar = {}
+
+    def _sarlavha_oqish(self):
+        """
+        Fayl boshidagi identifikatorni o'qish ("# <id>" qatori)
+        """
+        try:
+            with open(self.fayl_yoli, 'rb') as fayl:
+                qator = fayl.readline(128).decode('utf-8', 'replace').strip()
+        except FileNotFoundError:
+            return None
+        if qator.startswith('#'):
+            return qator[1:].strip()
+        return None
+
+    def _oqish(self):
+        """
+        Fayldagi o'qilmagan to'liq qatorlarni qayta ishlash
+        """
+        try:
+            with open(self.fayl_yoli, 'rb') as fayl:
+                fayl.seek(self._orin)
+                yangi = fayl.read()
+        except FileNotFoundError:
+            return
+
+        # Faqat to'liq (\n bilan tugagan) qatorlar o'qiladi - qolgani
+        # hali yozilayotgan bo'lishi mumkin
+        oxirgi = yangi.rfind(b'\n')
+        if oxirgi < 0:
+            return
+
+        orin = self._orin
+        for qator in yangi[:oxirgi + 1].splitlines(keepends=True):
+            matn = qator.decode('utf-8', 'replace').strip()
+            if matn.startswith('#'):
+                if self._fayl_id is None:
+                    self._fayl_id = matn[1:].strip()
+            else:
+                for teg in matn.split():
+                    self._versiyalar[teg] = orin
+            orin += len(qator)
+        self._orin = orin
+
+    def versiya(self, teg):
+        """
+        Tegning joriy versiyasi
+
+        Args:
+            teg: Teg nomi (masalan: 'mahsulot' yoki 'mahsulot:42')
+
+        Returns:
+            str: Versiya - fayl identifikatori va oxirgi e'lon o'rni
+        """
+        self.yangilash()
+        return f'{self._fayl_id}.{self._versiyalar.get(teg, 0)}'
+
+    def ozgarganlar(self, prefiks, versiya):
+        """
+        Berilgan versiyadan keyin e'lon qilingan, prefiks bilan boshlanuvchi teglar
+
+        Xotiradagi indekslarni to'liq emas, qisman yangilash uchun
+        (masalan: 'mahsulot:' - qaysi mahsulotlar o'zgargani).
+
+        Args:
+            prefiks: Teg boshi (masalan: 'mahsulot:')
+            versiya: Avval versiya() qaytargan qiymat (istalgan teg uchun)
+
+        Returns:
+            list yoki None: Teglar; fayl almashtirilgan bo'lsa None
+            (oradagi e'lonlar noma'lum - hammasini qayta yuklash kerak)
+        """
+        self.yangilash()
+        fayl_id, _, orin = versiya.rpartition('.')
+        if fayl_id != self._fayl_id:
+            return None
+        orin = int(orin)
+        return [teg for teg, teg_orni in self._versiyalar.items() if teg_orni > orin and teg.startswith(prefiks)]
+
+    # ------------------------------------------------------------------------
+    # Yozish
+    # ------------------------------------------------------------------------
+
+    def elon_qilish(self, teglar):
+        """
+        Teglarni bekor qilingan deb e'lon qilish
+
+        Qator O_APPEND rejimida bitta write() bilan yoziladi - bir vaqtda
+        yozayotgan workerlar qatorlari aralashib ketmaydi.
+        Joriy worker e'lonni darhol o'zi ham qo'llaydi.
+
+        Args:
+            teglar: Teglar ro'yxati
+        """
+        teglar = [str(teg) for teg in teglar if teg]
+        if not teglar:
+            return
+
+        self._fayl_yaratish()
+        qator = (' '.join(teglar) + '\n').encode('utf-8')
+        fd = os.open(self.fayl_yoli, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, qator)
+            hajm = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+
+        if hajm > self.maksimal_hajm:
+            self._almashtirish()
+        self.yangilash()
+
+    def _yangi_fayl(self):
+        """
+        Identifikatorli yangi vaqtinchalik fayl yaratish
+        """
+        vaqtinchalik = f'{self.fayl_yoli}.{uuid.uuid4().hex}'
+        with open(vaqtinchalik, 'w', encoding='utf-8') as fayl:
+            fayl.write(f'# {uuid.uuid4().hex[:12]}\n')
+        return vaqtinchalik
+
+    def _fayl_yaratish(self):
+        """
+        Fayl yo'q bo'lsa, uni yaratish (bir vaqtda yaratishga chidamli)
+        """
+        if os.path.exists(self.fayl_yoli):
+            return
+        vaqtinchalik = self._yangi_fayl()
+        try:
+            # os.link - fayl allaqachon bo'lsa xato beradi, ustidan yozmaydi
+            os.link(vaqtinchalik, self.fayl_yoli)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(vaqtinchalik)
+
+    def _almashtirish(self):
+        """
+        Katta bo'lib ketgan faylni yangi bo'sh fayl bilan almashtirish
+
+        Barcha workerlar yangi fayl belgisini sezib, barcha teglarni
+        eskirgan deb hisoblaydi.
+        """
+        os.replace(self._yangi_fayl(), self.fayl_yoli)
+
+
+# Jarayon bo'yicha yagona shina
+shina = BekorQilishShinasi()
+
+
+# ============================================================================
+# QULAY FUNKSIYALAR
+# ============================================================================
+
+def teg_versiyasi(teg):
+    """
+    Tegning joriy versiyasini qaytarish
+    """
+    return shina.versiya(teg)
+
+
+def teglar_versiyasi(teglar):
+    """
+    Bir nechta teg versiyalaridan bitta satr yasash (kesh kaliti uchun)
+
+    Masalan: teglar_versiyasi(['mahsulot', 'sharh']) -> '3f2a9c01b7e4.120,3f2a9c01b7e4.0'
+    """
+    return ','.join(teg_versiyasi(teg) for teg in teglar)
+
+
+def ozgargan_teglar(prefiks, versiya):
+    """
+    Versiyadan keyin o'zgargan teglar (qarang: BekorQilishShinasi.ozgarganlar)
+    """
+    return shina.ozgarganlar(prefiks, versiya)
+
+
+def teglarni_bekor_qilish(teglar):
+    """
+    Teglarni barcha workerlarda bekor qilish
+    """
+    shina.elon_qilish(teglar)
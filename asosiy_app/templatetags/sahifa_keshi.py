@@ -0,0 +1,73 @@
+"""
+Sahifa keshi uchun shablon teglari
+
+Keshlanadigan sahifalarda har bir foydalanuvchi uchun alohida bo'lgan
+qismlar ("teshiklar") bor: xabarlar, foydalanuvchi menyusi, CSRF token.
+Bu qismlar keshga yozilmaydi - ularning o'rniga belgi (placeholder)
+qo'yiladi va sahifa ko'rsatilayotganda SahifaKeshiMiddleware
+belgilarni joriy so'rov uchun render qilingan HTML bilan almashtiradi.
+
+Shablonda ishlatish:
+    {% load sahifa_keshi %}
+    {% shaxsiy_qism 'xabarlar' %}
+"""
+
+import re
+
+from django import template
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+# Teshik nomi -> uni to'ldiruvchi shablon
+# Faqat shu ro'yxatdagi nomlar belgiga aylantiriladi va to'ldiriladi
+SHAXSIY_QISMLAR = {
+    'foydalanuvchi_menyusi': 'qismlar/foydalanuvchi_menyusi.html',
+    'xabarlar': 'qismlar/xabarlar.html',
+    'csrf_token': 'qismlar/csrf_token.html',
+}
+
+# Keshlangan HTML ichidagi belgi: <!--shaxsiy:xabarlar-->
+BELGI_REGEX = re.compile(r'<!--shaxsiy:(\w+)-->')
+
+
+@register.simple_tag(takes_context=True)
+def shaxsiy_qism(context, nom):
+    """
+    Foydalanuvchiga xos qismni render qilish yoki uning o'rniga belgi qo'yish
+
+    Agar sahifa hozir keshga yozish uchun render qilinayotgan bo'lsa
+    (request.sahifa_keshlanmoqda = True), faqat belgi qaytariladi.
+    Aks holda qism odatdagidek shu yerning o'zida render qilinadi.
+
+    Args:
+        context: Shablon context i
+        nom: Qism nomi (SHAXSIY_QISMLAR kalitlaridan biri)
+    """
+    request = context.get('request')
+    if getattr(request, 'sahifa_keshlanmoqda', False):
+        return mark_safe(f'<!--shaxsiy:{nom}-->')
+
+    shablon = context.template.engine.get_template(SHAXSIY_QISMLAR[nom])
+    return shablon.render(context)
+
+
+def qismlarni_toldirish(html, request):
+    """
+    Keshlangan HTML dagi belgilarni joriy so'rov uchun to'ldirish
+
+    Args:
+        html: Belgilar bor HTML (str)
+        request: Joriy HTTP so'rov
+
+    Returns:
+        str: To'ldirilgan HTML
+    """
+    def almashtirish(moslik):
+        shablon = SHAXSIY_QISMLAR.get(moslik.group(1))
+        if shablon is None:
+            return moslik.group(0)
+        return render_to_string(shablon, request=request)
+
+    return BELGI_REGEX.sub(almashtirish, html)
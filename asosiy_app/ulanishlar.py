@@ -0,0 +1,60 @@
+"""
+Ulanishlar - Ma'lumotlar bazasi ulanishlari holati
+
+Har bir baza (default va replikalar) uchun joriy jarayondagi ulanish
+sozlamalari va psycopg3 ulanishlar hovuzi (pool) statistikasi.
+/ichki/ulanishlar/ sahifasi va monitoring uchun ishlatiladi.
+"""
+
+from django.db import connections
+
+
+def hovuz_statistikasi(ulanish):
+    """
+    Ulanishlar hovuzining statistikasi (psycopg_pool.ConnectionPool.get_stats)
+
+    Args:
+        ulanish: Django DatabaseWrapper
+
+    Returns:
+        dict yoki None: Hovuz ishlatilmasa None
+    """
+    if ulanish.vendor != 'postgresql' or not ulanish.settings_dict['OPTIONS'].get('pool'):
+        return None
+
+    stat = ulanish.pool.get_stats()
+    hajm = stat.get('pool_size', 0)
+    bosh = stat.get('pool_available', 0)
+    sorovlar = stat.get('requests_num', 0)
+    kutish_ms = stat.get('requests_wait_ms', 0)
+    return {
+        'min': stat.get('pool_min', 0),
+        'max': stat.get('pool_max', 0),
+        'hajm': hajm,                                   # Ochiq ulanishlar
+        'band': hajm - bosh,                            # Hozir ishlatilayotganlar
+        'bosh': bosh,
+        'kutayotganlar': stat.get('requests_waiting', 0),  # Bo'sh ulanish kutayotgan oqimlar
+        'sorovlar': sorovlar,                           # Hovuzdan jami so'rovlar
+        'kutish_ms': kutish_ms,                         # Jami kutish vaqti
+        'ortacha_kutish_ms': round(kutish_ms / sorovlar, 2) if sorovlar else 0,
+        'muddati_otganlar': stat.get('requests_errors', 0),  # timeout gacha ulanish berilmagan
+    }
+
+
+def ulanishlar_holati():
+    """
+    Barcha bazalar ulanishlari holati
+
+    Returns:
+        dict: {alias: {...}}
+    """
+    natija = {}
+    for alias in connections:
+        ulanish = connections[alias]
+        natija[alias] = {
+            'vendor': ulanish.vendor,
+            'conn_max_age': ulanish.settings_dict['CONN_MAX_AGE'],
+            'conn_health_checks': ulanish.settings_dict['CONN_HEALTH_CHECKS'],
+            'hovuz': hovuz_statistikasi(ulanish),
+        }
+    return natija
@@ -5,40 +5,72 @@ Bu faylda asosiy_app ilovasining barcha URL marshrutlari aniqlanadi.
 Har bir URL ma'lum bir view ga yo'naltiriladi.
 """
 
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, asinxron_views, views
+
+# ============================================================================
+# KATALOG SAHIFALARI (SYNC YOKI ASYNC)
+# ============================================================================
+
+def katalog_yollari(asinxron=False):
+    """
+    Faqat o'qiladigan katalog sahifalari
+
+    Args:
+        asinxron: True - asinxron_views (ASGI serveri uchun),
+            False - views dagi sync versiyalar (WSGI)
+
+    Returns:
+        list: URL marshrutlari (nomlar ikkala holatda bir xil)
+    """
+    if asinxron:
+        bosh_sahifa = asinxron_views.bosh_sahifa
+        mahsulotlar = asinxron_views.mahsulotlar
+        mahsulot_batafsil = asinxron_views.mahsulot_batafsil
+        kategoriya_mahsulotlar = asinxron_views.kategoriya_mahsulotlar
+        qidiruv = asinxron_views.qidiruv
+    else:
+        bosh_sahifa = views.bosh_sahifa
+        mahsulotlar = views.MahsulotlarListView.as_view()
+        mahsulot_batafsil = views.MahsulotDetailView.as_view()
+        kategoriya_mahsulotlar = views.kategoriya_mahsulotlar
+        qidiruv = views.qidiruv
+
+    return [
+        # Asosiy sahifa
+        # URL: /
+        path('', bosh_sahifa, name='bosh_sahifa'),
+        
+        # Mahsulotlar ro'yxati
+        # URL: /mahsulotlar/
+        path('mahsulotlar/', mahsulotlar, name='mahsulotlar'),
+        
+        # Mahsulot batafsil
+        # URL: /mahsulot/<slug>/
+        # Masalan: /mahsulot/yangi-telefon/
+        path('mahsulot/<slug:slug>/', mahsulot_batafsil, name='mahsulot_batafsil'),
+        
+        # Kategoriya bo'yicha mahsulotlar
+        # URL: /kategoriya/<id>/
+        # Masalan: /kategoriya/1/
+        path('kategoriya/<int:kategoriya_id>/', kategoriya_mahsulotlar, name='kategoriya_mahsulotlar'),
+        
+        # Qidiruv
+        # URL: /qidiruv/
+        path('qidiruv/', qidiruv, name='qidiruv'),
+    ]
+
 
 # ============================================================================
 # URL MARSHRUTLARI
 # ============================================================================
 
-urlpatterns = [
-    # Asosiy sahifa
-    # URL: /
-    path('', views.bosh_sahifa, name='bosh_sahifa'),
-    
-    # Mahsulotlar ro'yxati
-    # URL: /mahsulotlar/
-    path('mahsulotlar/', views.MahsulotlarListView.as_view(), name='mahsulotlar'),
-    
-    # Mahsulot batafsil
-    # URL: /mahsulot/<slug>/
-    # Masalan: /mahsulot/yangi-telefon/
-    path('mahsulot/<slug:slug>/', views.MahsulotDetailView.as_view(), name='mahsulot_batafsil'),
-    
+urlpatterns = katalog_yollari(settings.ASINXRON_VIEWLAR) + [
     # Sharh qo'shish
     # URL: /mahsulot/<slug>/sharh-qoshish/
     path('mahsulot/<slug:mahsulot_slug>/sharh-qoshish/', views.sharh_qoshish, name='sharh_qoshish'),
     
-    # Kategoriya bo'yicha mahsulotlar
-    # URL: /kategoriya/<id>/
-    # Masalan: /kategoriya/1/
-    path('kategoriya/<int:kategoriya_id>/', views.kategoriya_mahsulotlar, name='kategoriya_mahsulotlar'),
-    
-    # Qidiruv
-    # URL: /qidiruv/
-    path('qidiruv/', views.qidiruv, name='qidiruv'),
-    
     # Autentifikatsiya
     # Ro'yxatdan o'tish
     # URL: /royxatdan-otish/
@@ -60,6 +92,20 @@ urlpatterns = [
     # URL: /profil/tahrirlash/
     path('profil/tahrirlash/', views.profil_tahrirlash, name='profil_tahrirlash'),
     
+    # Savat (cookie da, bazaga yozmasdan) - qarang: savat.py
+    # URL: /savat/
+    path('savat/', views.savat, name='savat'),
+    
+    # URL: /savat/<id>/qoshish/
+    path('savat/<int:mahsulot_id>/qoshish/', views.savatga_qoshish, name='savatga_qoshish'),
+    
+    # URL: /savat/<id>/ozgartirish/
+    path('savat/<int:mahsulot_id>/ozgartirish/', views.savat_ozgartirish, name='savat_ozgartirish'),
+    
+    # Buyurtma berish
+    # URL: /buyurtma/
+    path('buyurtma/', views.buyurtma_berish, name='buyurtma_berish'),
+    
     # Haqida
     # URL: /haqida/
     path('haqida/', views.haqida, name='haqida'),
@@ -67,6 +113,35 @@ urlpatterns = [
     # Aloqa
     # URL: /aloqa/
     path('aloqa/', views.aloqa, name='aloqa'),
+    
+    # Ichki: ma'lumotlar bazasi ulanishlari holati (JSON, monitoring uchun)
+    # URL: /ichki/ulanishlar/
+    path('ichki/ulanishlar/', views.ichki_ulanishlar, name='ichki_ulanishlar'),
+    
+    # Prometheus metrikalari (ICHKI_TOKEN yoki admin)
+    # URL: /metrics
+    path('metrics', views.metrikalar, name='metrikalar'),
+    
+    # JSON API (mobil ilova uchun, faqat o'qish) - qarang: api.py
+    # URL: /api/v1/mahsulotlar/
+    path('api/v1/mahsulotlar/', api.mahsulotlar, name='api_mahsulotlar'),
+    
+    # URL: /api/v1/mahsulotlar/<slug>/
+    path('api/v1/mahsulotlar/<slug:slug>/', api.mahsulot, name='api_mahsulot'),
+    
+    # URL: /api/v1/mahsulotlar/<slug>/sharhlar/
+    path('api/v1/mahsulotlar/<slug:slug>/sharhlar/', api.sharhlar, name='api_sharhlar'),
+    
+    # Bir nechta mahsulot bitta so'rovda
+    # URL: /api/v1/mahsulotlar-toplami/?slug=a,b,c
+    path('api/v1/mahsulotlar-toplami/', api.mahsulotlar_toplami, name='api_mahsulotlar_toplami'),
+    
+    # URL: /api/v1/kategoriyalar/
+    path('api/v1/kategoriyalar/', api.kategoriyalar, name='api_kategoriyalar'),
+    
+    # Qidiruv takliflari (har bir harf bosilganda)
+    # URL: /api/taklif/?q=tel
+    path('api/taklif/', api.taklif, name='api_taklif'),
 ]
 
 """
@@ -0,0 +1,264 @@
+"""
+Vaqtlar - so'rov fazalari vaqti (Server-Timing)
+
+Sahifa sekin bo'lsa, vaqt qayerga ketganini ko'rsatadi: har bir so'rov
+uchun SorovVaqtlariMiddleware quyidagilarni yig'adi va Server-Timing
+sarlavhasiga yozadi (brauzer devtools -> Network -> Timing):
+
+- db      - barcha bazalardagi SQL so'rovlar vaqti va soni (execute_wrapper)
+- shablon - eng tashqi shablonlar render vaqti ({% include %} ichidagilar
+            tashqi shablon vaqtiga kiradi)
+- kesh    - kesh o'qishlari (get, get_many) vaqti, hit va miss soni
+- signal  - asosiy_app.signals qabul qiluvchilari vaqti va soni
+- jami    - butun so'rov (keyingi middleware lar, view va javob)
+
+Fazalar bir-birining ichida bo'lishi mumkin: shablondagi lazy QuerySet
+so'rovi ham db, ham shablon vaqtiga kiradi; signal ichidagi so'rov - db
+va signal vaqtiga. Shuning uchun ularning yig'indisi jami dan oshishi mumkin.
+
+O'lchagichlar bir marta o'rnatiladi (apps.py -> AsosiyAppConfig.ready) va
+faqat joriy so'rov holati (ContextVar) bo'lganda ishlaydi - boshqa paytda
+qo'shimcha ish bitta ContextVar.get(). Holat ContextVar da bo'lgani uchun
+async rejimda ham har bir so'rov o'z hisobiga ega, sync_to_async oqimlari
+uni ko'radi, fon oqimlari (blokni_fonda_qurish) esa hisobga kirmaydi.
+
+Sozlamalar: SOROV_VAQTLARI (sarlavha), SOROV_VAQTLARI_JURNALI (har bir
+so'rov uchun JSON qator 'asosiy_app.vaqtlar' loggeriga), METRIKALAR
+(Prometheus metrikalari - metrikalar.py).
+"""
+
+import functools
+import json
+import logging
+import time
+from contextvars import ContextVar
+
+from django.core.cache import caches
+from django.dispatch import receiver as django_receiver
+from django.template.base import Template
+
+logger = logging.getLogger(__name__)
+
+# Joriy so'rovning hisobi (so'rovdan tashqarida - None)
+_joriy = ContextVar('sorov_vaqtlari', default=None)
+
+# cache.get(kalit, default) da hit va miss ni ajratish uchun
+_YOQ = object()
+
+
+class SorovVaqtlari:
+    """
+    Bitta so'rov fazalarining vaqti (millisekund) va sonlari
+    """
+
+    def __init__(self):
+        self.boshlanish = time.perf_counter()
+        self.jami_ms = 0.0
+        self.db_ms = 0.0
+        self.db_soni = 0
+        self.shablon_ms = 0.0
+        self.kesh_ms = 0.0
+        self.kesh_hit = 0
+        self.kesh_miss = 0
+        self.signal_ms = 0.0
+        self.signal_soni = 0
+        self.signallar = []   # [(qabul qiluvchi nomi, sekund), ...] - metrikalar uchun
+        # Ichma-ich chaqiruvlar vaqti ikki marta hisoblanmasligi uchun
+        self.chuqurlik = {'shablon': 0, 'kesh': 0, 'signal': 0}
+
+    def tugatish(self):
+        self.jami_ms = (time.perf_counter() - self.boshlanish) * 1000
+
+    def sarlavha(self):
+        """
+        Server-Timing sarlavhasi qiymati
+        """
+        return ', '.join([
+            f'db;dur={self.db_ms:.2f};desc="SQL: {self.db_soni}"',
+            f'shablon;dur={self.shablon_ms:.2f};desc="Shablonlar"',
+            f'kesh;dur={self.kesh_ms:.2f};desc="Kesh: {self.kesh_hit} hit, {self.kesh_miss} miss"',
+            f'signal;dur={self.signal_ms:.2f};desc="Signallar: {self.signal_soni}"',
+            f'jami;dur={self.jami_ms:.2f}',
+        ])
+
+    def lugat(self):
+        return {
+            'jami_ms': round(self.jami_ms, 2),
+            'db_ms': round(self.db_ms, 2),
+            'db_soni': self.db_soni,
+            'shablon_ms': round(self.shablon_ms, 2),
+            'kesh_ms': round(self.kesh_ms, 2),
+            'kesh_hit': self.kesh_hit,
+            'kesh_miss': self.kesh_miss,
+            'signal_ms': round(self.signal_ms, 2),
+            'signal_soni': self.signal_soni,
+        }
+
+
+def hisob_boshlash():
+    """
+    Joriy kontekst uchun yangi hisob
+
+    Returns:
+        tuple: (SorovVaqtlari, token) - token hisob_tugatish() ga beriladi
+    """
+    hisob = SorovVaqtlari()
+    return hisob, _joriy.set(hisob)
+
+
+def hisob_tugatish(token):
+    _joriy.reset(token)
+
+
+def jurnalga_yozish(request, response, hisob):
+    """
+    Strukturali jurnal qatori: URL nomi, status va fazalar
+    """
+    logger.info(json.dumps({
+        'url_nomi': getattr(request.resolver_match, 'url_name', None),
+        'method': request.method,
+        'yol': request.path,
+        'status': response.status_code,
+        **hisob.lugat(),
+    }, ensure_ascii=False))
+
+
+# ============================================================================
+# O'LCHAGICHLAR
+# ============================================================================
+
+def _faza(nom, asl):
+    """
+    Funksiyani o'rab, vaqtini hisobning {nom}_ms maydoniga qo'shish
+
+    Faqat eng tashqi chaqiruv o'lchanadi (chuqurlik bo'yicha).
+    """
+    maydon = f'{nom}_ms'
+
+    @functools.wraps(asl)
+    def olchanadigan(*args, **kwargs):
+        hisob = _joriy.get()
+        if hisob is None or hisob.chuqurlik[nom]:
+            return asl(*args, **kwargs)
+        hisob.chuqurlik[nom] += 1
+        boshlanish = time.perf_counter()
+        try:
+            return asl(*args, **kwargs)
+        finally:
+            setattr(hisob, maydon, getattr(hisob, maydon) + (time.perf_counter() - boshlanish) * 1000)
+            hisob.chuqurlik[nom] -= 1
+
+    olchanadigan.sorov_vaqtlari = True
+    return olchanadigan
+
+
+def db_orovchi(execute, sql, params, many, context):
+    """
+    execute_wrapper: SQL so'rovlar soni va vaqti
+    """
+    hisob = _joriy.get()
+    if hisob is None:
+        return execute(sql, params, many, context)
+    boshlanish = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        hisob.db_ms += (time.perf_counter() - boshlanish) * 1000
+        hisob.db_soni += 1
+
+
+def db_orovchini_ornatish(sender, connection, **kwargs):
+    """
+    Har bir yangi ulanishga db_orovchi (connection_created signali)
+
+    Ro'yxat boshiga qo'yiladi (sekin_sorovlar.yozuvchini_ornatish kabi):
+    vaqtinchalik execute_wrapper() bloklari oxirgi elementni olib tashlaydi.
+    """
+    if db_orovchi not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, db_orovchi)
+
+
+def _kesh_get(asl):
+    @functools.wraps(asl)
+    def get(self, key, default=None, version=None):
+        hisob = _joriy.get()
+        if hisob is None or hisob.chuqurlik['kesh']:
+            return asl(self, key, default, version)
+        qiymat = get_olchanadigan(self, key, _YOQ, version)
+        if qiymat is _YOQ:
+            hisob.kesh_miss += 1
+            return default
+        hisob.kesh_hit += 1
+        return qiymat
+
+    get_olchanadigan = _faza('kesh', asl)
+    get.sorov_vaqtlari = True
+    return get
+
+
+def _kesh_get_many(asl):
+    @functools.wraps(asl)
+    def get_many(self, keys, version=None):
+        hisob = _joriy.get()
+        if hisob is None or hisob.chuqurlik['kesh']:
+            return asl(self, keys, version)
+        keys = list(keys)
+        natija = get_many_olchanadigan(self, keys, version)
+        hisob.kesh_hit += len(natija)
+        hisob.kesh_miss += len(keys) - len(natija)
+        return natija
+
+    get_many_olchanadigan = _faza('kesh', asl)
+    get_many.sorov_vaqtlari = True
+    return get_many
+
+
+def receiver(signal, **kwargs):
+    """
+    django.dispatch.receiver + qabul qiluvchi vaqtini signal fazasiga qo'shish
+
+    signals.py dagi qabul qiluvchilar shu dekorator bilan ulanadi.
+    """
+    def dekorator(funksiya):
+        # Bir nechta @receiver bir xil o'ralgan funksiyani ulaydi. U asl
+        # funksiya atributida saqlanadi: signal qabul qiluvchini kuchsiz
+        # havola bilan ushlaydi, modulda esa asl funksiya qoladi
+        qabul_qiluvchi = getattr(funksiya, 'qabul_qiluvchi', None)
+        if qabul_qiluvchi is None:
+            olchanadigan = _faza('signal', funksiya)
+
+            @functools.wraps(funksiya)
+            def qabul_qiluvchi(*args, **kw):
+                hisob = _joriy.get()
+                if hisob is None:
+                    return funksiya(*args, **kw)
+                hisob.signal_soni += 1
+                boshlanish = time.perf_counter()
+                try:
+                    return olchanadigan(*args, **kw)
+                finally:
+                    hisob.signallar.append((funksiya.__name__, time.perf_counter() - boshlanish))
+
+            funksiya.qabul_qiluvchi = qabul_qiluvchi
+        django_receiver(signal, **kwargs)(qabul_qiluvchi)
+        return funksiya
+
+    return dekorator
+
+
+def ornatish():
+    """
+    Shablon va kesh o'lchagichlarini o'rnatish (bir marta, AsosiyAppConfig.ready)
+
+    Kesh uchun - sozlangan har bir backend classining get va get_many
+    metodlari (ichma-ich chaqiruvlar, masalan DatabaseCache.get ->
+    get_many, bir marta hisoblanadi).
+    """
+    if not getattr(Template.render, 'sorov_vaqtlari', False):
+        Template.render = _faza('shablon', Template.render)
+    for alias in caches.settings:
+        backend = type(caches[alias])
+        if not getattr(backend.get, 'sorov_vaqtlari', False):
+            backend.get = _kesh_get(backend.get)
+        if not getattr(backend.get_many, 'sorov_vaqtlari', False):
+            backend.get_many = _kesh_get_many(backend.get_many)
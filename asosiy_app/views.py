@@ -9,18 +9,32 @@ Django Views:
 - Class-based views (CBV) - classlar (ListView, DetailView va h.k.)
 """
 
+import hmac
+import math
+import os
+
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth import login, logout, authenticate
+from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
-from django.db.models import Q, Avg
-from django.http import JsonResponse
+from django.db.models import F, Q, Avg
+from django.http import HttpResponse, JsonResponse, Http404
 from django.core.paginator import Paginator
-
-from .models import Mahsulot, Kategoriya, Sharh, Profil
+from django.views.decorators.http import require_POST
+
+from .models import Mahsulot, Sharh, MiqdorYetarliEmas, VersiyaEskirgan
+from .api import MAKS_ID
+from .backends import profil_olish
+from .cheklov import kirish_cheklovi, kirish_xatosi
+from .kesh import bosh_sahifa_bloklari, kategoriya_reestri, korish_hisoblanadimi
+from .metrikalar import olchash, prometheus_matni
+from .routers import yopishtirmasdan
+from .savat import Savat, SavatXatosi, buyurtma_yaratish
+from .ulanishlar import ulanishlar_holati
 from .forms import (RoyxatdanOtishForm, KirishForm, ProfilTahrirlashForm, 
                     FoydalanuvchiTahrirlashForm, MahsulotForm, SharhForm, QidiruvForm)
 
@@ -41,21 +55,10 @@ def bosh_sahifa(request):
     Returns:
         HttpResponse: Render qilingan HTML sahifa
     """
-    # Mashhur mahsulotlarni olish (birinchi 8 ta)
-    mashhur_mahsulotlar = Mahsulot.objects.filter(mashhur=True, holat='mavjud')[:8]
-    
-    # Yangi mahsulotlarni olish (birinchi 8 ta)
-    yangi_mahsulotlar = Mahsulot.objects.filter(yangi=True, holat='mavjud').order_by('-yaratilgan_sana')[:8]
-    
-    # Barcha faol kategoriyalarni olish
-    kategoriyalar = Kategoriya.objects.filter(faol=True)
-    
-    # Context - shablonga uzatiladigan ma'lumotlar
-    context = {
-        'mashhur_mahsulotlar': mashhur_mahsulotlar,
-        'yangi_mahsulotlar': yangi_mahsulotlar,
-        'kategoriyalar': kategoriyalar,
-    }
+    # Mashhur mahsulotlar, yangi mahsulotlar va kategoriyalar bloklari
+    # keshdan tayyor HTML ko'rinishida olinadi (qarang: kesh.py).
+    # Issiq keshda bu sahifa ma'lumotlar bazasiga umuman murojaat qilmaydi.
+    context = bosh_sahifa_bloklari()
     
     return render(request, 'asosiy_app/bosh_sahifa.html', context)
 
@@ -120,7 +123,7 @@ class MahsulotlarListView(ListView):
         Qo'shimcha context ma'lumotlarini qo'shish
         """
         context = super().get_context_data(**kwargs)
-        context['kategoriyalar'] = Kategoriya.objects.filter(faol=True)
+        context['kategoriyalar'] = kategoriya_reestri.royxat()
         context['qidiruv_form'] = QidiruvForm(self.request.GET)
         return context
 
@@ -146,9 +149,13 @@ class MahsulotDetailView(DetailView):
         Mahsulotni olish va ko'rilganlar sonini oshirish
         """
         obj = super().get_object(queryset)
-        # Ko'rilganlar sonini oshirish
+        if not korish_hisoblanadimi(self.request):
+            return obj
+        # Ko'rilganlar sonini oshirish (hisoblagich - so'rov replikadan o'qishda davom etadi).
+        # F() bilan bitta UPDATE - bir vaqtdagi so'rovlar bir-birining hisobini yo'qotmaydi
         obj.korilganlar_soni += 1
-        obj.save(update_fields=['korilganlar_soni'])
+        with yopishtirmasdan(), olchash('korish_yozish_seconds'):
+            Mahsulot.objects.filter(pk=obj.pk).update(korilganlar_soni=F('korilganlar_soni') + 1)
         return obj
     
     def get_context_data(self, **kwargs):
@@ -158,7 +165,10 @@ class MahsulotDetailView(DetailView):
         context = super().get_context_data(**kwargs)
         
         # Mahsulotga tegishli tasdiqlangan sharhlarni olish
-        context['sharhlar'] = self.object.sharhlar.all().order_by('-yaratilgan_sana')
+        # select_related - har bir sharh muallifi uchun alohida so'rov yubormaslik
+        context['sharhlar'] = self.object.sharhlar.tasdiqlangan().select_related(
+            'foydalanuvchi'
+        ).order_by('-yaratilgan_sana')
         
         # Sharh formasi
         context['sharh_form'] = SharhForm()
@@ -262,17 +272,29 @@ def kirish(request):
         return redirect('bosh_sahifa')
     
     if request.method == 'POST':
+        # Parolni tekshirishdan oldin urinishlar tezligini cheklash
+        # (parol hashlash qimmat - hujum workerlar CPU sini band qilmasligi uchun)
+        kutish = kirish_cheklovi(request, request.POST.get('username'))
+        if kutish:
+            kutish = math.ceil(kutish)
+            messages.error(request, f"Juda ko'p urinish. {kutish} sekunddan keyin qayta urinib ko'ring.")
+            # Bog'lanmagan forma - xatolarni ko'rsatish parolni tekshirishga olib kelmaydi
+            form = KirishForm(request, initial={'username': request.POST.get('username', '')})
+            response = render(request, 'asosiy_app/kirish.html', {'form': form}, status=429)
+            response['Retry-After'] = str(kutish)
+            return response
         form = KirishForm(request, data=request.POST)
+        # is_valid() parolni authenticate() orqali tekshiradi - foydalanuvchi
+        # formadan olinadi (parol ikkinchi marta hashlanmaydi)
         if form.is_valid():
-            username = form.cleaned_data.get('username')
-            password = form.cleaned_data.get('password')
-            user = authenticate(username=username, password=password)
-            if user is not None:
-                login(request, user)
-                messages.success(request, f'Xush kelibsiz, {username}!')
-                # Agar next parametri bo'lsa, u yerga yo'naltirish
-                next_url = request.GET.get('next', 'bosh_sahifa')
-                return redirect(next_url)
+            user = form.get_user()
+            login(request, user)
+            messages.success(request, f'Xush kelibsiz, {user.username}!')
+            # Agar next parametri bo'lsa, u yerga yo'naltirish
+            next_url = request.GET.get('next', 'bosh_sahifa')
+            return redirect(next_url)
+        # Faqat muvaffaqiyatsiz urinishlar foydalanuvchi nomi chelagini sarflaydi
+        kirish_xatosi(request, request.POST.get('username'))
     else:
         form = KirishForm()
     
@@ -314,15 +336,19 @@ def profil(request):
     Returns:
         HttpResponse: Render qilingan sahifa
     """
-    # Foydalanuvchi profilini olish
-    profil = request.user.profil
+    # Foydalanuvchi profilini olish (yo'q bo'lsa - yaratiladi)
+    profil = profil_olish(request.user)
     
-    # Foydalanuvchining sharhlarini olish
-    sharhlar = request.user.sharhlar.all().order_by('-yaratilgan_sana')
+    # Foydalanuvchining sharhlarini olish (mahsulot nomi va slug i bilan birga)
+    sharhlar = request.user.sharhlar.select_related('mahsulot').order_by('-yaratilgan_sana')
+    
+    # Oxirgi buyurtmalar
+    buyurtmalar = request.user.buyurtmalar.all()[:10]
     
     context = {
         'profil': profil,
         'sharhlar': sharhlar,
+        'buyurtmalar': buyurtmalar,
     }
     
     return render(request, 'asosiy_app/profil.html', context)
@@ -343,7 +369,7 @@ def profil_tahrirlash(request):
     Returns:
         HttpResponse: Render qilingan sahifa yoki redirect
     """
-    profil = request.user.profil
+    profil = profil_olish(request.user)
     
     if request.method == 'POST':
         user_form = FoydalanuvchiTahrirlashForm(request.POST, instance=request.user)
@@ -381,7 +407,10 @@ def kategoriya_mahsulotlar(request, kategoriya_id):
     Returns:
         HttpResponse: Render qilingan sahifa
     """
-    kategoriya = get_object_or_404(Kategoriya, id=kategoriya_id, faol=True)
+    # Kategoriya xotiradagi reestrdan olinadi (faqat faol kategoriyalar)
+    kategoriya = kategoriya_reestri.olish(kategoriya_id)
+    if kategoriya is None:
+        raise Http404("Kategoriya topilmadi")
     mahsulotlar = Mahsulot.objects.filter(kategoriya=kategoriya, holat='mavjud')
     
     # Pagination
@@ -401,17 +430,19 @@ def kategoriya_mahsulotlar(request, kategoriya_id):
 # QIDIRUV
 # ============================================================================
 
-def qidiruv(request):
+def qidiruv_natijalari(form):
     """
-    Mahsulotlarni qidirish view
-    
+    Qidiruv formasi bo'yicha filtrlangan mahsulotlar
+
+    Sync va async (asinxron_views.py) qidiruv sahifalari uchun umumiy.
+    Forma noto'g'ri bo'lsa, barcha mavjud mahsulotlar qaytariladi.
+
     Args:
-        request: HTTP so'rov obyekti
-        
+        form: QidiruvForm
+
     Returns:
-        HttpResponse: Render qilingan sahifa
+        QuerySet: Mahsulotlar (hali bajarilmagan)
     """
-    form = QidiruvForm(request.GET)
     mahsulotlar = Mahsulot.objects.filter(holat='mavjud')
     
     if form.is_valid():
@@ -443,6 +474,22 @@ def qidiruv(request):
         if tartiblash:
             mahsulotlar = mahsulotlar.order_by(tartiblash)
     
+    return mahsulotlar
+
+
+def qidiruv(request):
+    """
+    Mahsulotlarni qidirish view
+    
+    Args:
+        request: HTTP so'rov obyekti
+        
+    Returns:
+        HttpResponse: Render qilingan sahifa
+    """
+    form = QidiruvForm(request.GET)
+    mahsulotlar = qidiruv_natijalari(form)
+    
     # Pagination
     paginator = Paginator(mahsulotlar, 12)
     page_number = request.GET.get('page')
@@ -451,12 +498,151 @@ def qidiruv(request):
     context = {
         'form': form,
         'mahsulotlar': page_obj,
-        'natijalar_soni': mahsulotlar.count(),
+        # Paginator natijalarni allaqachon sanagan - qayta COUNT so'rovsiz
+        'natijalar_soni': paginator.count,
     }
     
     return render(request, 'asosiy_app/qidiruv.html', context)
 
 
+# ============================================================================
+# SAVAT VA BUYURTMA
+# ============================================================================
+
+def savat(request):
+    """
+    Savat sahifasi
+    
+    Savat cookie da (qarang: savat.py) - mahsulotlar joriy narxlari
+    bilan bitta so'rovda o'qiladi.
+    
+    Args:
+        request: HTTP so'rov obyekti
+        
+    Returns:
+        HttpResponse: Render qilingan sahifa
+    """
+    qatorlar, jami = Savat(request).mahsulotlar()
+    
+    context = {
+        'qatorlar': qatorlar,
+        'jami': jami,
+    }
+    
+    return render(request, 'asosiy_app/savat.html', context)
+
+
+def _miqdor(request, standart):
+    """
+    POST dagi miqdorni o'qish (noto'g'ri qiymat - standart)
+    """
+    try:
+        return int(request.POST.get('miqdor', standart))
+    except ValueError:
+        return standart
+
+
+def _sotuvdami(mahsulot_id):
+    """
+    Mahsulot bazada bor va sotuvda - aks holda 404
+    
+    Savatga faqat shunday mahsulot qo'shiladi: cookie ga mavjud bo'lmagan
+    yoki juda katta ID yozilmaydi.
+    """
+    if mahsulot_id > MAKS_ID or not Mahsulot.objects.filter(pk=mahsulot_id, holat='mavjud').exists():
+        raise Http404
+
+
+@require_POST
+def savatga_qoshish(request, mahsulot_id):
+    """
+    Mahsulotni savatga qo'shish (bazaga yozmasdan, faqat cookie)
+    
+    Args:
+        request: HTTP so'rov obyekti
+        mahsulot_id: Mahsulot ID si
+        
+    Returns:
+        HttpResponse: Savat sahifasiga redirect
+    
+    Raises:
+        Http404: Mahsulot topilmasa yoki sotuvda bo'lmasa
+    """
+    _sotuvdami(mahsulot_id)
+    savat = Savat(request)
+    try:
+        savat.qoshish(mahsulot_id, max(_miqdor(request, 1), 1))
+        messages.success(request, 'Mahsulot savatga qo\'shildi.')
+    except SavatXatosi as xato:
+        messages.error(request, str(xato))
+    
+    javob = redirect('savat')
+    savat.saqlash(javob)
+    return javob
+
+
+@require_POST
+def savat_ozgartirish(request, mahsulot_id):
+    """
+    Savatdagi mahsulot miqdorini o'zgartirish (0 - olib tashlash)
+    
+    Args:
+        request: HTTP so'rov obyekti
+        mahsulot_id: Mahsulot ID si
+        
+    Returns:
+        HttpResponse: Savat sahifasiga redirect
+    """
+    savat = Savat(request)
+    miqdor = max(_miqdor(request, 0), 0)
+    if miqdor and mahsulot_id not in savat.talablar:
+        _sotuvdami(mahsulot_id)
+    savat.ozgartirish(mahsulot_id, miqdor)
+    
+    javob = redirect('savat')
+    savat.saqlash(javob)
+    return javob
+
+
+@login_required
+@require_POST
+def buyurtma_berish(request):
+    """
+    Savatdan buyurtma berish
+    
+    Omborda yetmagan mahsulotlar savatda mavjud miqdorgacha kamaytiriladi
+    va foydalanuvchi savat sahifasiga qaytariladi.
+    
+    Args:
+        request: HTTP so'rov obyekti
+        
+    Returns:
+        HttpResponse: Profil (muvaffaqiyatli) yoki savat sahifasiga redirect
+    """
+    savat = Savat(request)
+    if not savat:
+        messages.error(request, 'Savat bo\'sh.')
+        return redirect('savat')
+    
+    try:
+        buyurtma = buyurtma_yaratish(request.user, savat.talablar)
+    except MiqdorYetarliEmas as xato:
+        for mahsulot_id, mavjud in xato.yetishmaydi.items():
+            savat.ozgartirish(mahsulot_id, mavjud)
+        messages.error(request, 'Ba\'zi mahsulotlar omborda yetarli emas - savat mavjud miqdorga moslandi.')
+        javob = redirect('savat')
+    except VersiyaEskirgan:
+        messages.error(request, 'Mahsulotlar hozirgina o\'zgartirildi. Narxlarni tekshirib, qaytadan urinib ko\'ring.')
+        javob = redirect('savat')
+    else:
+        savat.tozalash()
+        messages.success(request, f'Buyurtma #{buyurtma.pk} qabul qilindi. Jami: {buyurtma.jami:.0f} so\'m.')
+        javob = redirect('profil')
+    
+    savat.saqlash(javob)
+    return javob
+
+
 # ============================================================================
 # HAQIDA
 # ============================================================================
@@ -494,3 +680,65 @@ def aloqa(request):
         return redirect('aloqa')
     
     return render(request, 'asosiy_app/aloqa.html')
+
+
+# ============================================================================
+# ICHKI: ULANISHLAR HOLATI
+# ============================================================================
+
+def _ichki_ruxsat(request):
+    """
+    Ichki sahifalarga ruxsat: admin foydalanuvchi yoki
+    'Authorization: Bearer <ICHKI_TOKEN>' sarlavhasi
+    
+    IP manzil tekshirilmaydi - proksi orqasida barcha so'rovlar
+    REMOTE_ADDR=127.0.0.1 bilan keladi. Token avval tekshiriladi:
+    Prometheus so'rovida sessiya va foydalanuvchi yuklanmaydi.
+    """
+    token = getattr(settings, 'ICHKI_TOKEN', '')
+    sarlavha = request.headers.get('Authorization', '')
+    if token and hmac.compare_digest(sarlavha.encode(), f'Bearer {token}'.encode()):
+        return True
+    return request.user.is_staff
+
+
+def ichki_ulanishlar(request):
+    """
+    Ma'lumotlar bazasi ulanishlari va hovuz statistikasi (JSON)
+    
+    Faqat ICHKI_TOKEN bilan yoki admin foydalanuvchilar uchun.
+    Boshqalarga sahifa mavjud emasdek 404 qaytariladi.
+    Statistika joriy worker jarayoniga tegishli.
+    
+    Args:
+        request: HTTP so'rov obyekti
+        
+    Returns:
+        JsonResponse: Har bir baza uchun ulanish holati
+    """
+    if not _ichki_ruxsat(request):
+        raise Http404
+    return JsonResponse({'pid': os.getpid(), 'bazalar': ulanishlar_holati()})
+
+
+# ============================================================================
+# ICHKI: PROMETHEUS METRIKALARI
+# ============================================================================
+
+def metrikalar(request):
+    """
+    Prometheus metrikalari (text exposition formati)
+    
+    Barcha worker jarayonlari metrikalari qo'shib chiqariladi (metrikalar.py).
+    Faqat ICHKI_TOKEN bilan (Prometheus serveri) yoki admin
+    foydalanuvchilar uchun, boshqalarga 404.
+    
+    Args:
+        request: HTTP so'rov obyekti
+        
+    Returns:
+        HttpResponse: text/plain; version=0.0.4
+    """
+    if not _ichki_ruxsat(request):
+        raise Http404
+    return HttpResponse(prometheus_matni(), content_type='text/plain; version=0.0.4; charset=utf-8')
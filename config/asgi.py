@@ -13,4 +13,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
+# ASGI serverida katalog sahifalari async views bilan ishlaydi
+# (asosiy_app/asinxron_views.py). O'chirish: ASINXRON_VIEWLAR=0
+os.environ.setdefault('ASINXRON_VIEWLAR', '1')
+
+# Async rejimda ORM har bir so'rov uchun alohida oqimda ishlaydi - doimiy
+# ulanishlar (CONN_MAX_AGE) qayta ishlatilmay to'planib qoladi.
+# PostgreSQL da buning o'rniga ulanishlar hovuzi (DB_POOL) ishlaydi.
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
+
 application = get_asgi_application()
@@ -0,0 +1,36 @@
+"""
+Replikalarni sinash uchun sozlamalar
+
+Asosiy baza va o'qish replikasi o'rnida ikkita alohida SQLite fayli
+ishlatiladi. Ular orasida replikatsiya yo'q - testlar shu farqdan
+so'rov qaysi bazaga borganini aniqlash uchun foydalanadi.
+
+Ishga tushirish:
+    python manage.py test asosiy_app --settings=config.settings_replika
+"""
+
+import tempfile
+from pathlib import Path
+
+from .settings import *  # noqa: F401,F403
+
+VAQTINCHALIK = Path(tempfile.gettempdir())
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': VAQTINCHALIK / 'django_shablon_asosiy.sqlite3',
+        'TEST': {'NAME': VAQTINCHALIK / 'django_shablon_test_asosiy.sqlite3'},
+    },
+    'replika1': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': VAQTINCHALIK / 'django_shablon_replika1.sqlite3',
+        'TEST': {'NAME': VAQTINCHALIK / 'django_shablon_test_replika1.sqlite3'},
+    },
+}
+
+REPLIKA_BAZALAR = ['replika1']
+
+# Teglar fayli ham loyiha papkasini ifloslantirmasligi uchun
+KESH_TEGLAR_FAYLI = VAQTINCHALIK / 'django_shablon_kesh_teglari.log'
+SEKIN_SOROVLAR_FAYLI = VAQTINCHALIK / 'django_shablon_sekin_sorovlar.log'
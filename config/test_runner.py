@@ -0,0 +1,31 @@
+"""
+Testlar uchun runner (settings.TEST_RUNNER)
+
+Testlarning ish fayllari (kesh teglari shinasi, sekin so'rovlar jurnali,
+worker metrikalari) loyiha papkasiga emas, vaqtinchalik papkaga yoziladi -
+ishlab chiqish serveri bilan bir xil fayllarni ishlatib, unga teg yoki
+metrika yubormasligi uchun.
+"""
+
+import tempfile
+from pathlib import Path
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        papka = Path(tempfile.gettempdir())
+        self._ish_fayllari = override_settings(
+            KESH_TEGLAR_FAYLI=papka / 'django_shablon_test_kesh_teglari.log',
+            SEKIN_SOROVLAR_FAYLI=papka / 'django_shablon_test_sekin_sorovlar.log',
+            METRIKALAR_PAPKASI=papka / 'django_shablon_test_metrikalar',
+        )
+        self._ish_fayllari.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._ish_fayllari.disable()
+        super().teardown_test_environment(**kwargs)
@@ -15,6 +15,8 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from asosiy_app.admin import sekin_sorovlar_sahifasi
+
 # ============================================================================
 # ASOSIY URL MARSHRUTLARI
 # ============================================================================
@@ -22,6 +24,9 @@ from django.conf.urls.static import static
 urlpatterns = [
     # Admin panel URL i
     # Admin panelga kirish: http://localhost:8000/admin/
+    # Sekin SQL so'rovlar hisoboti (faqat xodimlar uchun)
+    # admin.site.urls dan oldin turishi kerak - aks holda admin uni model URL i deb tushunadi
+    path('admin/sekin-sorovlar/', admin.site.admin_view(sekin_sorovlar_sahifasi), name='sekin_sorovlar'),
     path('admin/', admin.site.urls),
     
     # Asosiy app ning barcha URL larini ulash